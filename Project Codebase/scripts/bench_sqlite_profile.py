@@ -0,0 +1,128 @@
+"""
+Mixed read/write throughput of the SQLite engine profiles.
+
+Several worker processes (standing in for gunicorn workers) share one
+database file. Each runs availability-style reads and booking inserts for a
+fixed time, once with SQLite's stock settings and once with the tuned
+profile from src/data_access/engine.py, then the totals are compared.
+
+    python scripts/bench_sqlite_profile.py --workers 4 --seconds 10 --write-ratio 0.2
+"""
+
+import argparse
+import multiprocessing
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.exc import OperationalError
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.data_access.engine import DEFAULT_SQLITE_PRAGMAS, install_sqlite_pragmas  # noqa: E402
+from src.models.models import db, Booking, Resource, User  # noqa: E402
+
+
+RESOURCES = 20
+SEED_BOOKINGS = 5000
+EPOCH = datetime(2030, 1, 1)
+
+
+def _engine(path, tuned):
+    engine = create_engine(f"sqlite:///{path}")
+    if tuned:
+        install_sqlite_pragmas(engine, DEFAULT_SQLITE_PRAGMAS)
+    return engine
+
+
+def _seed(path):
+    engine = _engine(path, tuned=False)
+    db.metadata.create_all(engine)
+    with engine.begin() as connection:
+        connection.execute(insert(User), [{"id": 1, "name": "Bench", "email": "bench@iu.edu", "password_hash": "x"}])
+        connection.execute(insert(Resource), [
+            {"id": resource_id, "title": f"Room {resource_id}", "capacity": 5, "owner_id": 1}
+            for resource_id in range(1, RESOURCES + 1)
+        ])
+        connection.execute(insert(Booking), [_booking(random.Random(index)) for index in range(SEED_BOOKINGS)])
+    engine.dispose()
+
+
+def _booking(rng):
+    start = EPOCH + timedelta(hours=rng.randrange(24 * 365))
+    return {
+        "resource_id": rng.randint(1, RESOURCES),
+        "user_id": 1,
+        "start_time": start,
+        "end_time": start + timedelta(hours=1),
+        "status": rng.choice(["pending", "approved", "cancelled"]),
+    }
+
+
+def _worker(path, tuned, seconds, write_ratio, seed, results):
+    engine = _engine(path, tuned)
+    rng = random.Random(seed)
+    reads = writes = locked = 0
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        try:
+            if rng.random() < write_ratio:
+                with engine.begin() as connection:
+                    connection.execute(insert(Booking), [_booking(rng)])
+                writes += 1
+            else:
+                start = EPOCH + timedelta(hours=rng.randrange(24 * 365))
+                with engine.connect() as connection:
+                    connection.execute(
+                        select(Booking.start_time, Booking.end_time).where(
+                            Booking.resource_id == rng.randint(1, RESOURCES),
+                            Booking.active_status_filter(),
+                            Booking.start_time < start + timedelta(days=7),
+                            Booking.end_time > start,
+                        )
+                    ).all()
+                reads += 1
+        except OperationalError:
+            locked += 1
+    engine.dispose()
+    results.put((reads, writes, locked))
+
+
+def run(tuned, workers, seconds, write_ratio):
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "bench.db")
+        _seed(path)
+        results = multiprocessing.Queue()
+        processes = [
+            multiprocessing.Process(target=_worker, args=(path, tuned, seconds, write_ratio, index, results))
+            for index in range(workers)
+        ]
+        for process in processes:
+            process.start()
+        totals = [results.get() for _ in processes]
+        for process in processes:
+            process.join()
+    reads, writes, locked = (sum(column) for column in zip(*totals))
+    return reads / seconds, writes / seconds, locked
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--write-ratio", type=float, default=0.2)
+    args = parser.parse_args()
+
+    print(f"{args.workers} workers, {args.seconds:g}s each, {args.write_ratio:.0%} writes")
+    print(f"{'profile':<10}{'reads/s':>12}{'writes/s':>12}{'lock errors':>14}")
+    for name, tuned in (("default", False), ("tuned", True)):
+        reads, writes, locked = run(tuned, args.workers, args.seconds, args.write_ratio)
+        print(f"{name:<10}{reads:>12.0f}{writes:>12.0f}{locked:>14}")
+
+
+if __name__ == "__main__":
+    main()
@@ -17,13 +17,27 @@ from src.models.models import (
     Notification,
     SitePage,
 )
-from src.data_access import resources_dal, bookings_dal, waitlist_dal
-from sqlalchemy import func
+from src.data_access import resources_dal, bookings_dal, series_dal, waitlist_dal
+from src.data_access.loading import load_plan
+from src.data_access.pagination import keyset_page
+from sqlalchemy.orm import joinedload
 from src.services.notification_service import send_notification
-from src.services.booking_service import create_owner_booking_request
+from src.services.allocation_service import plan_allocations, plan_signature, commit_allocation_plan
+from src.services.booking_engine import (
+    MAX_RECURRENCE_OCCURRENCES,
+    create_bookings,
+    create_series,
+    expand_recurrence,
+    partial_occurrences,
+)
+from src.services.dashboard_service import dashboard_stats
+from src.services.series_service import MAX_SERIES_OCCURRENCES, describe_rule, next_occurrence, rule_for_recurrence
 from src.services.booking_rules import validate_time_block, ensure_capacity
-from src.services.slot_service import build_slot_days
-from src.services.waitlist_service import promote_waitlist_entry
+from src.services.availability_service import batch_remaining_capacity, load_resource_intervals
+from src.services.slot_service import build_slot_days, build_availability_matrix
+from src.services.booking_locks import lock_resources, retry_on_lock_conflict
+from src.services.promotion_queue import enqueue_promotion
+from src.services.waitlist_service import book_available_and_waitlist, next_waitlist_position
 from src.utils.db_helpers import get_or_404
 
 admin_bp = Blueprint("admin", __name__, url_prefix="/admin")
@@ -40,6 +54,62 @@ def admin_required(f):
     return decorated_function
 
 
+# --------------------------
+# PAGINATED LISTINGS
+# --------------------------
+ADMIN_PAGE_SIZE = 50
+MAX_ADMIN_PAGE_SIZE = 200
+
+
+def _isoformat(moment):
+    return moment.isoformat() if moment else None
+
+
+def _paginated_listing(template, name, query, order_by, serialize, **context):
+    """
+    Render one keyset page of an admin listing. Reads ?after= / ?before=
+    cursors and ?per_page= from the request; ?format=json returns the same
+    page as JSON. Other query arguments (filters) carry over to the links.
+    """
+    wants_json = request.args.get("format") == "json"
+    per_page = max(1, min(request.args.get("per_page", ADMIN_PAGE_SIZE, type=int), MAX_ADMIN_PAGE_SIZE))
+    carried = {key: value for key, value in request.args.items() if key not in ("after", "before")}
+    try:
+        page = keyset_page(
+            query,
+            order_by,
+            after=request.args.get("after") or None,
+            before=request.args.get("before") or None,
+            per_page=per_page,
+        )
+    except ValueError as exc:
+        if wants_json:
+            return jsonify({"success": False, "message": str(exc)}), 400
+        flash(f"{exc} Showing the first page.", "warning")
+        return redirect(url_for(request.endpoint, **carried))
+
+    pager = {
+        "next_url": url_for(request.endpoint, **carried, after=page.next_cursor) if page.next_cursor else None,
+        "prev_url": url_for(request.endpoint, **carried, before=page.prev_cursor) if page.prev_cursor else None,
+    }
+    if wants_json:
+        return jsonify({"success": True, name: [serialize(item) for item in page.items], **pager})
+    return render_template(template, pager=pager, **{name: page.items}, **context)
+
+
+def _series_rows(series_list):
+    """Series for the admin listings, with their rule spelled out and next date."""
+    now = datetime.now()
+    return [
+        {
+            "series": series,
+            "summary": describe_rule(series.rule),
+            "next": next_occurrence(series, now) if series.status != "cancelled" else None,
+        }
+        for series in series_list
+    ]
+
+
 @admin_bp.route("/notifications/<int:notification_id>/read", methods=["POST"])
 @login_required
 @admin_required
@@ -86,144 +156,7 @@ def manage_pages():
 @admin_required
 def dashboard():
     """Admin dashboard with overview stats."""
-    
-    # Get statistics
-    total_users = User.query.count()
-    total_resources = Resource.query.count()
-    total_bookings = Booking.query.count()
-    pending_bookings = Booking.query.filter_by(status="pending").count()
-    now_utc = datetime.now(timezone.utc)
-    sla_threshold = now_utc - timedelta(hours=24)
-    overdue_bookings = (
-        Booking.query
-        .filter(
-            Booking.status == "pending",
-            Booking.created_at <= sla_threshold
-        )
-        .order_by(Booking.created_at.asc())
-        .all()
-    )
-
-    decided_bookings = (
-        Booking.query
-        .filter(Booking.decision_at.isnot(None))
-        .all()
-    )
-    if decided_bookings:
-        avg_response_seconds = sum(
-            max((booking.decision_at - booking.created_at).total_seconds(), 0)
-            for booking in decided_bookings
-        ) / len(decided_bookings)
-        avg_response_hours = round(avg_response_seconds / 3600, 2)
-    else:
-        avg_response_hours = None
-
-    utilization_start = now_utc - timedelta(days=7)
-    utilization_bookings = (
-        Booking.query
-        .filter(
-            Booking.status == "approved",
-            Booking.start_time >= utilization_start,
-            Booking.start_time <= now_utc
-        )
-        .all()
-    )
-
-    utilization_map = {}
-    hours_window = 7 * 24
-    for booking in utilization_bookings:
-        duration_hours = max((booking.end_time - booking.start_time).total_seconds() / 3600, 0)
-        entry = utilization_map.setdefault(booking.resource_id, {
-            "resource": booking.resource,
-            "hours": 0.0,
-            "count": 0
-        })
-        entry["hours"] += duration_hours
-        entry["count"] += 1
-
-    utilization_stats = []
-    for resource_id, data in utilization_map.items():
-        resource = data["resource"]
-        capacity = max(resource.capacity or 1, 1)
-        seat_hours_available = capacity * hours_window
-        utilization_pct = min((data["hours"] / seat_hours_available) * 100 if seat_hours_available else 0, 100)
-        utilization_stats.append({
-            "resource": resource,
-            "hours": round(data["hours"], 2),
-            "count": data["count"],
-            "utilization_pct": round(utilization_pct, 1)
-        })
-
-    utilization_stats.sort(key=lambda item: item["utilization_pct"], reverse=True)
-    top_utilization = utilization_stats[:5]
-    
-    # Recent activity
-    recent_bookings = Booking.query.order_by(Booking.created_at.desc()).limit(5).all()
-    recent_resources = Resource.query.order_by(Resource.created_at.desc()).limit(5).all()
-    recent_users = User.query.order_by(User.created_at.desc()).limit(5).all()
-
-    # Role & department analytics
-    role_usage = (
-        db.session.query(User.role, func.count(Booking.id))
-        .join(Booking, Booking.user_id == User.id)
-        .group_by(User.role)
-        .all()
-    )
-
-    resource_type_usage = (
-        db.session.query(Resource.category, func.count(Booking.id))
-        .join(Booking, Booking.resource_id == Resource.id)
-        .group_by(Resource.category)
-        .order_by(func.count(Booking.id).desc())
-        .limit(6)
-        .all()
-    )
-
-    department_usage = (
-        db.session.query(User.department, func.count(Booking.id))
-        .join(Booking, Booking.user_id == User.id)
-        .group_by(User.department)
-        .order_by(func.count(Booking.id).desc())
-        .limit(6)
-        .all()
-    )
-
-    summary_window_start = now_utc - timedelta(days=7)
-    summary_bookings = (
-        db.session.query(Resource.title, func.count(Booking.id).label("total"))
-        .join(Resource, Booking.resource_id == Resource.id)
-        .filter(
-            Booking.start_time >= summary_window_start,
-            Booking.status.in_(["approved", "pending"]),
-        )
-        .group_by(Resource.id)
-        .order_by(func.count(Booking.id).desc())
-        .limit(5)
-        .all()
-    )
-    weekly_summary = [
-        {"title": title, "count": total} for title, total in summary_bookings
-    ]
-    
-    return render_template(
-        "admin/dashboard.html",
-        total_users=total_users,
-        total_resources=total_resources,
-        total_bookings=total_bookings,
-        pending_bookings=pending_bookings,
-        overdue_bookings=overdue_bookings,
-        avg_response_hours=avg_response_hours,
-        top_utilization=top_utilization,
-        utilization_window_start=utilization_start,
-        recent_bookings=recent_bookings,
-        recent_resources=recent_resources,
-        recent_users=recent_users,
-        role_usage=role_usage,
-        resource_type_usage=resource_type_usage,
-        department_usage=department_usage,
-        weekly_summary=weekly_summary,
-        summary_window_start=summary_window_start,
-    )
+    return render_template("admin/dashboard.html", **dashboard_stats())
 
 
 # --------------------------
@@ -234,8 +167,21 @@ def dashboard():
 @admin_required
 def manage_resources():
     """View and manage all resources."""
-    resources = Resource.query.order_by(Resource.created_at.desc()).all()
-    return render_template("admin/resources.html", resources=resources)
+    query = Resource.query.options(*load_plan(joinedload(Resource.owner)))
+    return _paginated_listing(
+        "admin/resources.html",
+        "resources",
+        query,
+        [Resource.created_at.desc(), Resource.id.desc()],
+        lambda resource: {
+            "id": resource.id,
+            "title": resource.title,
+            "category": resource.category,
+            "status": resource.status,
+            "owner": resource.owner.name if resource.owner else None,
+            "created_at": _isoformat(resource.created_at),
+        },
+    )
 
 
 @admin_bp.route("/resources/<int:resource_id>/status", methods=["POST"])
@@ -272,8 +218,21 @@ def update_resource_status(resource_id):
 @admin_required
 def manage_reviews():
     """View and manage all reviews."""
-    reviews = Review.query.order_by(Review.created_at.desc()).all()
-    return render_template("admin/reviews.html", reviews=reviews)
+    query = Review.query.options(*load_plan(joinedload(Review.reviewer), joinedload(Review.resource)))
+    return _paginated_listing(
+        "admin/reviews.html",
+        "reviews",
+        query,
+        [Review.created_at.desc(), Review.id.desc()],
+        lambda review: {
+            "id": review.id,
+            "resource": review.resource.title,
+            "reviewer": review.reviewer.name,
+            "rating": review.rating,
+            "comment": review.comment,
+            "created_at": _isoformat(review.created_at),
+        },
+    )
 
 
 @admin_bp.route("/reviews/delete/<int:review_id>", methods=["POST"])
@@ -291,6 +250,23 @@ def delete_review(review_id):
 # --------------------------
 # BOOKING REQUESTS INBOX
 # --------------------------
+def _request_order():
+    # Pending first, then approved, denied and closed; ix_booking_requests_listing serves this order.
+    return [BookingRequest.status_rank.desc(), BookingRequest.created_at.desc(), BookingRequest.id.desc()]
+
+
+def _request_row(booking_request):
+    return {
+        "id": booking_request.id,
+        "status": booking_request.status,
+        "resource": booking_request.resource.title,
+        "requester": booking_request.requester.name,
+        "start_time": _isoformat(booking_request.start_time),
+        "end_time": _isoformat(booking_request.end_time),
+        "created_at": _isoformat(booking_request.created_at),
+    }
+
+
 @admin_bp.route("/requests")
 @login_required
 @admin_required
@@ -299,17 +275,10 @@ def list_requests():
     status_filter = request.args.get("status")
     resource_filter = request.args.get("resource_id", type=int)
 
-    ordering = db.case(
-        (BookingRequest.status == "pending", 0),
-        (BookingRequest.status == "approved", 1),
-        (BookingRequest.status == "denied", 2),
-        else_=3
-    )
-
     query = (
         BookingRequest.query
+        .options(*load_plan(joinedload(BookingRequest.requester), joinedload(BookingRequest.resource)))
         .filter(BookingRequest.kind == "allocator")
-        .order_by(ordering, BookingRequest.created_at.desc())
     )
 
     valid_statuses = ["pending", "approved", "denied", "closed"]
@@ -321,12 +290,14 @@ def list_requests():
     if resource_filter:
         query = query.filter(BookingRequest.resource_id == resource_filter)
 
-    requests = query.all()
     resource_options = Resource.query.order_by(Resource.title.asc()).all()
 
-    return render_template(
+    return _paginated_listing(
         "admin/requests.html",
-        requests=requests,
+        "requests",
+        query,
+        _request_order(),
+        _request_row,
         status_filter=status_filter,
         resource_filter=resource_filter,
         resource_options=resource_options,
@@ -334,6 +305,53 @@ def list_requests():
     )
 
 
+@admin_bp.route("/requests/allocate", methods=["GET", "POST"])
+@login_required
+@admin_required
+@retry_on_lock_conflict
+def allocate_requests():
+    """Propose (GET) or commit (POST) a batch allocation of pending admin requests."""
+    start_raw = request.values.get("start_date")
+    try:
+        period_start = datetime.strptime(start_raw, "%Y-%m-%d") if start_raw else datetime.combine(
+            datetime.now().date(), datetime.min.time()
+        )
+    except ValueError:
+        flash("Invalid start date.", "warning")
+        return redirect(url_for("admin.allocate_requests"))
+    days = max(1, min(request.values.get("days", 7, type=int), 120))
+    period_end = period_start + timedelta(days=days)
+
+    plan = plan_allocations(period_start, period_end, lock=request.method == "POST")
+
+    if request.method == "POST":
+        review_url = url_for("admin.allocate_requests", start_date=period_start.strftime("%Y-%m-%d"), days=days)
+        if not plan.assignments:
+            flash("There are no requests that can be allocated for this period.", "info")
+            return redirect(review_url)
+        # Only commit the plan the admin reviewed; requests or bookings may have changed since.
+        if request.form.get("plan") != plan_signature(plan):
+            db.session.rollback()
+            flash("Requests changed since this plan was calculated. Review the updated plan before committing.", "warning")
+            return redirect(review_url)
+        created = commit_allocation_plan(plan, current_user)
+        db.session.commit()
+        flash(
+            f"Allocated {len(created)} request{'s' if len(created) != 1 else ''}. "
+            f"{len(plan.unassigned)} could not be placed.",
+            "success",
+        )
+        return redirect(url_for("admin.list_requests"))
+
+    return render_template(
+        "admin/allocate.html",
+        plan=plan,
+        signature=plan_signature(plan),
+        start_date=period_start.strftime("%Y-%m-%d"),
+        days=days,
+    )
+
+
 @admin_bp.route("/inbox")
 @login_required
 @admin_required
@@ -341,17 +359,10 @@ def admin_inbox():
     """Admin inbox showing only 'book for me' requests."""
     status_filter = request.args.get("status")
 
-    ordering = db.case(
-        (BookingRequest.status == "pending", 0),
-        (BookingRequest.status == "approved", 1),
-        (BookingRequest.status == "denied", 2),
-        else_=3
-    )
-
     query = (
         BookingRequest.query
+        .options(*load_plan(joinedload(BookingRequest.requester), joinedload(BookingRequest.resource)))
         .filter(BookingRequest.kind == "allocator")
-        .order_by(ordering, BookingRequest.created_at.desc())
     )
 
     valid_statuses = ["pending", "approved", "denied", "closed"]
@@ -360,11 +371,12 @@ def admin_inbox():
     else:
         status_filter = None
 
-    requests = query.limit(200).all()
-
-    return render_template(
+    return _paginated_listing(
         "admin/inbox.html",
-        requests=requests,
+        "requests",
+        query,
+        _request_order(),
+        _request_row,
         status_filter=status_filter,
         valid_statuses=valid_statuses
     )
@@ -375,13 +387,19 @@ def admin_inbox():
 @admin_required
 def email_log():
     """View simulated email notifications."""
-    logs = (
-        EmailLog.query
-        .order_by(EmailLog.sent_at.desc())
-        .limit(200)
-        .all()
+    return _paginated_listing(
+        "admin/email_log.html",
+        "logs",
+        EmailLog.query.options(*load_plan()),
+        [EmailLog.sent_at.desc(), EmailLog.id.desc()],
+        lambda log: {
+            "id": log.id,
+            "recipient_email": log.recipient_email,
+            "subject": log.subject,
+            "body": log.body,
+            "sent_at": _isoformat(log.sent_at),
+        },
     )
-    return render_template("admin/email_log.html", logs=logs)
 
 
 @admin_bp.route("/requests/<int:request_id>")
@@ -463,6 +481,7 @@ def decide_request(request_id):
 @admin_bp.route("/book-for-user", methods=["GET", "POST"])
 @login_required
 @admin_required
+@retry_on_lock_conflict
 def book_for_user():
     """Admin can book resources for any user."""
     return_to = request.args.get("return_to") or request.form.get("return_to", "")
@@ -517,40 +536,23 @@ def book_for_user():
             )
 
         recurrence = request.form.get("recurrence", "none")
-        recurrence_count = request.form.get("recurrence_count", type=int) or 1
-        recurrence_count = max(1, min(recurrence_count, 10))
-
-        delta_lookup = {
-            "daily": timedelta(days=1),
-            "weekly": timedelta(weeks=1),
-        }
-
-        occurrences = [(start_dt, end_dt)]
-        if recurrence in delta_lookup and recurrence_count > 1:
-            delta = delta_lookup[recurrence]
-            for i in range(1, recurrence_count):
-                occ_start = start_dt + i * delta
-                occ_end = end_dt + i * delta
-                occurrences.append((occ_start, occ_end))
-
-        for occ_start, occ_end in occurrences:
-            downtime = (
-                DowntimeBlock.query
-                .filter_by(resource_id=resource_id)
-                .filter(
-                    DowntimeBlock.start_time < occ_end,
-                    DowntimeBlock.end_time > occ_start
-                )
-                .first()
-            )
+        recurrence_count = request.form.get("recurrence_count", type=int)
+        auto_approve = resource.access_type == "public"
+        partial = request.form.get("partial") == "1"
+        # Request-linked and partial bookings keep individual rows so the
+        # request can point at one and skipped occurrences can leave holes.
+        series_rule = (
+            rule_for_recurrence(recurrence, recurrence_count)
+            if auto_approve and not linked_request and not partial
+            else None
+        )
+        waitlisted = []
 
-            if downtime:
-                flash(
-                    f"This resource is unavailable between "
-                    f"{downtime.start_time.strftime('%b %d, %Y %I:%M %p')} and "
-                    f"{downtime.end_time.strftime('%b %d, %Y %I:%M %p')} (reason: {downtime.reason or 'maintenance'}).",
-                    "warning"
-                )
+        if partial:
+            try:
+                occurrences = partial_occurrences(start_dt, end_dt, recurrence, recurrence_count)
+            except ValueError as exc:
+                flash(str(exc), "warning")
                 return redirect(
                     url_for(
                         "admin.book_for_user",
@@ -563,49 +565,73 @@ def book_for_user():
                         purpose=purpose,
                     )
                 )
-
-            try:
-                ensure_capacity(resource, occ_start, occ_end)
-            except ValueError as exc:
-                flash(str(exc), "warning")
-                query_params = dict(
+            result, waitlisted = book_available_and_waitlist(
+                resource,
+                user,
+                occurrences,
+                purpose=purpose or f"Booked by admin for {user.name}",
+                auto_approve=auto_approve,
+                approved_by=current_user.id,
+                booked_by_admin=True,
+                requester=linked_request.requester if linked_request else user,
+            )
+        elif series_rule:
+            result = create_series(
+                resource,
+                user,
+                start_dt,
+                end_dt,
+                series_rule,
+                purpose=purpose or f"Booked by admin for {user.name}",
+                approved_by=current_user.id,
+                booked_by_admin=True,
+            )
+        else:
+            result = create_bookings(
+                resource,
+                user,
+                expand_recurrence(start_dt, end_dt, recurrence, recurrence_count),
+                purpose=purpose or f"Booked by admin for {user.name}",
+                auto_approve=auto_approve,
+                approved_by=current_user.id,
+                booked_by_admin=True,
+                requester=linked_request.requester if linked_request else user,
+            )
+        issue = result.first_issue
+        if partial and (result.bookings or waitlisted):
+            issue = None  # The summary flash below reports what was skipped.
+        if issue and issue.status != "full":
+            flash(issue.message, "warning")
+            return redirect(
+                url_for(
+                    "admin.book_for_user",
                     resource_id=resource_id,
                     return_to=return_to,
-                    waitlist="1",
-                    user_id=user_id,
+                    request_id=request_id,
                     start_time=start_time,
                     end_time=end_time,
+                    user_id=user_id,
                     purpose=purpose,
-                    request_id=request_id,
                 )
-                return redirect(url_for("admin.book_for_user", **query_params))
-
-        auto_approve = resource.access_type == "public"
-
-        created_bookings = []
-        for occ_start, occ_end in occurrences:
-            booking_record = Booking(
-            resource_id=resource_id,
-            user_id=user_id,
-                start_time=occ_start,
-                end_time=occ_end,
-            purpose=purpose or f"Booked by admin for {user.name}",
-                booked_by_admin=True,
-                status="approved" if auto_approve else "pending",
-                approved_by=current_user.id if auto_approve else None,
-                decision_at=datetime.now(timezone.utc) if auto_approve else None
             )
-            db.session.add(booking_record)
-            db.session.flush()
-
-            if not auto_approve:
-                requester_context = linked_request.requester if linked_request else user
-                create_owner_booking_request(resource, booking_record, requester_context, purpose)
+        if issue:
+            flash(issue.message, "warning")
+            query_params = dict(
+                resource_id=resource_id,
+                return_to=return_to,
+                waitlist="1",
+                user_id=user_id,
+                start_time=start_time,
+                end_time=end_time,
+                purpose=purpose,
+                request_id=request_id,
+            )
+            return redirect(url_for("admin.book_for_user", **query_params))
 
-            created_bookings.append(booking_record)
+        created_bookings = result.bookings
 
         # If this booking originated from a request, update it
-        if linked_request:
+        if linked_request and created_bookings:
             linked_request.booking_id = created_bookings[0].id
             if auto_approve:
                 linked_request.mark("approved", purpose or "Approved by admin.")
@@ -658,10 +684,10 @@ def book_for_user():
         notif_message = f"Admin has booked {resource.title} for you from {start_time} to {end_time}"
         if not auto_approve:
             notif_message += ". The booking is pending approval."
-        if len(created_bookings) > 1:
-            notif_message += f" ({len(created_bookings)} total occurrences)."
+        if result.occurrence_total > 1:
+            notif_message += f" ({result.occurrence_total} total occurrences)."
 
-        if not request_id:
+        if not request_id and created_bookings:
             send_notification(
                 user,
             title="Booking Confirmed",
@@ -672,8 +698,15 @@ def book_for_user():
         
         db.session.commit()
         
-        if auto_approve:
-            flash(f"Successfully booked {resource.title} for {user.name}! ({len(created_bookings)} occurrence{'s' if len(created_bookings) > 1 else ''})", "success")
+        if partial:
+            flash(
+                f"Booked {len(created_bookings)} of {len(created_bookings) + len(result.issues)} occurrences of "
+                f"{resource.title} for {user.name}; {len(waitlisted)} added to the waitlist"
+                f"{'' if auto_approve else ' (bookings await owner approval)'}.",
+                "success" if created_bookings else "info",
+            )
+        elif auto_approve:
+            flash(f"Successfully booked {resource.title} for {user.name}! ({result.occurrence_total} occurrence{'s' if result.occurrence_total > 1 else ''})", "success")
         else:
             flash(f"Booking request for {resource.title} was submitted and is awaiting approval.", "info")
 
@@ -764,14 +797,10 @@ def book_for_user():
         if existing:
             flash(f"{user.name} is already on the waitlist for {resource.title}.", "info")
         else:
-            max_position = db.session.query(db.func.max(Waitlist.position)).filter_by(
-                resource_id=resource.id
-            ).scalar() or 0
-
             waitlist_entry = Waitlist(
                 resource_id=resource.id,
                 user_id=user.id,
-                position=max_position + 1,
+                position=next_waitlist_position(resource.id),
                 start_time=start_dt,
                 end_time=end_dt,
                 purpose=purpose,
@@ -796,13 +825,20 @@ def book_for_user():
         )
     
     # GET request - show form
-    resources = Resource.query.order_by(Resource.created_at.desc()).all()
+    resources = (
+        Resource.query
+        .with_entities(Resource.id, Resource.title, Resource.location, Resource.capacity, Resource.access_type)
+        .order_by(Resource.created_at.desc())
+        .all()
+    )
     users = (
         User.query
+        .with_entities(User.id, User.name, User.email, User.role)
         .filter(User.role.in_(["student", "staff"]), User.status == "active")
         .order_by(User.name.asc())
         .all()
     )
+    available_now = batch_remaining_capacity(resources)
     slot_days = []
     if selected_resource_id:
         selected_resource = db.session.get(Resource, selected_resource_id)
@@ -816,8 +852,42 @@ def book_for_user():
         selected_resource_id=selected_resource_id,
         return_to=return_to,
         request_id=request_id,
-        slot_days=slot_days
+        slot_days=slot_days,
+        available_now=available_now,
+        max_recurrence=MAX_SERIES_OCCURRENCES,
+        max_restricted_recurrence=MAX_RECURRENCE_OCCURRENCES,
+    )
+
+
+@admin_bp.route("/availability-matrix")
+@login_required
+@admin_required
+def availability_matrix():
+    """JSON resources x hours matrix of remaining capacity for a date range."""
+    date_raw = request.args.get("date")
+    try:
+        start_date = datetime.strptime(date_raw, "%Y-%m-%d").date() if date_raw else datetime.now().date()
+    except ValueError:
+        return jsonify({"success": False, "message": "Invalid date format. Use YYYY-MM-DD."}), 400
+
+    days = max(1, min(request.args.get("days", 1, type=int), 31))
+    start_hour = max(0, min(request.args.get("start_hour", 0, type=int), 23))
+    end_hour = max(start_hour + 1, min(request.args.get("end_hour", 24, type=int), 24))
+
+    query = Resource.query.with_entities(Resource.id, Resource.title, Resource.capacity)
+    resource_ids = [int(value) for value in request.args.get("resource_ids", "").split(",") if value.strip().isdigit()]
+    if resource_ids:
+        query = query.filter(Resource.id.in_(resource_ids))
+    resources = query.order_by(Resource.created_at.desc()).all()
+
+    matrix = build_availability_matrix(
+        resources,
+        start_date,
+        days=days,
+        start_hour=start_hour,
+        end_hour=end_hour,
     )
+    return jsonify({"success": True, **matrix})
 
 
 # --------------------------
@@ -828,12 +898,21 @@ def book_for_user():
 @admin_required
 def manage_users():
     """View and manage all users."""
-    users = (
-        User.query
-        .order_by(User.status.asc(), User.created_at.desc())
-        .all()
+    return _paginated_listing(
+        "admin/users.html",
+        "users",
+        User.query.options(*load_plan()),
+        [User.status.asc(), User.created_at.desc(), User.id.desc()],
+        lambda user: {
+            "id": user.id,
+            "name": user.name,
+            "email": user.email,
+            "role": user.role,
+            "status": user.status,
+            "department": user.department,
+            "created_at": _isoformat(user.created_at),
+        },
     )
-    return render_template("admin/users.html", users=users)
 
 
 @admin_bp.route("/users/delete/<int:user_id>", methods=["POST"])
@@ -891,9 +970,23 @@ def update_user_status(user_id):
 @login_required
 @admin_required
 def manage_bookings():
-    """View all bookings."""
-    bookings = Booking.query.order_by(Booking.start_time.desc()).all()
-    return render_template("admin/bookings.html", bookings=bookings)
+    """View all bookings. Recurring series are listed above the first page."""
+    first_page = not (request.args.get("after") or request.args.get("before"))
+    return _paginated_listing(
+        "admin/bookings.html",
+        "bookings",
+        bookings_dal.booking_rows(),
+        [Booking.start_time.desc(), Booking.id.desc()],
+        lambda booking: {
+            "id": booking.id,
+            "resource": booking.resource.title,
+            "user": booking.user.name,
+            "status": booking.status,
+            "start_time": _isoformat(booking.start_time),
+            "end_time": _isoformat(booking.end_time),
+        },
+        series_rows=_series_rows(series_dal.list_all_series()) if first_page else [],
+    )
 
 
 @admin_bp.route("/bookings/approve/<int:booking_id>", methods=["POST"])
@@ -963,12 +1056,10 @@ def reject_booking(booking_id):
     )
 
     db.session.flush()
-    promoted_booking = promote_waitlist_entry(resource, slot_start, slot_end, actor=current_user)
+    enqueue_promotion(resource.id, slot_start, slot_end, "rejected", actor=current_user)
     db.session.commit()
 
     flash(*flash_copy)
-    if promoted_booking:
-        flash("Next person on the waitlist was auto-booked for this slot.", "info")
     return redirect(redirect_target)
 
 
@@ -1000,12 +1091,10 @@ def cancel_booking(booking_id):
     )
 
     db.session.flush()
-    promoted_booking = promote_waitlist_entry(resource, slot_start, slot_end, actor=current_user)
+    enqueue_promotion(resource.id, slot_start, slot_end, "cancelled", actor=current_user)
     db.session.commit()
     
     flash("Booking cancelled and the user has been notified.", "success")
-    if promoted_booking:
-        flash("Next person on the waitlist was auto-booked for this slot.", "info")
     return redirect(redirect_target)
 
 
@@ -1021,12 +1110,10 @@ def delete_booking(booking_id):
 
     db.session.delete(booking)
     db.session.flush()
-    promoted_booking = promote_waitlist_entry(resource, slot_start, slot_end, actor=current_user)
+    enqueue_promotion(resource.id, slot_start, slot_end, "deleted", actor=current_user)
     db.session.commit()
 
     flash("Booking deleted!", "success")
-    if promoted_booking:
-        flash("Next person on the waitlist was auto-booked for this slot.", "info")
     return redirect(request.referrer or url_for("admin.manage_bookings"))
 
 
@@ -1046,7 +1133,7 @@ def resource_schedule(resource_id):
     """Show schedule/calendar for a specific resource."""
     resource = resources_dal.get_resource_or_404(resource_id)
     bookings = (
-        Booking.query
+        bookings_dal.booking_rows()
         .filter_by(resource_id=resource_id)
         .order_by(Booking.start_time.asc())
         .all()
@@ -1054,6 +1141,7 @@ def resource_schedule(resource_id):
     users = User.query.filter(User.role.in_(["student", "staff"])).order_by(User.name.asc()).all()
     waitlist_entries = (
         Waitlist.query
+        .options(*load_plan(joinedload(Waitlist.user)))
         .filter_by(resource_id=resource_id)
         .order_by(Waitlist.position.asc(), Waitlist.created_at.asc())
         .all()
@@ -1071,7 +1159,8 @@ def resource_schedule(resource_id):
         bookings=bookings,
         users=users,
         waitlist_entries=waitlist_entries,
-        downtimes=downtimes
+        downtimes=downtimes,
+        series_rows=_series_rows(series_dal.list_series_for_resource(resource_id)),
     )
 
 
@@ -1129,7 +1218,7 @@ def create_downtime_block(resource_id):
         Booking.query
         .filter(
             Booking.resource_id == resource_id,
-            Booking.status.in_(["pending", "approved"]),
+            Booking.active_status_filter(),
             Booking.start_time < end_time,
             Booking.end_time > start_time
         )
@@ -1181,6 +1270,7 @@ def create_downtime_block(resource_id):
 def delete_downtime_block(block_id):
     block = get_or_404(DowntimeBlock, block_id)
     resource_id = block.resource_id
+    enqueue_promotion(resource_id, block.start_time, block.end_time, "downtime_removed", actor=current_user)
     db.session.delete(block)
     db.session.commit()
     flash("Downtime block removed.", "info")
@@ -1193,6 +1283,7 @@ def delete_downtime_block(block_id):
 @admin_bp.route("/bookings/<int:booking_id>/reschedule", methods=["POST"])
 @login_required
 @admin_required
+@retry_on_lock_conflict
 def reschedule_booking(booking_id):
     """Ajax endpoint to reschedule a booking via drag-and-drop UI."""
     booking = bookings_dal.get_booking_or_404(booking_id)
@@ -1215,15 +1306,9 @@ def reschedule_booking(booking_id):
     # Load resource (may change)
     resource = resources_dal.get_resource_or_404(new_resource_id)
 
-    downtime = (
-        DowntimeBlock.query
-        .filter_by(resource_id=resource.id)
-        .filter(
-            DowntimeBlock.start_time < new_end,
-            DowntimeBlock.end_time > new_start
-        )
-        .first()
-    )
+    lock_resources([resource.id])
+    intervals = load_resource_intervals(resource, new_start, new_end)
+    downtime = intervals.downtime_overlapping(new_start, new_end)
     if downtime:
         return jsonify({
             "success": False,
@@ -1235,23 +1320,14 @@ def reschedule_booking(booking_id):
         }), 409
 
     # Capacity / conflict check ignoring current booking
-    conflict = (
-        Booking.query
-        .filter(
-            Booking.resource_id == resource.id,
-            Booking.id != booking.id,
-            Booking.status.in_(["pending", "approved"]),
-            Booking.start_time < new_end,
-            Booking.end_time > new_start
-        )
-        .first()
-    )
+    try:
+        ensure_capacity(resource, new_start, new_end, exclude_booking_id=booking.id, intervals=intervals)
+    except ValueError as exc:
+        return jsonify({"success": False, "message": str(exc)}), 409
 
-    if conflict:
-        return jsonify({
-            "success": False,
-            "message": f"Conflicts with booking #{conflict.id} ({conflict.start_time.strftime('%b %d %I:%M %p')} - {conflict.end_time.strftime('%I:%M %p')})."
-        }), 409
+    # The old slot frees up once the booking moves away
+    if booking.status in ("pending", "approved"):
+        enqueue_promotion(booking.resource_id, booking.start_time, booking.end_time, "rescheduled", actor=current_user)
 
     # Update booking details
     booking.resource_id = resource.id
@@ -3,9 +3,13 @@ from flask_login import login_required, current_user
 from datetime import timezone, datetime
 
 from src.models.models import db, Booking, Waitlist
-from src.data_access import bookings_dal, waitlist_dal
+from src.data_access import bookings_dal, series_dal, waitlist_dal
+from src.services.booking_engine import cancel_series_from, reschedule_series_end
+from src.services.booking_locks import retry_on_lock_conflict
 from src.services.booking_rules import validate_time_block
-from src.services.waitlist_service import promote_waitlist_entry
+from src.services.notification_service import send_notification
+from src.services.promotion_queue import enqueue_promotion
+from src.services.series_service import describe_rule, ics_rule, next_occurrence
 
 booking_bp = Blueprint("booking", __name__, url_prefix="/bookings")
 
@@ -15,31 +19,29 @@ booking_bp = Blueprint("booking", __name__, url_prefix="/bookings")
 def dashboard():
     if current_user.is_authenticated and current_user.is_admin():
         bookings = bookings_dal.list_all_bookings()
+        series_list = series_dal.list_all_series()
         view_mode = "all"
         waitlist_entries = []
     else:
         bookings = bookings_dal.list_bookings_for_user(current_user.id)
+        series_list = series_dal.list_series_for_user(current_user.id)
         view_mode = "personal"
         waitlist_entries = waitlist_dal.list_waiting_entries_for_user(current_user.id)
 
-        # Auto-promote any waitlist entries that now have capacity
-        conversions = []
-        for entry in list(waitlist_entries):
-            if not entry.start_time or not entry.end_time:
-                continue
-            booking = promote_waitlist_entry(entry.resource, entry.start_time, entry.end_time)
-            if booking:
-                conversions.append(entry.id)
-
-        if conversions:
-            db.session.commit()
-            flash("A slot opened and we booked it automatically. Check your bookings for details.", "info")
-            bookings = bookings_dal.list_bookings_for_user(current_user.id)
-            waitlist_entries = waitlist_dal.list_waiting_entries_for_user(current_user.id)
+    now = datetime.now()
+    series_cards = [
+        {
+            "series": series,
+            "summary": describe_rule(series.rule),
+            "next": next_occurrence(series, now) if series.status != "cancelled" else None,
+        }
+        for series in series_list
+    ]
 
     return render_template(
         "bookings/dashboard.html",
         bookings=bookings,
+        series_cards=series_cards,
         view_mode=view_mode,
         waitlist_entries=waitlist_entries
     )
@@ -68,16 +70,90 @@ def cancel_my_booking(booking_id):
         booking.request.mark("closed", "Cancelled by requester.")
 
     db.session.flush()
-    promoted_booking = promote_waitlist_entry(resource, slot_start, slot_end)
+    enqueue_promotion(resource.id, slot_start, slot_end, "cancelled", actor=current_user)
     db.session.commit()
 
     flash("Booking cancelled.", "success")
-    if promoted_booking:
-        flash("Someone on the waitlist was auto-booked for this slot.", "info")
 
     return redirect(request.form.get("return_to") or url_for("booking.dashboard"))
 
 
+@booking_bp.route("/series/<int:series_id>/cancel", methods=["POST"])
+@login_required
+def cancel_series(series_id):
+    """Cancel the occurrences of a recurring series that have not started yet."""
+    series = series_dal.get_series_or_404(series_id)
+    if series.user_id != current_user.id and not current_user.is_admin():
+        abort(403)
+
+    return_to = request.form.get("return_to") or url_for("booking.dashboard")
+    if series.status == "cancelled":
+        flash("This series is already cancelled.", "info")
+        return redirect(return_to)
+
+    freed = cancel_series_from(series, datetime.now())
+    if freed is None:
+        flash("This series has no upcoming occurrences left to cancel.", "info")
+        return redirect(return_to)
+    enqueue_promotion(series.resource_id, *freed, "cancelled", actor=current_user)
+
+    if series.user_id != current_user.id:
+        send_notification(
+            series.user,
+            title="Recurring booking cancelled",
+            message=f"The upcoming dates of your recurring booking for {series.resource.title} were cancelled by an admin.",
+            notification_type="booking_cancelled",
+            related_url=url_for("booking.dashboard"),
+        )
+
+    db.session.commit()
+    flash(
+        "Recurring booking cancelled." if series.status == "cancelled"
+        else "Upcoming dates cancelled. Past dates stay in your booking history.",
+        "success",
+    )
+    return redirect(return_to)
+
+
+@booking_bp.route("/series/<int:series_id>/edit", methods=["POST"])
+@login_required
+@retry_on_lock_conflict
+def edit_series(series_id):
+    """Update a series' purpose or move its last date earlier or later."""
+    series = series_dal.get_series_or_404(series_id)
+    if series.user_id != current_user.id and not current_user.is_admin():
+        abort(403)
+
+    return_to = request.form.get("return_to") or url_for("booking.dashboard")
+    if series.status == "cancelled":
+        flash("Cancelled series can't be edited.", "warning")
+        return redirect(return_to)
+
+    purpose = (request.form.get("purpose") or "").strip()
+    if purpose:
+        series.purpose = purpose
+
+    end_date_raw = request.form.get("end_date")
+    if end_date_raw:
+        try:
+            end_date = datetime.strptime(end_date_raw, "%Y-%m-%d").date()
+        except ValueError:
+            flash("Invalid end date.", "warning")
+            return redirect(return_to)
+
+        previous_end = series.last_end_time
+        result = reschedule_series_end(series, datetime.combine(end_date, series.start_time.time()))
+        if result.issues:
+            flash(result.first_issue.message, "warning")
+            return redirect(return_to)
+        if series.last_end_time < previous_end:
+            enqueue_promotion(series.resource_id, series.last_end_time, previous_end, "rescheduled", actor=current_user)
+
+    db.session.commit()
+    flash("Recurring booking updated.", "success")
+    return redirect(return_to)
+
+
 @booking_bp.route("/<int:booking_id>")
 @login_required
 def detail(booking_id):
@@ -162,14 +238,16 @@ def _format_ics_datetime(dt):
 def export_ics():
     """Generate an iCal feed of the user's bookings."""
     if current_user.is_admin():
-        bookings = Booking.query.order_by(Booking.start_time.asc()).all()
+        bookings = bookings_dal.booking_rows().order_by(Booking.start_time.asc()).all()
+        series_list = series_dal.list_all_series()
     else:
         bookings = (
-            Booking.query
+            bookings_dal.booking_rows()
             .filter_by(user_id=current_user.id)
             .order_by(Booking.start_time.asc())
             .all()
         )
+        series_list = series_dal.list_series_for_user(current_user.id)
 
     lines = [
         "BEGIN:VCALENDAR",
@@ -192,6 +270,24 @@ def export_ics():
             "END:VEVENT",
         ])
 
+    # Series stay a single event with an RRULE; calendar clients expand them.
+    for series in series_list:
+        if series.status == "cancelled":
+            continue
+        resource = series.resource
+        lines.extend([
+            "BEGIN:VEVENT",
+            f"UID:series-{series.id}@campushub",
+            f"DTSTAMP:{_format_ics_datetime(series.created_at or series.start_time)}",
+            f"DTSTART:{_format_ics_datetime(series.start_time)}",
+            f"DTEND:{_format_ics_datetime(series.end_time)}",
+            f"RRULE:{ics_rule(series)}",
+            f"SUMMARY:{resource.title}",
+            f"LOCATION:{resource.location or 'Hoosier Hub Resource'}",
+            f"DESCRIPTION:Recurring reservation for {series.user.name} (Status: {series.status})",
+            "END:VEVENT",
+        ])
+
     lines.append("END:VCALENDAR")
     ics_content = "\r\n".join(lines)
     return Response(
@@ -3,7 +3,9 @@
 from flask import Blueprint, render_template, abort
 from flask_login import current_user
 from sqlalchemy import func
+from sqlalchemy.orm import joinedload
 
+from src.data_access.loading import load_plan
 from src.models.models import Resource, Review, SitePage
 
 main_bp = Blueprint("main", __name__)
@@ -13,6 +15,7 @@ main_bp = Blueprint("main", __name__)
 def home():
     featured_resources = (
         Resource.query
+        .options(*load_plan())
         .filter(Resource.status == Resource.STATUS_PUBLISHED)
         .order_by(Resource.created_at.desc())
         .limit(3)
@@ -21,6 +24,7 @@ def home():
 
     review_samples = (
         Review.query
+        .options(*load_plan(joinedload(Review.reviewer), joinedload(Review.resource)))
         .filter(Review.comment.isnot(None))
         .order_by(Review.created_at.desc())
         .limit(6)
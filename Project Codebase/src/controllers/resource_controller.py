@@ -1,8 +1,9 @@
 from datetime import datetime, timezone, timedelta, time
 
-from flask import Blueprint, render_template, redirect, url_for, flash, request, abort, current_app
+from flask import Blueprint, render_template, redirect, url_for, flash, request, abort, current_app, jsonify
 from flask_login import login_required, current_user
 from sqlalchemy import or_, func
+from sqlalchemy.orm import joinedload, selectinload
 from src.models.models import (
     db,
     Resource,
@@ -11,22 +12,38 @@ from src.models.models import (
     BookingRequest,
     Message,
     User,
-    DowntimeBlock,
     Review,
     ResourceConversation,
     ResourceConversationMessage,
     SitePage,
 )
 from src.data_access import resources_dal, bookings_dal
+from src.data_access.loading import load_plan
 from src.services.notification_service import send_notification
-from src.services.booking_service import create_owner_booking_request
 from src.services.external_search import fetch_related_terms
 from src.services.booking_rules import (
     validate_time_block,
     ensure_capacity,
 )
+from src.services.availability_service import (
+    batch_remaining_capacity,
+    find_available_windows,
+)
 from src.services.slot_service import build_slot_days
-from src.services.waitlist_service import promote_waitlist_entry
+from src.services.booking_engine import (
+    MAX_RECURRENCE_OCCURRENCES,
+    OPENING_HOURS,
+    create_bookings,
+    create_series,
+    expand_recurrence,
+    partial_occurrences,
+    preflight_occurrences,
+    recurrence_limit,
+)
+from src.services.series_service import rule_for_recurrence
+from src.services.booking_locks import retry_on_lock_conflict
+from src.services.promotion_queue import enqueue_capacity_change, enqueue_promotion
+from src.services.waitlist_service import book_available_and_waitlist, next_waitlist_position
 from src.utils.db_helpers import get_or_404
 
 resource_bp = Blueprint("resource_bp", __name__, url_prefix="/resources")
@@ -111,6 +128,7 @@ def preview_resources():
     """Show a preview of resources to guests and highlight real feedback."""
     featured_resources = (
         Resource.query
+        .options(*load_plan())
         .filter(Resource.status == Resource.STATUS_PUBLISHED)
         .order_by(Resource.created_at.desc())
         .limit(6)
@@ -119,6 +137,7 @@ def preview_resources():
 
     review_samples = (
         Review.query
+        .options(*load_plan(joinedload(Review.reviewer), joinedload(Review.resource)))
         .filter(Review.comment.isnot(None))
         .order_by(Review.created_at.desc())
         .limit(6)
@@ -218,7 +237,13 @@ def list_resources():
     else:
         advanced_mode = False
 
-    resources = query.all()
+    entries = resources_dal.catalog_entries(
+        query,
+        sort_option,
+        rating_prior_weight=current_app.config.get("RATING_PRIOR_WEIGHT", 0),
+    )
+    resources = [entry.resource for entry in entries]
+    ratings = {entry.resource.id: entry.rating for entry in entries}
 
     availability_start_dt = None
     availability_end_dt = None
@@ -232,36 +257,18 @@ def list_resources():
             availability_end_dt = None
 
     if availability_start_dt and availability_end_dt and availability_start_dt < availability_end_dt:
-        resources = [
-            resource for resource in resources
-            if resource.get_available_slots(availability_start_dt, availability_end_dt) > 0
-        ]
-
-    def booking_count(resource):
-        return sum(1 for booking in resource.bookings if booking.status in ("approved", "pending"))
-
-    if sort_option == "most_booked":
-        resources.sort(key=booking_count, reverse=True)
-    elif sort_option == "top_rated":
-        resources.sort(key=lambda r: r.average_rating(), reverse=True)
-    else:
-        resources.sort(key=lambda r: r.created_at or datetime.min, reverse=True)
+        remaining = batch_remaining_capacity(resources, availability_start_dt, availability_end_dt)
+        resources = [resource for resource in resources if remaining.get(resource.id, 0) > 0]
 
     categories = db.session.query(Resource.category).distinct().all()
     categories = [cat[0] for cat in categories if cat[0]]
 
-    spotlight_reviews = []
-    for res in resources:
-        for rev in res.reviews:
-            if rev.comment:
-                spotlight_reviews.append(rev)
-
-    spotlight_reviews.sort(key=lambda r: r.created_at or datetime.min, reverse=True)
-    spotlight_reviews = spotlight_reviews[:3]
+    spotlight_reviews = resources_dal.latest_commented_reviews(resource.id for resource in resources)
 
     return render_template(
         "resources/list.html",
         resources=resources,
+        ratings=ratings,
         categories=categories,
         current_category=category_filter,
         current_access=access_filter,
@@ -277,6 +284,80 @@ def list_resources():
     )
 
 
+@resource_bp.route("/availability")
+@login_required
+def resource_availability():
+    """Return remaining capacity for a set of resources over one window."""
+    raw_ids = request.args.get("ids", "")
+    try:
+        start_dt = datetime.strptime(request.args.get("start_time", ""), "%Y-%m-%dT%H:%M")
+        end_dt = datetime.strptime(request.args.get("end_time", ""), "%Y-%m-%dT%H:%M")
+    except ValueError:
+        return jsonify({"success": False, "message": "Provide start_time and end_time as YYYY-MM-DDTHH:MM."}), 400
+    if start_dt >= end_dt:
+        return jsonify({"success": False, "message": "End time must be after start time."}), 400
+
+    query = Resource.query
+    if not current_user.is_admin():
+        query = query.filter(Resource.status == Resource.STATUS_PUBLISHED)
+    resource_ids = [int(value) for value in raw_ids.split(",") if value.strip().isdigit()]
+    if resource_ids:
+        query = query.filter(Resource.id.in_(resource_ids))
+
+    resources = query.with_entities(Resource.id, Resource.capacity).all()
+    remaining = batch_remaining_capacity(resources, start_dt, end_dt)
+    return jsonify({
+        "success": True,
+        "start_time": start_dt.isoformat(),
+        "end_time": end_dt.isoformat(),
+        "availability": {str(resource_id): slots for resource_id, slots in remaining.items()},
+    })
+
+
+@resource_bp.route("/find-slot")
+@login_required
+def find_slot():
+    """Return the earliest open windows across the catalog ("find me a room now")."""
+    duration = request.args.get("duration", 1, type=int)
+    start_raw = request.args.get("start_time")
+    try:
+        earliest = datetime.strptime(start_raw, "%Y-%m-%dT%H:%M") if start_raw else datetime.now()
+    except ValueError:
+        return jsonify({"success": False, "message": "Provide start_time as YYYY-MM-DDTHH:MM."}), 400
+    try:
+        validate_time_block(datetime(2000, 1, 1), datetime(2000, 1, 1) + timedelta(hours=duration))
+    except ValueError as exc:
+        return jsonify({"success": False, "message": str(exc)}), 400
+
+    windows = find_available_windows(
+        duration,
+        earliest,
+        category=request.args.get("category") or None,
+        min_capacity=request.args.get("min_capacity", type=int),
+        access_type=request.args.get("access") or None,
+        limit=max(1, min(request.args.get("limit", 5, type=int), 20)),
+    )
+    return jsonify({
+        "success": True,
+        "windows": [
+            {
+                "resource_id": window.resource.id,
+                "title": window.resource.title,
+                "location": window.resource.location,
+                "start_time": window.start_time.isoformat(),
+                "end_time": window.end_time.isoformat(),
+                "remaining": window.remaining,
+                "url": url_for(
+                    "resource_bp.resource_detail",
+                    resource_id=window.resource.id,
+                    date=window.start_time.date().isoformat(),
+                ),
+            }
+            for window in windows
+        ],
+    })
+
+
 # --------------------------
 # OWNER REQUESTS INBOX
 # --------------------------
@@ -291,6 +372,12 @@ def owner_requests():
     if owns_resources:
         requests = (
             BookingRequest.query
+            .options(*load_plan(
+                joinedload(BookingRequest.requester),
+                joinedload(BookingRequest.resource),
+                joinedload(BookingRequest.booking),
+                selectinload(BookingRequest.messages).joinedload(Message.sender),
+            ))
             .join(Resource, BookingRequest.resource_id == Resource.id)
             .filter(Resource.owner_id == current_user.id, BookingRequest.kind == "owner")
             .order_by(BookingRequest.created_at.desc())
@@ -300,6 +387,12 @@ def owner_requests():
 
     conversations = (
         ResourceConversation.query
+        .options(*load_plan(
+            joinedload(ResourceConversation.resource),
+            joinedload(ResourceConversation.owner),
+            joinedload(ResourceConversation.requester),
+            selectinload(ResourceConversation.messages).joinedload(ResourceConversationMessage.sender),
+        ))
         .filter(or_(ResourceConversation.owner_id == current_user.id, ResourceConversation.requester_id == current_user.id))
         .order_by(ResourceConversation.updated_at.desc())
         .all()
@@ -468,6 +561,7 @@ def send_request_message(request_id):
 def owner_resources():
     resources = (
         Resource.query
+        .options(*load_plan())
         .filter_by(owner_id=current_user.id)
         .order_by(Resource.created_at.desc())
         .all()
@@ -482,7 +576,7 @@ def owner_resources():
 @login_required
 def owner_resource_bookings():
     bookings = (
-        Booking.query
+        bookings_dal.booking_rows()
         .join(Resource, Booking.resource_id == Resource.id)
         .filter(Resource.owner_id == current_user.id)
         .order_by(Booking.start_time.desc())
@@ -557,7 +651,7 @@ def owner_reject_booking(booking_id):
     booking.rejection_reason = reason or None
 
     db.session.flush()
-    promoted_booking = promote_waitlist_entry(resource, slot_start, slot_end, actor=current_user)
+    enqueue_promotion(resource.id, slot_start, slot_end, "rejected", actor=current_user)
 
     send_notification(
         booking.user,
@@ -571,9 +665,6 @@ def owner_reject_booking(booking_id):
         related_url=url_for("booking.dashboard")
     )
 
-    if promoted_booking:
-        flash("Slot reassigned to the next person on the waitlist.", "info")
-
     db.session.commit()
     flash("Booking rejected and the user has been notified.", "info")
     return redirect(redirect_to or request.referrer or url_for("resource_bp.owner_resource_bookings"))
@@ -595,6 +686,7 @@ def resource_detail(resource_id):
 
     reviews = (
         Review.query
+        .options(*load_plan(joinedload(Review.reviewer)))
         .filter_by(resource_id=resource_id)
         .order_by(Review.created_at.desc())
         .all()
@@ -628,6 +720,7 @@ def resource_detail(resource_id):
     if is_owner:
         pending_owner_bookings = (
             Booking.query
+            .options(*load_plan(joinedload(Booking.user)))
             .filter_by(resource_id=resource_id, status="pending")
             .order_by(Booking.start_time.asc())
             .all()
@@ -669,22 +762,27 @@ def resource_detail(resource_id):
     today_iso = datetime.now(timezone.utc).date().isoformat()
     selected_date_iso = slot_anchor.date().isoformat() if slot_anchor else today_iso
 
+    alternative_windows = []
+    if request.args.get("waitlist") and not current_user.is_admin():
+        try:
+            wait_start = datetime.strptime(request.args.get("wait_start", ""), "%Y-%m-%dT%H:%M")
+            wait_end = datetime.strptime(request.args.get("wait_end", ""), "%Y-%m-%dT%H:%M")
+            validate_time_block(wait_start, wait_end)
+        except ValueError:
+            wait_start = wait_end = None
+        if wait_start and wait_end:
+            alternative_windows = find_available_windows(
+                int((wait_end - wait_start).total_seconds() // 3600),
+                wait_start,
+                category=resource.category,
+                limit=3,
+            )
+
     can_review = False
     existing_review = None
     has_completed_booking = False
     if current_user.role in ("student", "staff") and resource.owner_id != current_user.id:
-        completed_booking = (
-            Booking.query
-            .filter(
-                Booking.resource_id == resource_id,
-                Booking.user_id == current_user.id,
-                Booking.status == "approved",
-                Booking.end_time <= datetime.now(timezone.utc),
-            )
-            .order_by(Booking.end_time.desc())
-            .first()
-        )
-        if completed_booking:
+        if bookings_dal.has_completed_booking(resource_id, current_user.id):
             has_completed_booking = True
             existing_review = (
                 Review.query
@@ -713,12 +811,60 @@ def resource_detail(resource_id):
         has_completed_booking=has_completed_booking,
         conversation=conversation,
         conversation_messages=conversation_messages,
-        can_message_owner=can_message_owner
+        can_message_owner=can_message_owner,
+        alternative_windows=alternative_windows,
+        max_recurrence=recurrence_limit(resource, current_user),
+    )
+
+
+@resource_bp.route("/<int:resource_id>/preflight")
+@login_required
+def booking_preflight(resource_id):
+    """Check every occurrence of a proposed (possibly recurring) booking in one pass."""
+    resource = resources_dal.get_resource_or_404(resource_id)
+    try:
+        start_time = datetime.strptime(request.args.get("start_time", ""), "%Y-%m-%dT%H:%M")
+        end_time = datetime.strptime(request.args.get("end_time", ""), "%Y-%m-%dT%H:%M")
+    except ValueError:
+        return jsonify({"success": False, "message": "Provide start_time and end_time as YYYY-MM-DDTHH:MM."}), 400
+    try:
+        validate_time_block(start_time, end_time)
+    except ValueError as exc:
+        return jsonify({"success": False, "message": str(exc)}), 400
+
+    occurrences = expand_recurrence(
+        start_time,
+        end_time,
+        request.args.get("recurrence", "none"),
+        request.args.get("recurrence_count", type=int),
+        limit=recurrence_limit(resource, current_user),
+    )
+    # The admin booking form shares this check but is not limited to the slot grid's hours.
+    statuses = preflight_occurrences(
+        resource, occurrences, opening_hours=None if current_user.is_admin() else OPENING_HOURS
     )
+    counts = {"ok": 0, "full": 0, "downtime": 0, "out_of_hours": 0}
+    for status in statuses:
+        counts[status.status] += 1
+    return jsonify({
+        "success": True,
+        "counts": counts,
+        "partial_limit": MAX_RECURRENCE_OCCURRENCES,
+        "occurrences": [
+            {
+                "start_time": status.start_time.isoformat(),
+                "end_time": status.end_time.isoformat(),
+                "status": status.status,
+                "message": status.message,
+            }
+            for status in statuses
+        ],
+    })
 
 
 @resource_bp.route("/<int:resource_id>/book", methods=["POST"])
 @login_required
+@retry_on_lock_conflict
 def book_resource(resource_id):
     """Create a booking request for a resource."""
     resource = resources_dal.get_resource_or_404(resource_id)
@@ -748,84 +894,83 @@ def book_resource(resource_id):
         return redirect(url_for("resource_bp.resource_detail", resource_id=resource_id))
 
     recurrence = request.form.get("recurrence", "none")
-    recurrence_count = request.form.get("recurrence_count", type=int) or 1
-    recurrence_count = max(1, min(recurrence_count, 10))
-
-    delta_lookup = {
-        "daily": timedelta(days=1),
-        "weekly": timedelta(weeks=1),
-    }
-
-    occurrences = [(start_time, end_time)]
-    if recurrence in delta_lookup and recurrence_count > 1:
-        delta = delta_lookup[recurrence]
-        for i in range(1, recurrence_count):
-            occ_start = start_time + i * delta
-            occ_end = end_time + i * delta
-            occurrences.append((occ_start, occ_end))
-
-    for occ_start, occ_end in occurrences:
-        downtime = (
-            DowntimeBlock.query
-            .filter_by(resource_id=resource_id)
-            .filter(
-                DowntimeBlock.start_time < occ_end,
-                DowntimeBlock.end_time > occ_start
-            )
-            .first()
-        )
-        if downtime:
-            flash(
-                f"This resource is unavailable between "
-                f"{downtime.start_time.strftime('%b %d, %Y %I:%M %p')} and "
-                f"{downtime.end_time.strftime('%b %d, %Y %I:%M %p')} (reason: {downtime.reason or 'maintenance'}).",
-                "warning"
-            )
-            return redirect(url_for("resource_bp.resource_detail", resource_id=resource_id))
+    recurrence_count = request.form.get("recurrence_count", type=int)
+    auto_approve = resource.access_type == "public" or resource.owner_id == current_user.id
 
+    if request.form.get("partial") == "1":
+        # "Book the ones that fit and waitlist the rest": individual rows, since
+        # a series cannot have holes.
         try:
-            ensure_capacity(resource, occ_start, occ_end)
+            occurrences = partial_occurrences(start_time, end_time, recurrence, recurrence_count)
         except ValueError as exc:
             flash(str(exc), "warning")
-            return redirect(
-                url_for(
-                    "resource_bp.resource_detail",
-                    resource_id=resource_id,
-                    waitlist="1",
-                    wait_start=start_time.strftime("%Y-%m-%dT%H:%M"),
-                    wait_end=end_time.strftime("%Y-%m-%dT%H:%M"),
-                    wait_purpose=purpose
-                )
-            )
-
-    # Allow multiple bookings even if user already has one pending/approved
-    is_owner_booking = resource.owner_id == current_user.id
-    auto_approve = resource.access_type == "public" or is_owner_booking
-
-    bookings_created = []
-    for occ_start, occ_end in occurrences:
-        booking = Booking(
-            resource_id=resource_id,
-            user_id=current_user.id,
-            start_time=occ_start,
-            end_time=occ_end,
+            return redirect(url_for("resource_bp.resource_detail", resource_id=resource_id))
+        result, waitlisted = book_available_and_waitlist(
+            resource,
+            current_user,
+            occurrences,
             purpose=purpose or f"Booking request by {current_user.name}",
-            status="approved" if auto_approve else "pending",
-            approved_by=current_user.id if auto_approve else None,
-            decision_at=datetime.now(timezone.utc) if auto_approve else None
+            opening_hours=OPENING_HOURS,
         )
-        db.session.add(booking)
-        db.session.flush()
+        if not result.bookings and not waitlisted:
+            flash(result.first_issue.message if result.issues else "Nothing to book.", "warning")
+            return redirect(url_for("resource_bp.resource_detail", resource_id=resource_id))
+        db.session.commit()
 
-        if not auto_approve:
-            create_owner_booking_request(resource, booking, current_user, purpose)
+        skipped = len(result.issues) - len(waitlisted)
+        summary = [f"Booked {len(result.bookings)} of {len(result.bookings) + len(result.issues)} occurrences"]
+        if waitlisted:
+            summary.append(f"joined the waitlist for {len(waitlisted)}")
+        if skipped:
+            summary.append(f"skipped {skipped} that cannot be booked")
+        if not result.auto_approved and result.bookings:
+            summary.append("the owner will review the bookings")
+        flash("; ".join(summary) + ".", "success" if result.bookings else "info")
+        return redirect(url_for("resource_bp.resource_detail", resource_id=resource_id))
 
-        bookings_created.append(booking)
+    series_rule = rule_for_recurrence(recurrence, recurrence_count) if auto_approve else None
+
+    # Allow multiple bookings even if user already has one pending/approved
+    if series_rule:
+        result = create_series(
+            resource,
+            current_user,
+            start_time,
+            end_time,
+            series_rule,
+            purpose=purpose or f"Booking request by {current_user.name}",
+            opening_hours=OPENING_HOURS,
+        )
+    else:
+        result = create_bookings(
+            resource,
+            current_user,
+            expand_recurrence(start_time, end_time, recurrence, recurrence_count),
+            purpose=purpose or f"Booking request by {current_user.name}",
+            opening_hours=OPENING_HOURS,
+        )
+    issue = result.first_issue
+    if issue and issue.status != "full":
+        flash(issue.message, "warning")
+        return redirect(url_for("resource_bp.resource_detail", resource_id=resource_id))
+    if issue:
+        flash(issue.message, "warning")
+        return redirect(
+            url_for(
+                "resource_bp.resource_detail",
+                resource_id=resource_id,
+                waitlist="1",
+                wait_start=start_time.strftime("%Y-%m-%dT%H:%M"),
+                wait_end=end_time.strftime("%Y-%m-%dT%H:%M"),
+                wait_purpose=purpose
+            )
+        )
 
     db.session.commit()
 
-    if auto_approve:
-        flash(f"{len(bookings_created)} booking{'s' if len(bookings_created) > 1 else ''} confirmed! You're all set.", "success")
+    booked_count = result.occurrence_total
+    if result.auto_approved:
+        flash(f"{booked_count} booking{'s' if booked_count > 1 else ''} confirmed! You're all set.", "success")
     else:
         flash("Booking request submitted! You'll be notified once it's reviewed.", "success")
     return redirect(url_for("resource_bp.resource_detail", resource_id=resource_id))
@@ -833,6 +978,7 @@ def book_resource(resource_id):
 
 @resource_bp.route("/<int:resource_id>/self-book", methods=["POST"])
 @login_required
+@retry_on_lock_conflict
 def self_book_resource(resource_id):
     """Allow resource owners (staff or students) to instantly book their own resource."""
     resource = resources_dal.get_resource_or_404(resource_id)
@@ -860,41 +1006,11 @@ def self_book_resource(resource_id):
         flash(str(exc), "warning")
         return redirect(request.referrer or url_for("resource_bp.list_resources"))
 
-    downtime = (
-        DowntimeBlock.query
-        .filter_by(resource_id=resource_id)
-        .filter(
-            DowntimeBlock.start_time < end_time,
-            DowntimeBlock.end_time > start_time
-        )
-        .first()
-    )
-    if downtime:
-        flash(
-            f"This resource is unavailable between "
-            f"{downtime.start_time.strftime('%b %d, %Y %I:%M %p')} and "
-            f"{downtime.end_time.strftime('%b %d, %Y %I:%M %p')} (reason: {downtime.reason or 'maintenance'}).",
-            "warning"
-        )
+    result = create_bookings(resource, current_user, [(start_time, end_time)], purpose=purpose, auto_approve=True)
+    if result.issues:
+        flash(result.first_issue.message, "warning")
         return redirect(request.referrer or url_for("resource_bp.list_resources"))
 
-    try:
-        ensure_capacity(resource, start_time, end_time)
-    except ValueError as exc:
-        flash(str(exc), "warning")
-        return redirect(request.referrer or url_for("resource_bp.list_resources"))
-
-    booking = Booking(
-        resource_id=resource_id,
-        user_id=current_user.id,
-        start_time=start_time,
-        end_time=end_time,
-        purpose=purpose,
-        status="approved",
-        approved_by=current_user.id,
-        decision_at=datetime.now(timezone.utc)
-    )
-    db.session.add(booking)
     db.session.commit()
 
     flash(f"{resource.title} is booked for you!", "success")
@@ -1072,6 +1188,7 @@ def edit_resource(resource_id):
                 BASIC_STUDENT_CATEGORIES.append(category_value)
                 BASIC_CATEGORY_SET[category_value.lower()] = category_value
         resource.category = category_value
+        previous_capacity = resource.capacity or 0
         resource.capacity = request.form.get("capacity", type=int)
         resource.location = request.form.get("location")
         resource.available_slots = request.form.get("available_slots", type=int)
@@ -1087,6 +1204,9 @@ def edit_resource(resource_id):
                 return render_template("resources/edit.html", resource=resource, owner_options=owner_options)
             resource.owner_id = owner.id
 
+        if (resource.capacity or 0) > previous_capacity:
+            enqueue_capacity_change(resource.id, actor=current_user)
+
         db.session.commit()
         flash(f"Resource '{resource.title}' updated successfully!", "success")
         return redirect(url_for("resource_bp.resource_detail", resource_id=resource.id))
@@ -1138,23 +1258,19 @@ def join_waitlist(resource_id):
         .first()
     )
     
-    max_position = db.session.query(db.func.max(Waitlist.position)).filter_by(
-        resource_id=resource_id
-    ).scalar() or 0
-    
     if existing:
         if existing.status == "waiting":
             flash("You're already on the waitlist for that time window.", "info")
             return redirect(redirect_target)
         existing.status = "waiting"
-        existing.position = max_position + 1
+        existing.position = next_waitlist_position(resource_id)
         existing.created_at = datetime.now(timezone.utc)
         waitlist_entry = existing
     else:
         waitlist_entry = Waitlist(
             resource_id=resource_id,
             user_id=current_user.id,
-            position=max_position + 1,
+            position=next_waitlist_position(resource_id),
             start_time=start_time,
             end_time=end_time,
             purpose=purpose or None,
@@ -1299,19 +1415,7 @@ def submit_review(resource_id):
         flash("Select a rating between 1 and 5 stars.", "warning")
         return redirect(url_for("resource_bp.resource_detail", resource_id=resource_id))
 
-    completed_booking = (
-        Booking.query
-        .filter(
-            Booking.resource_id == resource_id,
-            Booking.user_id == current_user.id,
-            Booking.status == "approved",
-            Booking.end_time <= datetime.now(timezone.utc),
-        )
-        .order_by(Booking.end_time.desc())
-        .first()
-    )
-
-    if not completed_booking:
+    if not bookings_dal.has_completed_booking(resource_id, current_user.id):
         flash("You need a completed booking before leaving a review.", "info")
         return redirect(url_for("resource_bp.resource_detail", resource_id=resource_id))
 
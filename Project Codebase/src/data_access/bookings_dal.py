@@ -1,8 +1,14 @@
 """Booking-related database helpers."""
 
+from datetime import datetime, timezone
 from typing import List
 
-from src.models.models import Booking
+from sqlalchemy.orm import joinedload
+
+from src.data_access.loading import load_plan
+from src.models.models import db, Booking, BookingSeries
+from src.services.availability_service import normalize
+from src.services.series_service import occurrences_between
 from src.utils.db_helpers import get_or_404
 
 
@@ -10,14 +16,49 @@ def get_booking_or_404(booking_id: int) -> Booking:
     return get_or_404(Booking, booking_id)
 
 
+def booking_rows():
+    """Booking query for list pages, which show each row's user and resource."""
+    return Booking.query.options(*load_plan(joinedload(Booking.user), joinedload(Booking.resource)))
+
+
 def list_all_bookings() -> List[Booking]:
-    return Booking.query.order_by(Booking.start_time.desc()).all()
+    return booking_rows().order_by(Booking.start_time.desc()).all()
 
 
 def list_bookings_for_user(user_id: int) -> List[Booking]:
     return (
-        Booking.query.filter_by(user_id=user_id)
+        booking_rows().filter_by(user_id=user_id)
         .order_by(Booking.start_time.desc())
         .all()
     )
 
+
+
+def has_completed_booking(resource_id: int, user_id: int) -> bool:
+    """
+    True once the user has used the resource: an approved booking on it has
+    ended, or an occurrence of an approved series has. A series counts as
+    soon as one of its occurrences is over, even with later dates still to
+    come, since that visit already happened. Both use the naive UTC clock
+    the stored times are compared against.
+    """
+    now = normalize(datetime.now(timezone.utc))
+    finished_booking = Booking.query.filter(
+        Booking.resource_id == resource_id,
+        Booking.user_id == user_id,
+        Booking.status == "approved",
+        Booking.end_time <= now,
+    )
+    if db.session.query(finished_booking.exists()).scalar():
+        return True
+    started_series = BookingSeries.query.filter(
+        BookingSeries.resource_id == resource_id,
+        BookingSeries.user_id == user_id,
+        BookingSeries.status == "approved",
+        BookingSeries.start_time <= now,
+    )
+    return any(
+        end_time <= now
+        for series in started_series
+        for _, end_time in occurrences_between(series, series.start_time, now)
+    )
@@ -0,0 +1,48 @@
+"""Pre-flush attribute values for the flush hooks that keep denormalized counters in step."""
+
+from typing import Dict, Set
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+
+# model -> attribute names whose previous value the flush hooks read
+_TRACKED: Dict[type, Set[str]] = {}
+
+
+def _keep_previous_value(target, value, oldvalue, initiator):
+    pass
+
+
+def track_previous_values(*attributes) -> None:
+    """
+    Keep the previous value of each mapped attribute (e.g. Booking.status)
+    readable through previous_value() in after_flush. active_history loads
+    the old value when an expired attribute is assigned, so a change to a
+    committed row still shows what it was; deleted rows have their tracked
+    attributes loaded before the flush removes them.
+    """
+    for attribute in attributes:
+        event.listen(attribute, "set", _keep_previous_value, active_history=True)
+        _TRACKED.setdefault(attribute.class_, set()).add(attribute.key)
+
+
+def previous_value(state, attribute: str):
+    """Value an attribute had before the pending flush."""
+    history = state.attrs[attribute].history
+    if history.deleted:
+        return history.deleted[0]
+    return getattr(state.object, attribute)
+
+
+def changed(state, *attributes: str) -> bool:
+    """True when the pending flush changes any of `attributes`."""
+    return any(state.attrs[attribute].history.has_changes() for attribute in attributes)
+
+
+@event.listens_for(Session, "before_flush")
+def _load_deleted_values(session, flush_context, instances):
+    # Rows are gone once the flush runs, so read what deleted objects held now.
+    for obj in session.deleted:
+        for attribute in _TRACKED.get(type(obj), ()):
+            getattr(obj, attribute)
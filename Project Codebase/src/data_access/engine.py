@@ -0,0 +1,92 @@
+"""Engine profile: database URI, SQLite connection pragmas and per-worker pool sizing."""
+
+import os
+from typing import Dict, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+
+
+# Applied to every new SQLite connection, in this order (busy_timeout first so
+# switching the journal mode waits for other connections instead of failing).
+DEFAULT_SQLITE_PRAGMAS = {
+    "busy_timeout": 5000,  # ms to wait for the write lock before "database is locked"
+    "journal_mode": "WAL",  # readers and the single writer no longer block each other
+    "synchronous": "NORMAL",  # fsync at checkpoints only; durable across crashes in WAL mode
+    "cache_size": -20000,  # negative means KiB: ~20 MB page cache per connection
+    "mmap_size": 268435456,  # 256 MB of the file read through memory mapping
+    "temp_store": "MEMORY",
+}
+
+
+def normalize_database_uri(uri: str) -> str:
+    """Hosting providers still hand out `postgres://` URLs, which SQLAlchemy only accepts as `postgresql://`."""
+    if uri.startswith("postgres://"):
+        return "postgresql://" + uri[len("postgres://"):]
+    return uri
+
+
+def database_uri_from_env(default: str) -> str:
+    """DATABASE_URL when set, else `default`."""
+    return normalize_database_uri(os.getenv("DATABASE_URL") or default)
+
+
+def sqlite_pragmas_from_env() -> Dict[str, object]:
+    """
+    Pragmas for SQLite connections. SQLITE_PROFILE=default turns the tuning
+    off (SQLite's stock settings); SQLITE_<PRAGMA> overrides one value.
+    """
+    if os.getenv("SQLITE_PROFILE", "tuned") == "default":
+        return {}
+    return {
+        name: os.getenv(f"SQLITE_{name.upper()}", default)
+        for name, default in DEFAULT_SQLITE_PRAGMAS.items()
+    }
+
+
+def pool_options_from_env() -> Dict[str, int]:
+    """
+    Connection pool sizing for one worker process. Every gunicorn worker has
+    its own pool, so the database sees up to workers x (size + overflow).
+    """
+    return {
+        "pool_size": int(os.getenv("DB_POOL_SIZE", "5")),
+        "max_overflow": int(os.getenv("DB_MAX_OVERFLOW", "10")),
+        "pool_timeout": int(os.getenv("DB_POOL_TIMEOUT", "30")),
+        "pool_recycle": int(os.getenv("DB_POOL_RECYCLE", "1800")),
+    }
+
+
+def engine_options(uri: str, pool_options: Optional[Dict[str, int]] = None) -> Dict[str, object]:
+    """SQLALCHEMY_ENGINE_OPTIONS for `uri`. In-memory SQLite keeps its single shared connection."""
+    url = make_url(uri)
+    backend = url.get_backend_name()
+    if backend == "sqlite" and url.database in (None, "", ":memory:"):
+        return {}
+    options: Dict[str, object] = dict(pool_options if pool_options is not None else pool_options_from_env())
+    if backend == "postgresql":
+        # Server connections die behind our back (restarts, idle timeouts); test before use.
+        options["pool_pre_ping"] = True
+        # Timestamps are stored as naive UTC; pin the session zone so comparisons
+        # against timezone-aware parameters are not shifted by the server default.
+        options["connect_args"] = {"options": "-c timezone=utc"}
+    return options
+
+
+def apply_sqlite_pragmas(dbapi_connection, pragmas: Dict[str, object]) -> None:
+    cursor = dbapi_connection.cursor()
+    try:
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+    finally:
+        cursor.close()
+
+
+def install_sqlite_pragmas(engine, pragmas: Dict[str, object]) -> None:
+    """Run `pragmas` on every connection the engine opens (no-op for other backends)."""
+    if engine.dialect.name != "sqlite" or not pragmas:
+        return
+
+    @event.listens_for(engine, "connect")
+    def _set_pragmas(dbapi_connection, connection_record):
+        apply_sqlite_pragmas(dbapi_connection, pragmas)
@@ -0,0 +1,16 @@
+"""Loader options shared by list queries."""
+
+from flask import current_app, has_app_context
+from sqlalchemy.orm import raiseload
+
+
+def load_plan(*options):
+    """
+    Loader options for a list query. The query names every relationship its
+    page touches; with STRICT_LOADING on (tests, local development) any other
+    relationship access raises instead of lazily issuing a query per row.
+    Lookups the identity map can answer without SQL are still allowed.
+    """
+    if has_app_context() and current_app.config.get("STRICT_LOADING"):
+        return (*options, raiseload("*", sql_only=True))
+    return options
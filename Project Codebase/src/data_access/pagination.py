@@ -0,0 +1,107 @@
+"""Keyset (cursor) pagination for list queries."""
+
+import base64
+import binascii
+import json
+from collections import namedtuple
+from datetime import datetime
+from typing import Optional, Sequence
+
+from sqlalchemy import and_, or_
+from sqlalchemy.sql import operators
+
+
+KeysetPage = namedtuple("KeysetPage", "items next_cursor prev_cursor")
+
+DEFAULT_PAGE_SIZE = 50
+
+
+def encode_cursor(values) -> str:
+    """Opaque, URL-safe token for one row's sort key."""
+    payload = [{"dt": value.isoformat()} if isinstance(value, datetime) else value for value in values]
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode().rstrip("=")
+
+
+def decode_cursor(token: str, size: int) -> list:
+    """Sort key carried by a cursor token. Raises ValueError on a malformed token."""
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)))
+    except (binascii.Error, UnicodeDecodeError, json.JSONDecodeError) as exc:
+        raise ValueError("Invalid page cursor.") from exc
+    if not isinstance(payload, list) or len(payload) != size:
+        raise ValueError("Invalid page cursor.")
+    values = []
+    for value in payload:
+        if isinstance(value, dict):
+            if set(value) != {"dt"}:
+                raise ValueError("Invalid page cursor.")
+            value = datetime.fromisoformat(value["dt"])
+        elif isinstance(value, list):
+            raise ValueError("Invalid page cursor.")
+        values.append(value)
+    return values
+
+
+def _sort_keys(order_by):
+    keys = []
+    for clause in order_by:
+        descending = getattr(clause, "modifier", None) is operators.desc_op
+        if getattr(clause, "modifier", None) in (operators.asc_op, operators.desc_op):
+            clause = clause.element
+        keys.append((clause, descending))
+    return keys
+
+
+def _beyond(keys, values, backwards: bool):
+    """Rows that sort strictly after the cursor (before it when paging backwards)."""
+    terms = []
+    for position, (expression, descending) in enumerate(keys):
+        later = expression < values[position] if descending != backwards else expression > values[position]
+        ties = [keys[index][0] == values[index] for index in range(position)]
+        terms.append(and_(*ties, later))
+    # The redundant bound on the leading key lets the database range-scan an index.
+    leading, descending = keys[0]
+    bound = leading <= values[0] if descending != backwards else leading >= values[0]
+    return and_(bound, or_(*terms))
+
+
+def keyset_page(
+    query,
+    order_by: Sequence,
+    *,
+    after: Optional[str] = None,
+    before: Optional[str] = None,
+    per_page: int = DEFAULT_PAGE_SIZE,
+) -> KeysetPage:
+    """
+    One page of `query` in `order_by` order, positioned by a cursor instead of
+    an OFFSET, so every page costs the same however deep it is. `order_by` is
+    a list of `.asc()` / `.desc()` clauses whose last key is unique (usually
+    the primary key) and whose keys are never NULL. Pass `after` for the page
+    following a cursor or `before` for the page preceding one; the returned
+    cursors are None at either end of the list.
+    """
+    keys = _sort_keys(order_by)
+    backwards = before is not None
+    cursor = before if backwards else after
+
+    query = query.add_columns(*(expression for expression, _ in keys)).order_by(None)
+    if cursor:
+        query = query.filter(_beyond(keys, decode_cursor(cursor, len(keys)), backwards))
+    query = query.order_by(*(
+        expression.desc() if descending != backwards else expression.asc()
+        for expression, descending in keys
+    ))
+
+    rows = query.limit(per_page + 1).all()
+    has_more = len(rows) > per_page
+    rows = rows[:per_page]
+    if backwards:
+        rows.reverse()
+
+    items = [row[0] for row in rows]
+    first = encode_cursor(rows[0][1:]) if rows else None
+    last = encode_cursor(rows[-1][1:]) if rows else None
+    if backwards:
+        return KeysetPage(items, last, first if has_more else None)
+    return KeysetPage(items, last if has_more else None, first if cursor else None)
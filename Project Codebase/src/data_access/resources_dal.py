@@ -1,8 +1,13 @@
 """Encapsulated resource CRUD helpers."""
 
-from typing import List, Optional
+from collections import namedtuple
+from typing import Iterable, List, Optional
 
-from src.models.models import Resource
+from sqlalchemy import func, literal_column, select
+from sqlalchemy.orm import joinedload
+
+from src.data_access.loading import load_plan
+from src.models.models import Resource, Review
 from src.utils.db_helpers import get_or_404
 
 
@@ -13,7 +18,7 @@ def get_resource_or_404(resource_id: int) -> Resource:
 
 def list_published_resources(limit: Optional[int] = None) -> List[Resource]:
     """Return published resources, newest first."""
-    query = Resource.query.filter(Resource.status == Resource.STATUS_PUBLISHED).order_by(
+    query = Resource.query.options(*load_plan()).filter(Resource.status == Resource.STATUS_PUBLISHED).order_by(
         Resource.created_at.desc()
     )
     if limit:
@@ -24,8 +29,62 @@ def list_published_resources(limit: Optional[int] = None) -> List[Resource]:
 def list_resources_for_owner(owner_id: int) -> List[Resource]:
     """Return all resources owned by the specified user."""
     return (
-        Resource.query.filter_by(owner_id=owner_id)
+        Resource.query.options(*load_plan())
+        .filter_by(owner_id=owner_id)
         .order_by(Resource.created_at.desc())
         .all()
     )
 
+
+
+CatalogEntry = namedtuple("CatalogEntry", "resource booking_count rating rating_count")
+
+
+def catalog_entries(query, sort_option: str = "recent", *, rating_prior_weight: float = 0) -> List[CatalogEntry]:
+    """
+    Run a filtered Resource query for the catalog, sorted in SQL on the
+    denormalized counters, with owners joined in: one query however many
+    resources match. With a positive `rating_prior_weight`, "top_rated"
+    ranks by a Bayesian average that pulls resources with few reviews
+    toward the site-wide mean.
+    """
+    if sort_option == "most_booked":
+        order = [Resource.active_booking_count.desc()]
+    elif sort_option == "top_rated" and rating_prior_weight > 0:
+        site_mean = (
+            select(func.coalesce(func.sum(Resource.rating_sum) * 1.0 / func.nullif(func.sum(Resource.rating_count), 0), 0))
+            .scalar_subquery()
+        )
+        order = [
+            ((Resource.rating_sum + rating_prior_weight * site_mean) / (Resource.rating_count + rating_prior_weight)).desc(),
+        ]
+    elif sort_option == "top_rated":
+        order = [literal_column(Resource.RATING_AVERAGE_SQL).desc()]
+    else:
+        order = []
+    order += [Resource.created_at.desc().nullslast(), Resource.id.desc()]
+
+    resources = query.options(*load_plan(joinedload(Resource.owner))).order_by(*order).all()
+    return [
+        CatalogEntry(resource, resource.active_booking_count, resource.average_rating(), resource.rating_count)
+        for resource in resources
+    ]
+
+
+def latest_commented_reviews(resource_ids: Iterable[int], limit: int = 3) -> List[Review]:
+    """Newest reviews with a comment across the given resources, reviewer and resource loaded."""
+    resource_ids = list(resource_ids)
+    if not resource_ids:
+        return []
+    return (
+        Review.query
+        .options(*load_plan(joinedload(Review.reviewer), joinedload(Review.resource)))
+        .filter(
+            Review.resource_id.in_(resource_ids),
+            Review.comment.isnot(None),
+            Review.comment != "",
+        )
+        .order_by(Review.created_at.desc())
+        .limit(limit)
+        .all()
+    )
@@ -0,0 +1,109 @@
+"""Read/write session routing: read-only requests query through a separate engine."""
+
+from contextlib import contextmanager
+from typing import Optional
+
+from flask import current_app, g, has_app_context, request
+from flask_sqlalchemy.session import Session
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.sql.selectable import CompoundSelect, Select
+
+from src.data_access.engine import engine_options, install_sqlite_pragmas, normalize_database_uri
+
+
+SAFE_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+_EXTENSION = "read_engine"
+_READ_ONLY_REQUEST = "_read_only_request"
+_PINNED = "pinned_to_primary"
+
+
+def read_engine() -> Optional[Engine]:
+    """The current app's read engine, or None when routing is off."""
+    return current_app.extensions.get(_EXTENSION) if has_app_context() else None
+
+
+@contextmanager
+def read_only():
+    """Route plain SELECTs to the read engine outside a request, e.g. in a background refresh."""
+    previous = g.get(_READ_ONLY_REQUEST, False)
+    g._read_only_request = True
+    try:
+        yield
+    finally:
+        g._read_only_request = previous
+
+
+def _reader_for(clause) -> Optional[Engine]:
+    if not isinstance(clause, (Select, CompoundSelect)) or clause._for_update_arg is not None:
+        return None
+    if not g.get(_READ_ONLY_REQUEST, False):
+        return None
+    return read_engine()
+
+
+class RoutingSession(Session):
+    """
+    db.session. During a GET/HEAD/OPTIONS request, plain SELECTs run on the
+    read engine. Anything else (flushes, DML, SELECT ... FOR UPDATE, a bare
+    get_bind() such as the booking lock's) uses the primary and pins the rest
+    of the transaction to it, so a request always reads its own writes.
+    """
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and not self.info.get(_PINNED) and has_app_context():
+            reader = _reader_for(clause)
+            if reader is not None:
+                return reader
+            if g.get(_READ_ONLY_REQUEST, False):
+                self.info[_PINNED] = True
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+@event.listens_for(RoutingSession, "after_transaction_end")
+def _unpin(session, transaction):
+    if transaction.parent is None:
+        session.info.pop(_PINNED, None)
+
+
+def _read_url(app) -> Optional[str]:
+    """
+    Where read-only requests go: READ_DATABASE_URL when set, otherwise the
+    primary SQLite file itself when it runs in WAL mode (readers then never
+    wait on the writer). None turns routing off.
+    """
+    if app.config.get("READ_ROUTING", "auto") == "off":
+        return None
+    if app.config.get("READ_DATABASE_URL"):
+        return normalize_database_uri(app.config["READ_DATABASE_URL"])
+    uri = app.config["SQLALCHEMY_DATABASE_URI"]
+    url = make_url(uri)
+    if url.get_backend_name() != "sqlite" or url.database in (None, "", ":memory:"):
+        return None
+    if str(app.config.get("SQLITE_PRAGMAS", {}).get("journal_mode", "")).upper() != "WAL":
+        return None
+    return uri
+
+
+def init_read_routing(app) -> Optional[Engine]:
+    """Create the read engine and mark safe-method requests as read-only."""
+    url = _read_url(app)
+    if url is None:
+        return None
+
+    engine = create_engine(url, **engine_options(url))
+    if engine.dialect.name == "sqlite":
+        # query_only makes the connection refuse writes, so a routing mistake fails loudly.
+        install_sqlite_pragmas(engine, {**app.config.get("SQLITE_PRAGMAS", {}), "query_only": "ON"})
+    app.extensions[_EXTENSION] = engine
+
+    @app.before_request
+    def _mark_read_only_request():
+        g._read_only_request = request.method in SAFE_METHODS
+
+    @app.teardown_request
+    def _clear_read_only_request(exc):
+        g.pop(_READ_ONLY_REQUEST, None)
+
+    return engine
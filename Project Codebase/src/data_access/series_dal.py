@@ -0,0 +1,41 @@
+"""Recurring booking series helpers."""
+
+from typing import List
+
+from sqlalchemy.orm import joinedload
+
+from src.data_access.loading import load_plan
+from src.models.models import BookingSeries
+from src.utils.db_helpers import get_or_404
+
+
+def get_series_or_404(series_id: int) -> BookingSeries:
+    return get_or_404(BookingSeries, series_id)
+
+
+def _series_rows():
+    return BookingSeries.query.options(
+        *load_plan(joinedload(BookingSeries.user), joinedload(BookingSeries.resource))
+    )
+
+
+def list_all_series() -> List[BookingSeries]:
+    return _series_rows().order_by(BookingSeries.start_time.desc()).all()
+
+
+def list_series_for_resource(resource_id: int) -> List[BookingSeries]:
+    return (
+        _series_rows()
+        .filter_by(resource_id=resource_id)
+        .order_by(BookingSeries.start_time.asc())
+        .all()
+    )
+
+
+def list_series_for_user(user_id: int) -> List[BookingSeries]:
+    return (
+        _series_rows()
+        .filter_by(user_id=user_id)
+        .order_by(BookingSeries.start_time.desc())
+        .all()
+    )
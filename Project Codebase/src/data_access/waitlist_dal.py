@@ -1,7 +1,11 @@
 """Waitlist entry helpers."""
 
+from datetime import datetime
 from typing import List
 
+from sqlalchemy.orm import joinedload
+
+from src.data_access.loading import load_plan
 from src.models.models import Waitlist
 from src.utils.db_helpers import get_or_404
 
@@ -13,8 +17,40 @@ def get_waitlist_entry_or_404(entry_id: int) -> Waitlist:
 def list_waiting_entries_for_user(user_id: int) -> List[Waitlist]:
     return (
         Waitlist.query
+        .options(*load_plan(joinedload(Waitlist.resource)))
         .filter_by(user_id=user_id, status="waiting")
         .order_by(Waitlist.created_at.desc())
         .all()
     )
 
+
+
+def list_waiting_entries_overlapping(resource_id: int, start_time: datetime, end_time: datetime) -> List[Waitlist]:
+    """Waiting entries for a resource whose window touches [start_time, end_time), in queue order."""
+    return (
+        Waitlist.query
+        .options(*load_plan(joinedload(Waitlist.user)))
+        .filter(
+            Waitlist.resource_id == resource_id,
+            Waitlist.status == "waiting",
+            Waitlist.start_time < end_time,
+            Waitlist.end_time > start_time,
+        )
+        .order_by(Waitlist.position.asc().nullslast(), Waitlist.created_at.asc())
+        .all()
+    )
+
+
+def list_user_entries_between(resource_id: int, user_id: int, start_time: datetime, end_time: datetime) -> List[Waitlist]:
+    """Every entry (any status) a user holds on a resource that starts inside [start_time, end_time]."""
+    return (
+        Waitlist.query
+        .options(*load_plan())
+        .filter(
+            Waitlist.resource_id == resource_id,
+            Waitlist.user_id == user_id,
+            Waitlist.start_time >= start_time,
+            Waitlist.start_time <= end_time,
+        )
+        .all()
+    )
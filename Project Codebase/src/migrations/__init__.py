@@ -0,0 +1,116 @@
+"""
+Versioned schema migrations.
+
+Each `mNNN_<name>.py` module in this package is one migration: NNN is the
+schema version it produces and its `upgrade()` brings the previous version up
+to it through db.session. Applied versions are recorded in `schema_version`,
+so a process whose database is current reads one number and moves on.
+
+Migration 1 runs `db.metadata.create_all()`, which builds a fresh database
+straight at the latest table definitions, so later migrations check for the
+columns and indexes they add before creating them. Migrations carry their own
+SQL and backfill logic for the schema at their version instead of importing
+services, whose behaviour moves on after the migration ships.
+"""
+
+import importlib
+import pkgutil
+import re
+from collections import namedtuple
+from typing import List, Optional
+
+from sqlalchemy import func, inspect, select, text
+from sqlalchemy.exc import OperationalError, ProgrammingError
+
+from src.models.models import db, SchemaVersion
+
+
+Migration = namedtuple("Migration", "version name description upgrade")
+
+_MODULE_NAME = re.compile(r"^m(\d{3})_(\w+)$")
+
+# pg_advisory_xact_lock key shared by every process that migrates this database.
+_ADVISORY_LOCK_KEY = 0x5C4E_3A17
+
+
+def load_migrations() -> List[Migration]:
+    """Every migration in version order."""
+    migrations = []
+    for module_info in pkgutil.iter_modules(__path__):
+        match = _MODULE_NAME.match(module_info.name)
+        if not match:
+            continue
+        module = importlib.import_module(f"{__name__}.{module_info.name}")
+        description = (module.__doc__ or match.group(2)).strip().splitlines()[0]
+        migrations.append(Migration(int(match.group(1)), match.group(2), description, module.upgrade))
+    migrations.sort(key=lambda migration: migration.version)
+    if [migration.version for migration in migrations] != list(range(1, len(migrations) + 1)):
+        raise RuntimeError("Migration versions must be numbered 1..N without gaps.")
+    return migrations
+
+
+def head_version() -> int:
+    """Version the code expects the database to be at."""
+    return len(load_migrations())
+
+
+def current_version() -> int:
+    """Version recorded in the database; 0 before any migration has run."""
+    try:
+        with db.engine.connect() as connection:
+            return connection.execute(select(func.max(SchemaVersion.version))).scalar() or 0
+    except (OperationalError, ProgrammingError):
+        return 0  # no schema_version table yet
+
+
+def _lock_and_read_version() -> int:
+    """
+    Open the migration transaction holding the database-wide migration lock,
+    then read the version inside it, so a runner that waited on the lock sees
+    what the previous holder applied. SQLite takes the write lock up front
+    with BEGIN IMMEDIATE; PostgreSQL takes a transaction-scoped advisory lock.
+    Both are released by the commit or rollback that ends the transaction.
+    """
+    connection = db.session.connection()
+    if connection.dialect.name == "sqlite":
+        connection.exec_driver_sql("BEGIN IMMEDIATE")
+    elif connection.dialect.name == "postgresql":
+        connection.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": _ADVISORY_LOCK_KEY})
+    SchemaVersion.__table__.create(connection, checkfirst=True)
+    return connection.execute(select(func.max(SchemaVersion.version))).scalar() or 0
+
+
+def migrate(target: Optional[int] = None) -> List[Migration]:
+    """
+    Apply pending migrations up to `target` (default: the latest), committing
+    each one together with its schema_version row. Each migration runs under
+    the migration lock, so concurrent runners (several workers starting at
+    once) apply it exactly once. Returns what this call applied.
+    """
+    migrations = [
+        migration for migration in load_migrations() if target is None or migration.version <= target
+    ]
+    db.session.commit()  # the lock must open a transaction of its own
+    applied = []
+    while True:
+        current = _lock_and_read_version()
+        migration = next((migration for migration in migrations if migration.version > current), None)
+        if migration is None:
+            db.session.rollback()
+            return applied
+        migration.upgrade()
+        db.session.add(SchemaVersion(version=migration.version, name=migration.name))
+        db.session.commit()
+        applied.append(migration)
+
+
+def migrate_if_needed() -> List[Migration]:
+    """Startup hook: a single version read when the schema is current."""
+    if current_version() >= head_version():
+        return []
+    return migrate()
+
+
+def table_columns(table_name: str) -> set:
+    """Column names of a table as the migration's transaction sees it."""
+    return {column["name"] for column in inspect(db.session.connection()).get_columns(table_name)}
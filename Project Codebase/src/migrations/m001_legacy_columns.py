@@ -0,0 +1,39 @@
+"""Create missing tables and add the columns introduced before versioned migrations."""
+
+from sqlalchemy import text, update
+
+from src.migrations import table_columns
+from src.models.models import db, Booking
+
+
+# Column DDL that SQLite and PostgreSQL both accept (TIMESTAMP, not DATETIME; FALSE, not 0)
+_LEGACY_COLUMNS = [
+    ("users", "status", "VARCHAR(20) DEFAULT 'active'"),
+    ("messages", "request_id", "INTEGER"),
+    ("bookings", "decision_at", "TIMESTAMP"),
+    ("bookings", "booked_by_admin", "BOOLEAN DEFAULT FALSE"),
+    ("booking_requests", "kind", "VARCHAR(20) DEFAULT 'allocator'"),
+    ("waitlist", "start_time", "TIMESTAMP"),
+    ("waitlist", "end_time", "TIMESTAMP"),
+    ("waitlist", "purpose", "TEXT"),
+    ("waitlist", "status", "VARCHAR(20) DEFAULT 'waiting'"),
+]
+
+
+def upgrade():
+    # On the migration's own connection: it already holds the migration lock.
+    db.metadata.create_all(db.session.connection())
+
+    for table, column, ddl in _LEGACY_COLUMNS:
+        if column not in table_columns(table):
+            db.session.execute(text(f"ALTER TABLE {table} ADD COLUMN {column} {ddl}"))
+            print(f"✅ Added '{column}' column to {table} table.")
+
+    # Bound as a boolean so PostgreSQL does not reject comparing the column to an integer
+    db.session.execute(update(Booking).where(Booking.booked_by_admin.is_(None)).values(booked_by_admin=False))
+    db.session.execute(text("UPDATE booking_requests SET kind = 'allocator' WHERE kind IS NULL"))
+    db.session.execute(text("UPDATE waitlist SET status = 'waiting' WHERE status IS NULL"))
+
+    # Normalize resource lifecycle statuses
+    db.session.execute(text("UPDATE resources SET status = 'published' WHERE status IN ('available', 'available ') OR status IS NULL"))
+    db.session.execute(text("UPDATE resources SET status = 'draft' WHERE status = 'unavailable'"))
@@ -0,0 +1,17 @@
+"""Add the per-resource waitlist position counter."""
+
+from sqlalchemy import text
+
+from src.migrations import table_columns
+from src.models.models import db
+
+
+def upgrade():
+    if "waitlist_seq" in table_columns("resources"):
+        return
+    db.session.execute(text("ALTER TABLE resources ADD COLUMN waitlist_seq INTEGER NOT NULL DEFAULT 0"))
+    db.session.execute(text(
+        "UPDATE resources SET waitlist_seq = COALESCE("
+        "(SELECT MAX(position) FROM waitlist WHERE waitlist.resource_id = resources.id), 0)"
+    ))
+    print("✅ Added 'waitlist_seq' column to resources table.")
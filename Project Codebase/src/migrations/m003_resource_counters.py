@@ -0,0 +1,38 @@
+"""Add denormalized rating and booking counters to resources."""
+
+from sqlalchemy import text
+
+from src.migrations import table_columns
+from src.models.models import db
+
+
+_COUNTERS = ("rating_sum", "rating_count", "active_booking_count", "total_booking_count")
+
+_INDEXES = [
+    "CREATE INDEX IF NOT EXISTS ix_resources_active_booking_count ON resources (active_booking_count)",
+    # Same expression the rating sort orders by, so the index is usable.
+    "CREATE INDEX IF NOT EXISTS ix_resources_rating_average ON resources "
+    "((CASE WHEN rating_count > 0 THEN rating_sum * 1.0 / rating_count ELSE 0 END))",
+]
+
+# Counters as of this version: one per booking row; series are added by migration 9.
+_BACKFILL = """
+UPDATE resources SET
+    rating_sum = COALESCE((SELECT SUM(rating) FROM reviews WHERE reviews.resource_id = resources.id), 0),
+    rating_count = (SELECT COUNT(*) FROM reviews WHERE reviews.resource_id = resources.id),
+    active_booking_count = (
+        SELECT COUNT(*) FROM bookings
+        WHERE bookings.resource_id = resources.id AND bookings.status IN ('pending', 'approved')
+    ),
+    total_booking_count = (SELECT COUNT(*) FROM bookings WHERE bookings.resource_id = resources.id)
+"""
+
+
+def upgrade():
+    existing = table_columns("resources")
+    for name in _COUNTERS:
+        if name not in existing:
+            db.session.execute(text(f"ALTER TABLE resources ADD COLUMN {name} INTEGER NOT NULL DEFAULT 0"))
+    for ddl in _INDEXES:
+        db.session.execute(text(ddl))
+    db.session.execute(text(_BACKFILL))
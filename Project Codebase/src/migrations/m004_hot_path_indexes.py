@@ -0,0 +1,11 @@
+"""Index the booking, downtime, waitlist and notification hot paths."""
+
+from sqlalchemy.schema import CreateIndex
+
+from src.models.models import db, Booking, DowntimeBlock, Notification, Waitlist
+
+
+def upgrade():
+    for model in (Booking, DowntimeBlock, Waitlist, Notification):
+        for index in model.__table__.indexes:
+            db.session.execute(CreateIndex(index, if_not_exists=True))
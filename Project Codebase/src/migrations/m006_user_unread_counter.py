@@ -0,0 +1,19 @@
+"""Add the per-user unread notification counter."""
+
+from sqlalchemy import text
+
+from src.migrations import table_columns
+from src.models.models import db
+
+
+_BACKFILL = """
+UPDATE users SET unread_notification_count = (
+    SELECT COUNT(*) FROM notifications WHERE notifications.user_id = users.id AND notifications.is_read = FALSE
+)
+"""
+
+
+def upgrade():
+    if "unread_notification_count" not in table_columns("users"):
+        db.session.execute(text("ALTER TABLE users ADD COLUMN unread_notification_count INTEGER NOT NULL DEFAULT 0"))
+    db.session.execute(text(_BACKFILL))
@@ -0,0 +1,11 @@
+"""Add the per-owner version that invalidates cached pending-request counts."""
+
+from sqlalchemy import text
+
+from src.migrations import table_columns
+from src.models.models import db
+
+
+def upgrade():
+    if "owner_requests_version" not in table_columns("users"):
+        db.session.execute(text("ALTER TABLE users ADD COLUMN owner_requests_version INTEGER NOT NULL DEFAULT 0"))
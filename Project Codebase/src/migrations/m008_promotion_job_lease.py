@@ -0,0 +1,13 @@
+"""Add the claim lease and retry delay to waitlist promotion jobs."""
+
+from sqlalchemy import text
+
+from src.migrations import table_columns
+from src.models.models import db
+
+
+def upgrade():
+    columns = table_columns("waitlist_promotion_jobs")
+    for column in ("claimed_at", "not_before"):
+        if column not in columns:
+            db.session.execute(text(f"ALTER TABLE waitlist_promotion_jobs ADD COLUMN {column} TIMESTAMP"))
@@ -0,0 +1,56 @@
+"""Store each booking series' occurrence count and include series in the resource booking counters."""
+
+from datetime import datetime, timedelta
+
+from sqlalchemy import DateTime, text
+
+from src.migrations import table_columns
+from src.models.models import db
+
+
+# Recurrence rules as written at this version: FREQ, INTERVAL, COUNT and UNTIL,
+# expanded to at most 400 occurrences.
+_FREQUENCIES = {"DAILY": timedelta(days=1), "WEEKLY": timedelta(weeks=1)}
+_MAX_OCCURRENCES = 400
+
+_BACKFILL_COUNTERS = """
+UPDATE resources SET
+    active_booking_count = (
+        SELECT COUNT(*) FROM bookings
+        WHERE bookings.resource_id = resources.id AND bookings.status IN ('pending', 'approved')
+    ) + (
+        SELECT COALESCE(SUM(occurrence_count), 0) FROM booking_series
+        WHERE booking_series.resource_id = resources.id AND booking_series.status IN ('pending', 'approved')
+    ),
+    total_booking_count = (
+        SELECT COUNT(*) FROM bookings WHERE bookings.resource_id = resources.id
+    ) + (
+        SELECT COALESCE(SUM(occurrence_count), 0) FROM booking_series WHERE booking_series.resource_id = resources.id
+    )
+"""
+
+
+def _occurrence_count(start_time: datetime, rule: str) -> int:
+    fields = dict(part.split("=", 1) for part in rule.split(";") if "=" in part)
+    step = _FREQUENCIES[fields["FREQ"].upper()] * max(1, int(fields.get("INTERVAL", 1)))
+    limits = [_MAX_OCCURRENCES]
+    if int(fields.get("COUNT") or 0):
+        limits.append(int(fields["COUNT"]))
+    if fields.get("UNTIL"):
+        until = datetime.strptime(fields["UNTIL"].rstrip("Z"), "%Y%m%dT%H%M%S")
+        limits.append(max(0, (until - start_time) // step) + 1)
+    return min(limits)
+
+
+def upgrade():
+    if "occurrence_count" not in table_columns("booking_series"):
+        db.session.execute(text("ALTER TABLE booking_series ADD COLUMN occurrence_count INTEGER NOT NULL DEFAULT 0"))
+    series = db.session.execute(
+        text("SELECT id, start_time, rule FROM booking_series").columns(start_time=DateTime)
+    ).all()
+    if series:
+        db.session.execute(
+            text("UPDATE booking_series SET occurrence_count = :count WHERE id = :id"),
+            [{"id": series_id, "count": _occurrence_count(start_time, rule)} for series_id, start_time, rule in series],
+        )
+    db.session.execute(text(_BACKFILL_COUNTERS))
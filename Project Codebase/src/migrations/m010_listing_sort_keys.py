@@ -0,0 +1,47 @@
+"""Make the admin listing sort keys NOT NULL and store each booking request's listing rank."""
+
+from sqlalchemy import case, func, text, update
+from sqlalchemy.schema import CreateIndex
+
+from src.migrations import table_columns
+from src.models.models import db, BookingRequest, EmailLog, Resource, Review, User
+
+
+# (model, timestamp column keyset pagination sorts on)
+_SORT_KEYS = [
+    (User, User.created_at),
+    (Resource, Resource.created_at),
+    (Review, Review.created_at),
+    (EmailLog, EmailLog.sent_at),
+    (BookingRequest, BookingRequest.created_at),
+]
+
+
+def upgrade():
+    dialect = db.session.get_bind().dialect.name
+    for model, column in _SORT_KEYS:
+        # A NULL key would sort outside every cursor range and never be paged to.
+        values = {column: func.current_timestamp()}
+        updated_at = getattr(model, "updated_at", None)
+        if updated_at is not None:
+            values = {column: func.coalesce(updated_at, func.current_timestamp()), updated_at: updated_at}
+        db.session.execute(
+            update(model).where(column.is_(None)).values(values).execution_options(synchronize_session=False)
+        )
+        # SQLite cannot add a constraint to an existing column; create_all builds new databases with it.
+        if dialect == "postgresql":
+            db.session.execute(text(f"ALTER TABLE {model.__tablename__} ALTER COLUMN {column.key} SET NOT NULL"))
+
+    if "status_rank" not in table_columns("booking_requests"):
+        db.session.execute(text("ALTER TABLE booking_requests ADD COLUMN status_rank INTEGER NOT NULL DEFAULT 3"))
+    ranks = BookingRequest.STATUS_RANKS
+    db.session.execute(
+        update(BookingRequest)
+        .values(
+            status_rank=case(*((BookingRequest.status == status, rank) for status, rank in ranks.items()), else_=0),
+            updated_at=BookingRequest.updated_at,
+        )
+        .execution_options(synchronize_session=False)
+    )
+    for index in BookingRequest.__table__.indexes:
+        db.session.execute(CreateIndex(index, if_not_exists=True))
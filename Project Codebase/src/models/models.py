@@ -1,10 +1,13 @@
 from flask_sqlalchemy import SQLAlchemy
 from flask_login import UserMixin
+from sqlalchemy.orm import validates
 from datetime import datetime, timezone
 import bcrypt
 
-# Initialize SQLAlchemy
-db = SQLAlchemy()
+from src.data_access.routing import RoutingSession
+
+# Initialize SQLAlchemy; the session sends read-only requests to the read engine
+db = SQLAlchemy(session_options={"class_": RoutingSession})
 
 # Association table for favorite resources
 resource_favorites = db.Table(
@@ -28,7 +31,11 @@ class User(db.Model, UserMixin):
     status = db.Column(db.String(20), default="active", nullable=False)  # active, inactive
     department = db.Column(db.String(100))
     profile_image = db.Column(db.String(255), default="https://ui-avatars.com/api/?background=990000&color=fff&name=User")
-    created_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc))
+    created_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc), nullable=False)
+    # Kept in step with the notifications table by notification_service
+    unread_notification_count = db.Column(db.Integer, default=0, server_default="0", nullable=False)
+    # Bumped whenever owner requests on this user's resources change (see owner_pending)
+    owner_requests_version = db.Column(db.Integer, default=0, server_default="0", nullable=False)
 
     # Relationships - FIXED with foreign_keys
     resources = db.relationship("Resource", backref="owner", lazy=True, foreign_keys="Resource.owner_id")
@@ -53,6 +60,18 @@ class User(db.Model, UserMixin):
         """Verify user password."""
         return bcrypt.checkpw(password.encode("utf-8"), self.password_hash.encode("utf-8"))
 
+    def latest_unread_notifications(self, limit=6):
+        """Newest unread notifications for the navbar bell; no query when the counter is zero."""
+        if not self.unread_notification_count:
+            return []
+        return (
+            Notification.query
+            .filter_by(user_id=self.id, is_read=False)
+            .order_by(Notification.created_at.desc())
+            .limit(limit)
+            .all()
+        )
+
     # Role helpers
     def is_admin(self):
         return self.role == "admin"
@@ -78,6 +97,10 @@ class User(db.Model, UserMixin):
 class Resource(db.Model):
     __tablename__ = "resources"
 
+    # Mean rating as SQL. ORDER BY must repeat this exact text to use the index.
+    RATING_AVERAGE_SQL = "CASE WHEN rating_count > 0 THEN rating_sum * 1.0 / rating_count ELSE 0 END"
+    __table_args__ = (db.Index("ix_resources_rating_average", db.text(RATING_AVERAGE_SQL)),)
+
     STATUS_DRAFT = "draft"
     STATUS_PUBLISHED = "published"
     STATUS_ARCHIVED = "archived"
@@ -97,8 +120,15 @@ class Resource(db.Model):
     # Availability
     available_slots = db.Column(db.Integer, default=10)  # Total slots available
     status = db.Column(db.String(20), default=STATUS_DRAFT)  # draft, published, archived
+    waitlist_seq = db.Column(db.Integer, default=0, server_default="0", nullable=False)  # Last issued waitlist position
+
+    # Denormalized counters, kept in step by src.services.resource_stats
+    rating_sum = db.Column(db.Integer, default=0, server_default="0", nullable=False)
+    rating_count = db.Column(db.Integer, default=0, server_default="0", nullable=False)
+    active_booking_count = db.Column(db.Integer, default=0, server_default="0", nullable=False, index=True)
+    total_booking_count = db.Column(db.Integer, default=0, server_default="0", nullable=False)
     
-    created_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc))
+    created_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc), nullable=False)
     updated_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc))
 
     # Relationships
@@ -119,55 +149,15 @@ class Resource(db.Model):
 
     def get_available_slots(self, start_time=None, end_time=None, exclude_booking_id=None):
         """Calculate remaining slots, optionally for a specific time window."""
-        def normalize(dt):
-            if not dt:
-                return None
-            if dt.tzinfo:
-                return dt.astimezone(timezone.utc).replace(tzinfo=None)
-            return dt
-
-        statuses = ["pending", "approved"]
-        query = Booking.query.filter(
-            Booking.resource_id == self.id,
-            Booking.status.in_(statuses)
-        )
-        if exclude_booking_id is not None:
-            query = query.filter(Booking.id != exclude_booking_id)
-
-        if start_time and end_time:
-            start_norm = normalize(start_time)
-            end_norm = normalize(end_time)
-        else:
-            now = datetime.now(timezone.utc).replace(tzinfo=None)
-            start_norm = now
-            end_norm = now
-
-        # Check downtime blocks
-        downtime_query = DowntimeBlock.query.filter_by(resource_id=self.id)
-        if start_norm and end_norm:
-            downtime_query = downtime_query.filter(
-                DowntimeBlock.start_time < end_norm,
-                DowntimeBlock.end_time > start_norm
-            )
-
-        if downtime_query.first():
-            return 0
-
-        if start_norm and end_norm:
-            query = query.filter(
-                Booking.start_time < end_norm,
-                Booking.end_time > start_norm
-            )
+        from src.services.availability_service import remaining_capacity
 
-        overlap_count = query.count()
-        return max(0, self.capacity - overlap_count)
+        return remaining_capacity(self, start_time, end_time, exclude_booking_id=exclude_booking_id)
 
     def average_rating(self):
-        """Calculate average rating from reviews."""
-        reviews = Review.query.filter_by(resource_id=self.id).all()
-        if not reviews:
+        """Average review rating, from the denormalized counters."""
+        if not self.rating_count:
             return 0
-        return round(sum(r.rating for r in reviews) / len(reviews), 1)
+        return round(self.rating_sum / self.rating_count, 1)
 
     @property
     def is_published(self):
@@ -191,6 +181,20 @@ class Resource(db.Model):
 class Booking(db.Model):
     __tablename__ = "bookings"
 
+    ACTIVE_STATUSES = ("pending", "approved")
+    # Predicate of the partial index. SQLite only uses it for queries that spell
+    # the same test with literal values, which active_status_filter() renders.
+    ACTIVE_STATUS_SQL = "status IN ('pending', 'approved')"
+    __table_args__ = (
+        db.Index("ix_bookings_resource_status_window", "resource_id", "status", "start_time", "end_time"),
+        db.Index(
+            "ix_bookings_active_start",
+            "start_time",
+            sqlite_where=db.text(ACTIVE_STATUS_SQL),
+            postgresql_where=db.text(ACTIVE_STATUS_SQL),
+        ),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     resource_id = db.Column(db.Integer, db.ForeignKey("resources.id"), nullable=False)
     user_id = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=False)
@@ -211,15 +215,61 @@ class Booking(db.Model):
     # Relationships - FIXED with foreign_keys
     approver = db.relationship("User", foreign_keys=[approved_by], backref="approved_bookings")
 
+    @classmethod
+    def active_status_filter(cls):
+        """WHERE clause for pending/approved bookings, with the statuses inlined as literals."""
+        statuses = db.bindparam("active_statuses", cls.ACTIVE_STATUSES, expanding=True, literal_execute=True, unique=True)
+        return cls.status.in_(statuses)
+
     def __repr__(self):
         return f"<Booking Resource={self.resource_id} User={self.user_id} Status={self.status}>"
 
 
+# --------------------------------------------------
+# RECURRING BOOKING SERIES
+# --------------------------------------------------
+class BookingSeries(db.Model):
+    __tablename__ = "booking_series"
+
+    id = db.Column(db.Integer, primary_key=True)
+    resource_id = db.Column(db.Integer, db.ForeignKey("resources.id"), nullable=False)
+    user_id = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=False)
+
+    # First occurrence plus an RRULE-style rule, e.g. "FREQ=WEEKLY;INTERVAL=1;COUNT=15"
+    start_time = db.Column(db.DateTime, nullable=False)
+    end_time = db.Column(db.DateTime, nullable=False)
+    rule = db.Column(db.String(120), nullable=False)
+    last_end_time = db.Column(db.DateTime, nullable=False)  # End of the final occurrence
+    occurrence_count = db.Column(db.Integer, default=0, server_default="0", nullable=False)  # Derived from rule on flush
+    purpose = db.Column(db.Text)
+
+    booked_by_admin = db.Column(db.Boolean, default=False, nullable=False)
+    status = db.Column(db.String(20), default="approved")  # approved, cancelled
+    approved_by = db.Column(db.Integer, db.ForeignKey("users.id"))
+    decision_at = db.Column(db.DateTime)
+
+    created_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc))
+    updated_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc))
+
+    resource = db.relationship("Resource", backref=db.backref("booking_series", lazy=True, cascade="all, delete-orphan"))
+    user = db.relationship("User", foreign_keys=[user_id], backref="booking_series")
+
+    def occurrences_between(self, start_time, end_time):
+        """(start, end) pairs of the occurrences that overlap the window."""
+        from src.services.series_service import occurrences_between
+
+        return occurrences_between(self, start_time, end_time)
+
+    def __repr__(self):
+        return f"<BookingSeries Resource={self.resource_id} User={self.user_id} Rule={self.rule}>"
+
+
 # --------------------------------------------------
 # RESOURCE DOWNTIME BLOCKS
 # --------------------------------------------------
 class DowntimeBlock(db.Model):
     __tablename__ = "downtime_blocks"
+    __table_args__ = (db.Index("ix_downtime_blocks_resource_window", "resource_id", "start_time", "end_time"),)
 
     id = db.Column(db.Integer, primary_key=True)
     resource_id = db.Column(db.Integer, db.ForeignKey("resources.id"), nullable=False)
@@ -247,6 +297,10 @@ class DowntimeBlock(db.Model):
 class BookingRequest(db.Model):
     __tablename__ = "booking_requests"
 
+    # Listings sort by this rank, highest first; any other status ranks 0 and sorts last.
+    STATUS_RANKS = {"pending": 3, "approved": 2, "denied": 1}
+    __table_args__ = (db.Index("ix_booking_requests_listing", "kind", "status_rank", "created_at", "id"),)
+
     id = db.Column(db.Integer, primary_key=True)
     resource_id = db.Column(db.Integer, db.ForeignKey("resources.id"), nullable=False)
     requester_id = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=False)
@@ -258,17 +312,23 @@ class BookingRequest(db.Model):
     note = db.Column(db.Text)
 
     status = db.Column(db.String(20), default="pending", nullable=False)  # pending, approved, denied, closed
+    status_rank = db.Column(db.Integer, default=STATUS_RANKS["pending"], server_default="3", nullable=False)  # Follows status, see STATUS_RANKS
     decision_note = db.Column(db.Text)
     decided_at = db.Column(db.DateTime)
     kind = db.Column(db.String(20), default="allocator", nullable=False)  # allocator, owner
 
-    created_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc))
+    created_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc), nullable=False)
     updated_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc))
 
     requester = db.relationship("User", foreign_keys=[requester_id], backref="submitted_booking_requests")
     resource = db.relationship("Resource", back_populates="booking_requests", lazy=True)
     booking = db.relationship("Booking", foreign_keys=[booking_id], backref=db.backref("request", uselist=False))
 
+    @validates("status")
+    def _set_status_rank(self, key, status):
+        self.status_rank = self.STATUS_RANKS.get(status, 0)
+        return status
+
     def mark(self, status, note=None):
         self.status = status
         self.decision_note = note
@@ -292,7 +352,7 @@ class Review(db.Model):
     rating = db.Column(db.Integer, nullable=False)  # 1-5 stars
     comment = db.Column(db.Text)
     
-    created_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc))
+    created_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc), nullable=False)
 
     def __repr__(self):
         return f"<Review Resource={self.resource_id} Rating={self.rating}>"
@@ -303,6 +363,7 @@ class Review(db.Model):
 # --------------------------------------------------
 class Notification(db.Model):
     __tablename__ = "notifications"
+    __table_args__ = (db.Index("ix_notifications_user_unread", "user_id", "is_read", "created_at"),)
 
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=False)
@@ -330,7 +391,7 @@ class EmailLog(db.Model):
     recipient_email = db.Column(db.String(255), nullable=False)
     subject = db.Column(db.String(200), nullable=False)
     body = db.Column(db.Text, nullable=False)
-    sent_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc))
+    sent_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc), nullable=False)
 
     def __repr__(self):
         return f"<EmailLog to={self.recipient_email}>"
@@ -341,6 +402,7 @@ class EmailLog(db.Model):
 # --------------------------------------------------
 class Waitlist(db.Model):
     __tablename__ = "waitlist"
+    __table_args__ = (db.Index("ix_waitlist_resource_status_start", "resource_id", "status", "start_time"),)
 
     id = db.Column(db.Integer, primary_key=True)
     resource_id = db.Column(db.Integer, db.ForeignKey("resources.id"), nullable=False)
@@ -359,6 +421,30 @@ class Waitlist(db.Model):
         return f"<Waitlist Resource={self.resource_id} User={self.user_id} Position={self.position}>"
 
 
+# --------------------------------------------------
+# WAITLIST PROMOTION QUEUE
+# --------------------------------------------------
+class WaitlistPromotionJob(db.Model):
+    __tablename__ = "waitlist_promotion_jobs"
+
+    id = db.Column(db.Integer, primary_key=True)
+    resource_id = db.Column(db.Integer, db.ForeignKey("resources.id"), nullable=False)
+    start_time = db.Column(db.DateTime, nullable=False)
+    end_time = db.Column(db.DateTime, nullable=False)
+    reason = db.Column(db.String(40))  # cancelled, rejected, deleted, downtime_removed, capacity_increased, rescheduled
+    actor_id = db.Column(db.Integer, db.ForeignKey("users.id"))
+    status = db.Column(db.String(20), default="pending", nullable=False)  # pending, processing, done, failed
+    error = db.Column(db.Text)
+    claimed_at = db.Column(db.DateTime)  # lease start while processing; expired leases are reclaimed
+    not_before = db.Column(db.DateTime)  # retry delay after a lock conflict
+
+    created_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc))
+    processed_at = db.Column(db.DateTime)
+
+    def __repr__(self):
+        return f"<WaitlistPromotionJob Resource={self.resource_id} Status={self.status}>"
+
+
 # --------------------------------------------------
 # MESSAGE MODEL (for user-to-user communication)
 # --------------------------------------------------
@@ -439,4 +525,17 @@ class SitePage(db.Model):
     )
     updated_by = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=True)
 
-    editor = db.relationship("User", foreign_keys=[updated_by])
\ No newline at end of file
+    editor = db.relationship("User", foreign_keys=[updated_by])
+
+# --------------------------------------------------
+# SCHEMA VERSION (one row per applied migration)
+# --------------------------------------------------
+class SchemaVersion(db.Model):
+    __tablename__ = "schema_version"
+
+    version = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    name = db.Column(db.String(120), nullable=False)
+    applied_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc))
+
+    def __repr__(self):
+        return f"<SchemaVersion {self.version} {self.name}>"
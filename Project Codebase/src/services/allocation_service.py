@@ -0,0 +1,264 @@
+"""Batch allocation of pending admin ("book for me") requests."""
+
+from __future__ import annotations
+
+from collections import defaultdict, namedtuple
+from datetime import datetime
+from typing import Dict, List
+
+from flask import url_for
+
+from src.models.models import db, Booking, BookingRequest, Message, Resource
+from src.services.availability_service import load_intervals, load_resource_intervals
+from src.services.booking_engine import create_bookings
+from src.services.booking_locks import lock_resources
+from src.services.notification_service import send_notification
+
+
+# Longest chain of displaced requests tried before giving up on a request.
+MAX_DISPLACEMENT_DEPTH = 50
+
+Assignment = namedtuple("Assignment", "request resource")
+AllocationPlan = namedtuple("AllocationPlan", "assignments unassigned")
+
+
+class _Seat:
+    """One unit of a resource's capacity, holding non-overlapping intervals."""
+
+    def __init__(self, resource):
+        self.resource = resource
+        self.fixed = []  # (start, end) of bookings that already exist
+        self.requests: List[BookingRequest] = []
+
+    def is_blocked(self, start_time, end_time) -> bool:
+        return any(start < end_time and end > start_time for start, end in self.fixed)
+
+    def conflicts(self, booking_request) -> List[BookingRequest]:
+        return [
+            other for other in self.requests
+            if other.start_time < booking_request.end_time and other.end_time > booking_request.start_time
+        ]
+
+
+def _build_seats(resource, intervals) -> List[_Seat]:
+    """Spread existing bookings over capacity seats (greedy interval colouring)."""
+    seats = [_Seat(resource) for _ in range(intervals.capacity)]
+    if not seats:
+        return seats
+    for span in intervals.bookings:
+        free_seat = next(
+            (seat for seat in seats if all(end <= span.start_time for _, end in seat.fixed)),
+            None,
+        )
+        if free_seat is None:
+            # Already overbooked: block every seat for this span.
+            for seat in seats:
+                seat.fixed.append((span.start_time, span.end_time))
+        else:
+            free_seat.fixed.append((span.start_time, span.end_time))
+    return seats
+
+
+def pending_allocator_requests(period_start: datetime, period_end: datetime) -> List[BookingRequest]:
+    """Pending allocator requests that start inside the period and have no booking yet."""
+    return (
+        BookingRequest.query
+        .filter(
+            BookingRequest.kind == "allocator",
+            BookingRequest.status == "pending",
+            BookingRequest.booking_id.is_(None),
+            BookingRequest.start_time >= period_start,
+            BookingRequest.start_time < period_end,
+        )
+        .order_by(BookingRequest.end_time.asc(), BookingRequest.start_time.asc(), BookingRequest.created_at.asc())
+        .all()
+    )
+
+
+def plan_allocations(period_start: datetime, period_end: datetime, *, lock: bool = False) -> AllocationPlan:
+    """
+    Assign pending allocator requests to their requested resource or an
+    equivalent published one (same category and access type). Best effort,
+    not a guaranteed maximum: each resource is split into capacity seats,
+    requests are placed earliest-ending first, and a request that finds no
+    free seat may displace a single conflicting placement along a chain of
+    up to MAX_DISPLACEMENT_DEPTH moves. A request that would need two or
+    more placements moved off one seat stays unassigned even when a better
+    arrangement exists. Pass lock=True when the plan will be committed in
+    the same transaction.
+    """
+    requests = pending_allocator_requests(period_start, period_end)
+    if not requests:
+        return AllocationPlan([], [])
+
+    requested_ids = {req.resource_id for req in requests}
+    requested = Resource.query.filter(Resource.id.in_(requested_ids)).all()
+    categories = {resource.category for resource in requested if resource.category}
+    equivalents = (
+        Resource.query
+        .filter(Resource.status == Resource.STATUS_PUBLISHED, Resource.category.in_(categories))
+        .all()
+        if categories else []
+    )
+    resources = {resource.id: resource for resource in requested + equivalents}
+    if lock:
+        lock_resources(resources)
+
+    window_start = min(req.start_time for req in requests)
+    window_end = max(req.end_time for req in requests)
+    index = load_intervals(resources.values(), window_start, window_end)
+    seats: Dict[int, List[_Seat]] = {
+        resource_id: _build_seats(resource, index[resource_id])
+        for resource_id, resource in resources.items()
+    }
+
+    def candidates(booking_request):
+        wanted = resources[booking_request.resource_id]
+        if wanted.status == Resource.STATUS_PUBLISHED:
+            yield wanted
+        for resource in equivalents:
+            if (
+                resource.id != wanted.id
+                and resource.category == wanted.category
+                and resource.access_type == wanted.access_type
+            ):
+                yield resource
+
+    placement: Dict[int, _Seat] = {}
+
+    def place(booking_request, visited, depth) -> bool:
+        open_seats = []
+        for resource in candidates(booking_request):
+            if index[resource.id].downtime_overlapping(booking_request.start_time, booking_request.end_time):
+                continue
+            for seat in seats[resource.id]:
+                if id(seat) in visited or seat.is_blocked(booking_request.start_time, booking_request.end_time):
+                    continue
+                blockers = seat.conflicts(booking_request)
+                if not blockers:
+                    seat.requests.append(booking_request)
+                    placement[booking_request.id] = seat
+                    return True
+                if len(blockers) == 1:
+                    open_seats.append((seat, blockers[0]))
+
+        if depth >= MAX_DISPLACEMENT_DEPTH:
+            return False
+        for seat, blocker in open_seats:
+            if id(seat) in visited:
+                continue
+            visited.add(id(seat))
+            seat.requests.remove(blocker)
+            seat.requests.append(booking_request)
+            placement[booking_request.id] = seat
+            if place(blocker, visited, depth + 1):
+                return True
+            seat.requests.remove(booking_request)
+            seat.requests.append(blocker)
+            placement[blocker.id] = seat
+            placement.pop(booking_request.id, None)
+        return False
+
+    unassigned = []
+    for booking_request in requests:
+        if not place(booking_request, set(), 0):
+            unassigned.append(booking_request)
+
+    assignments = [
+        Assignment(booking_request, placement[booking_request.id].resource)
+        for booking_request in requests
+        if booking_request.id in placement
+    ]
+    return AllocationPlan(assignments, unassigned)
+
+
+def plan_signature(plan: AllocationPlan) -> str:
+    """Stable fingerprint of a plan's assignments, posted back when the reviewed plan is committed."""
+    return ",".join(sorted(f"{assignment.request.id}:{assignment.resource.id}" for assignment in plan.assignments))
+
+
+def commit_allocation_plan(plan: AllocationPlan, actor) -> List[Booking]:
+    """
+    Book every assignment in the plan through create_bookings and update the
+    linked requests. The plan may have been reviewed a while ago, so each
+    resource is locked and every assignment re-checked against its current
+    bookings and downtime; one that no longer fits moves to
+    `plan.unassigned`. The caller commits, so the whole plan lands in one
+    transaction.
+    """
+    by_resource: Dict[int, List[Assignment]] = defaultdict(list)
+    for assignment in plan.assignments:
+        by_resource[assignment.resource.id].append(assignment)
+
+    created = []
+    for assignments in by_resource.values():
+        resource = assignments[0].resource
+        lock_resources([resource.id])
+        intervals = load_resource_intervals(
+            resource,
+            min(assignment.request.start_time for assignment in assignments),
+            max(assignment.request.end_time for assignment in assignments),
+        )
+        for assignment in assignments:
+            booking_request = assignment.request
+            requester = booking_request.requester
+            result = create_bookings(
+                resource,
+                requester,
+                [(booking_request.start_time, booking_request.end_time)],
+                purpose=booking_request.purpose or f"Booked by admin for {requester.name}",
+                auto_approve=resource.access_type == "public",
+                approved_by=actor.id,
+                booked_by_admin=True,
+                intervals=intervals,
+                lock=False,
+            )
+            if not result.bookings:
+                plan.assignments.remove(assignment)
+                plan.unassigned.append(booking_request)
+                continue
+            booking = result.bookings[0]
+            booking_request.booking_id = booking.id
+            _notify_requester(booking_request, resource, actor, result.auto_approved)
+            created.append(booking)
+    return created
+
+
+def _notify_requester(booking_request, resource, actor, approved: bool) -> None:
+    requester = booking_request.requester
+    window = (
+        f"{booking_request.start_time.strftime('%b %d %I:%M %p')} to "
+        f"{booking_request.end_time.strftime('%b %d %I:%M %p')}"
+    )
+    if approved:
+        booking_request.mark("approved", "Approved by admin batch allocation.")
+        subject = "Booking request approved"
+        content = f"Your booking request was approved. {resource.title} is scheduled from {window}."
+        send_notification(
+            requester,
+            title="Booking Request Approved",
+            message=f"An admin booked {resource.title} on your behalf.",
+            notification_type="booking_request_approved",
+            related_url=url_for("resource_bp.resource_detail", resource_id=resource.id),
+        )
+    else:
+        subject = "Booking request in review"
+        content = (
+            f"We scheduled {resource.title} for you from {window}, but the resource owner must approve it. "
+            "We'll let you know once they decide."
+        )
+        send_notification(
+            requester,
+            title="Booking request pending owner approval",
+            message=f"{resource.title} is scheduled, but the owner still needs to approve it.",
+            notification_type="booking_pending",
+            related_url=url_for("booking.dashboard"),
+        )
+
+    db.session.add(Message(
+        sender_id=actor.id,
+        receiver_id=requester.id,
+        request_id=booking_request.id,
+        subject=subject,
+        content=content,
+    ))
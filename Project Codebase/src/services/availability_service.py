@@ -0,0 +1,347 @@
+"""Interval-indexed availability engine used for every capacity check."""
+
+from __future__ import annotations
+
+import bisect
+import heapq
+from collections import namedtuple
+from datetime import datetime, time, timedelta, timezone
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import literal, null, select, union_all
+
+from src.models.models import db, Booking, DowntimeBlock, Resource
+from src.services.series_service import active_series_overlapping
+
+
+ACTIVE_BOOKING_STATUSES = Booking.ACTIVE_STATUSES
+
+BookingSpan = namedtuple("BookingSpan", "start_time end_time booking_id series_id", defaults=(None,))
+DowntimeSpan = namedtuple("DowntimeSpan", "start_time end_time reason")
+
+
+def normalize(dt: Optional[datetime]) -> Optional[datetime]:
+    """Return a naive UTC datetime so it compares against stored columns."""
+    if not dt:
+        return None
+    if dt.tzinfo:
+        return dt.astimezone(timezone.utc).replace(tzinfo=None)
+    return dt
+
+
+class ResourceIntervals:
+    """Sorted booking and downtime intervals for one resource over a window."""
+
+    def __init__(self, resource_id: int, capacity: Optional[int]):
+        self.resource_id = resource_id
+        self.capacity = max(capacity or 0, 0)
+        self.bookings: List[BookingSpan] = []
+        self.downtimes: List[DowntimeSpan] = []
+
+    def add_booking(
+        self,
+        start_time: datetime,
+        end_time: datetime,
+        booking_id: Optional[int] = None,
+        series_id: Optional[int] = None,
+    ) -> None:
+        self.bookings.append(BookingSpan(start_time, end_time, booking_id, series_id))
+
+    def add_downtime(self, start_time: datetime, end_time: datetime, reason: Optional[str] = None) -> None:
+        self.downtimes.append(DowntimeSpan(start_time, end_time, reason))
+
+    def insert_booking(self, start_time: datetime, end_time: datetime, booking_id: Optional[int] = None) -> None:
+        """Add a booking while keeping the index sorted (for in-place updates)."""
+        bisect.insort(
+            self.bookings,
+            BookingSpan(start_time, end_time, booking_id),
+            key=lambda span: (span.start_time, span.end_time),
+        )
+
+    def sort(self) -> None:
+        self.bookings.sort(key=lambda span: (span.start_time, span.end_time))
+        self.downtimes.sort(key=lambda span: (span.start_time, span.end_time))
+
+    def downtime_overlapping(self, start_time: datetime, end_time: datetime) -> Optional[DowntimeSpan]:
+        """Return the earliest downtime block that touches the window, if any."""
+        for span in self.downtimes:
+            if span.start_time >= end_time:
+                break
+            if span.start_time < end_time and span.end_time > start_time:
+                return span
+        return None
+
+    def peak_concurrency(
+        self,
+        start_time: datetime,
+        end_time: datetime,
+        *,
+        exclude_booking_id=None,
+        exclude_series_id=None,
+    ) -> int:
+        """
+        Sweep the window and return the highest number of bookings that are
+        active at the same instant. Staggered bookings that never overlap each
+        other only count once.
+        """
+        events = []
+        for span in self.bookings:
+            if span.start_time >= end_time:
+                break
+            if span.end_time <= start_time:
+                continue
+            if exclude_booking_id is not None and span.booking_id == exclude_booking_id:
+                continue
+            if exclude_series_id is not None and span.series_id == exclude_series_id:
+                continue
+            if start_time >= end_time:
+                # Point-in-time lookup: the booking covers the instant.
+                events.append((start_time, 1))
+                continue
+            events.append((max(span.start_time, start_time), 1))
+            events.append((min(span.end_time, end_time), -1))
+
+        # Ends sort before starts at the same instant: back-to-back bookings
+        # share a boundary without overlapping.
+        events.sort()
+        active = peak = 0
+        for _, delta in events:
+            active += delta
+            peak = max(peak, active)
+        return peak
+
+    def free_intervals(self, start_time: datetime, end_time: datetime) -> List[Tuple[datetime, datetime]]:
+        """
+        Maximal sub-windows of [start_time, end_time) where at least one slot
+        is free and no downtime applies.
+        """
+        if start_time >= end_time or self.capacity <= 0:
+            return []
+
+        events = []
+        for span in self.bookings:
+            if span.start_time < end_time and span.end_time > start_time:
+                events.append((max(span.start_time, start_time), 0, 1))
+                events.append((min(span.end_time, end_time), 0, -1))
+        for span in self.downtimes:
+            if span.start_time < end_time and span.end_time > start_time:
+                events.append((max(span.start_time, start_time), 1, 1))
+                events.append((min(span.end_time, end_time), 1, -1))
+        events.sort(key=lambda event: event[0])
+
+        free: List[Tuple[datetime, datetime]] = []
+        booked = blocked = 0
+        cursor = start_time
+        position = 0
+        while cursor < end_time:
+            while position < len(events) and events[position][0] <= cursor:
+                _, is_downtime, delta = events[position]
+                if is_downtime:
+                    blocked += delta
+                else:
+                    booked += delta
+                position += 1
+            next_change = events[position][0] if position < len(events) else end_time
+            if not blocked and booked < self.capacity:
+                if free and free[-1][1] == cursor:
+                    free[-1] = (free[-1][0], next_change)
+                else:
+                    free.append((cursor, next_change))
+            cursor = next_change
+        return free
+
+    def remaining(self, start_time: datetime, end_time: datetime, *, exclude_booking_id=None, exclude_series_id=None) -> int:
+        if self.downtime_overlapping(start_time, end_time) is not None:
+            return 0
+        booked = self.peak_concurrency(
+            start_time,
+            end_time,
+            exclude_booking_id=exclude_booking_id,
+            exclude_series_id=exclude_series_id,
+        )
+        return max(0, self.capacity - booked)
+
+
+def _window(start_time: Optional[datetime], end_time: Optional[datetime]):
+    if start_time and end_time:
+        return normalize(start_time), normalize(end_time)
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    return now, now
+
+
+def load_intervals(resources: Iterable, start_time: datetime, end_time: datetime) -> Dict[int, ResourceIntervals]:
+    """
+    Build interval indexes for several resources over one window using a
+    single UNION query across bookings and downtime blocks, plus one query
+    for recurring series, whose occurrences are expanded inside the window.
+    """
+    start_norm, end_norm = _window(start_time, end_time)
+    index: Dict[int, ResourceIntervals] = {
+        resource.id: ResourceIntervals(resource.id, resource.capacity)
+        for resource in resources
+    }
+    if not index:
+        return index
+
+    resource_ids = list(index)
+    booking_rows = select(
+        Booking.resource_id,
+        Booking.start_time,
+        Booking.end_time,
+        Booking.id.label("ref_id"),
+        literal("booking").label("kind"),
+        null().label("reason"),
+    ).where(
+        Booking.resource_id.in_(resource_ids),
+        Booking.active_status_filter(),
+        Booking.start_time < end_norm,
+        Booking.end_time > start_norm,
+    )
+    downtime_rows = select(
+        DowntimeBlock.resource_id,
+        DowntimeBlock.start_time,
+        DowntimeBlock.end_time,
+        DowntimeBlock.id.label("ref_id"),
+        literal("downtime").label("kind"),
+        DowntimeBlock.reason,
+    ).where(
+        DowntimeBlock.resource_id.in_(resource_ids),
+        DowntimeBlock.start_time < end_norm,
+        DowntimeBlock.end_time > start_norm,
+    )
+
+    for row in db.session.execute(union_all(booking_rows, downtime_rows)):
+        intervals = index[row.resource_id]
+        if row.kind == "booking":
+            intervals.add_booking(row.start_time, row.end_time, row.ref_id)
+        else:
+            intervals.add_downtime(row.start_time, row.end_time, row.reason)
+
+    for series in active_series_overlapping(resource_ids, start_norm, end_norm):
+        intervals = index[series.resource_id]
+        for occ_start, occ_end in series.occurrences_between(start_norm, end_norm):
+            intervals.add_booking(occ_start, occ_end, series_id=series.id)
+
+    for intervals in index.values():
+        intervals.sort()
+    return index
+
+
+def load_resource_intervals(resource, start_time: datetime, end_time: datetime) -> ResourceIntervals:
+    """Interval index for a single resource."""
+    return load_intervals([resource], start_time, end_time)[resource.id]
+
+
+def remaining_capacity(
+    resource,
+    start_time: Optional[datetime] = None,
+    end_time: Optional[datetime] = None,
+    *,
+    exclude_booking_id=None,
+    intervals: Optional[ResourceIntervals] = None,
+) -> int:
+    """Remaining slots for the window (or right now when no window is given)."""
+    start_norm, end_norm = _window(start_time, end_time)
+    if intervals is None:
+        intervals = load_resource_intervals(resource, start_norm, end_norm)
+    return intervals.remaining(start_norm, end_norm, exclude_booking_id=exclude_booking_id)
+
+
+def batch_remaining_capacity(
+    resources: Iterable,
+    start_time: Optional[datetime] = None,
+    end_time: Optional[datetime] = None,
+) -> Dict[int, int]:
+    """
+    Remaining capacity for many resources over one window (or right now when
+    no window is given). Accepts Resource rows or bare ids; either way the
+    bookings and downtime are fetched once.
+    """
+    resources = list(resources)
+    if resources and all(isinstance(item, int) for item in resources):
+        resources = (
+            db.session.query(Resource.id, Resource.capacity)
+            .filter(Resource.id.in_(resources))
+            .all()
+        )
+
+    start_norm, end_norm = _window(start_time, end_time)
+    index = load_intervals(resources, start_norm, end_norm)
+    return {
+        resource_id: intervals.remaining(start_norm, end_norm)
+        for resource_id, intervals in index.items()
+    }
+
+
+OpenWindow = namedtuple("OpenWindow", "resource start_time end_time remaining")
+
+SEARCH_DAY_START_HOUR = 7
+SEARCH_DAY_END_HOUR = 22
+
+
+def _ceil_to_hour(moment: datetime) -> datetime:
+    floored = moment.replace(minute=0, second=0, microsecond=0)
+    return floored if floored == moment else floored + timedelta(hours=1)
+
+
+def _opening_hours(start_time: datetime, end_time: datetime, day_start_hour: int, day_end_hour: int):
+    day = start_time.date()
+    while datetime.combine(day, time(0, 0)) < end_time:
+        opens = max(datetime.combine(day, time(day_start_hour, 0)), start_time)
+        closes = min(datetime.combine(day, time(0, 0)) + timedelta(hours=day_end_hour), end_time)
+        if opens < closes:
+            yield opens, closes
+        day += timedelta(days=1)
+
+
+def find_available_windows(
+    duration_hours: int,
+    earliest_start: datetime,
+    *,
+    category: Optional[str] = None,
+    min_capacity: Optional[int] = None,
+    access_type: Optional[str] = None,
+    resource_ids: Optional[Iterable[int]] = None,
+    limit: int = 5,
+    horizon_days: int = 7,
+    day_start_hour: int = SEARCH_DAY_START_HOUR,
+    day_end_hour: int = SEARCH_DAY_END_HOUR,
+) -> List[OpenWindow]:
+    """
+    Return the `limit` earliest whole-hour windows of `duration_hours` across
+    every published resource that matches the filters. Each resource
+    contributes at most one window per free stretch of its schedule.
+    """
+    query = Resource.query.filter(Resource.status == Resource.STATUS_PUBLISHED)
+    if category:
+        query = query.filter(Resource.category == category)
+    if min_capacity:
+        query = query.filter(Resource.capacity >= min_capacity)
+    if access_type:
+        query = query.filter(Resource.access_type == access_type)
+    if resource_ids is not None:
+        query = query.filter(Resource.id.in_(list(resource_ids)))
+    resources = query.all()
+
+    search_start = _ceil_to_hour(normalize(earliest_start))
+    search_end = search_start + timedelta(days=horizon_days)
+    duration = timedelta(hours=duration_hours)
+    index = load_intervals(resources, search_start, search_end)
+    opening_hours = list(_opening_hours(search_start, search_end, day_start_hour, day_end_hour))
+
+    candidates = []
+    for resource in resources:
+        intervals = index[resource.id]
+        for opens, closes in opening_hours:
+            for free_start, free_end in intervals.free_intervals(opens, closes):
+                window_start = _ceil_to_hour(free_start)
+                window_end = window_start + duration
+                if window_end <= free_end:
+                    candidates.append(OpenWindow(
+                        resource,
+                        window_start,
+                        window_end,
+                        intervals.remaining(window_start, window_end),
+                    ))
+
+    return heapq.nsmallest(limit, candidates, key=lambda window: (window.start_time, window.resource.id))
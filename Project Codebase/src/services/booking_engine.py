@@ -0,0 +1,436 @@
+"""Single entry point for validating and inserting bookings."""
+
+from __future__ import annotations
+
+from collections import namedtuple
+from datetime import datetime, time, timedelta, timezone
+from typing import List, Optional, Sequence, Tuple
+
+from sqlalchemy import func, insert, update
+
+from src.models.models import db, Booking, BookingSeries, Resource
+from src.services.availability_service import (
+    SEARCH_DAY_END_HOUR,
+    SEARCH_DAY_START_HOUR,
+    BookingSpan,
+    ResourceIntervals,
+    load_resource_intervals,
+)
+from src.services.booking_locks import lock_resources
+from src.services.booking_rules import BOOKING_CONFLICT_MESSAGE
+from src.services.booking_service import create_owner_booking_requests
+from src.services.resource_stats import record_new_bookings
+from src.services.series_service import (
+    MAX_SERIES_OCCURRENCES,
+    SERIES_LIMIT_MESSAGE,
+    build_rule,
+    exceeds_series_limit,
+    expand,
+    last_occurrence_end,
+    occurrence_count,
+    occurrences_between,
+    parse_rule,
+)
+
+
+RECURRENCE_DELTAS = {
+    "daily": timedelta(days=1),
+    "weekly": timedelta(weeks=1),
+}
+# Cap for repeats stored one row per occurrence: bookings awaiting owner
+# review and "book what fits", whose skipped dates a series cannot represent.
+MAX_RECURRENCE_OCCURRENCES = 52
+# Bookable hours of the day, matching the slot grid on the resource page.
+# Self-service booking forms pass them to preflight and the engine; admin
+# bookings and waitlist promotions are not limited to them.
+OPENING_HOURS = (SEARCH_DAY_START_HOUR, SEARCH_DAY_END_HOUR)
+AVAILABLE_MESSAGE = "Available"
+
+OccurrenceIssue = namedtuple("OccurrenceIssue", "start_time end_time status message")
+# Preflight result for one occurrence; status is "ok" or an OccurrenceIssue status.
+OccurrenceStatus = namedtuple("OccurrenceStatus", "start_time end_time status message")
+StatusSync = namedtuple("StatusSync", "approved reverted")
+
+
+class BookingResult:
+    """Outcome of a create_bookings call."""
+
+    def __init__(self, auto_approved: bool):
+        self.auto_approved = auto_approved
+        self.bookings: List[Booking] = []
+        self.series: Optional[BookingSeries] = None
+        self.owner_requests = []
+        self.issues: List[OccurrenceIssue] = []
+
+    @property
+    def ok(self) -> bool:
+        return bool(self.bookings or self.series) and not self.issues
+
+    @property
+    def occurrence_total(self) -> int:
+        """Occurrences booked, whether stored as rows or as a series."""
+        if self.series is not None:
+            return occurrence_count(self.series.start_time, self.series.rule)
+        return len(self.bookings)
+
+    @property
+    def first_issue(self) -> Optional[OccurrenceIssue]:
+        return self.issues[0] if self.issues else None
+
+    def __repr__(self):
+        return f"<BookingResult created={len(self.bookings)} series={self.series} issues={len(self.issues)}>"
+
+
+def expand_recurrence(
+    start_time: datetime,
+    end_time: datetime,
+    recurrence: str = "none",
+    count: Optional[int] = 1,
+    *,
+    limit: int = MAX_RECURRENCE_OCCURRENCES,
+) -> List[Tuple[datetime, datetime]]:
+    """Occurrence windows for a daily/weekly repeat, capped at `limit` occurrences."""
+    delta = RECURRENCE_DELTAS.get(recurrence)
+    count = max(1, min(count or 1, limit))
+    if delta is None:
+        return [(start_time, end_time)]
+    return [(start_time + i * delta, end_time + i * delta) for i in range(count)]
+
+
+def partial_occurrences(
+    start_time: datetime,
+    end_time: datetime,
+    recurrence: str = "none",
+    count: Optional[int] = 1,
+) -> List[Tuple[datetime, datetime]]:
+    """
+    Occurrences for a "book what fits" request. Those are stored one row per
+    occurrence, so they stay within MAX_RECURRENCE_OCCURRENCES whoever books.
+    """
+    if recurrence in RECURRENCE_DELTAS and (count or 1) > MAX_RECURRENCE_OCCURRENCES:
+        raise ValueError(
+            f"Booking only the dates that fit works for up to {MAX_RECURRENCE_OCCURRENCES} occurrences. "
+            "Shorten the repeat or book the whole series."
+        )
+    return expand_recurrence(start_time, end_time, recurrence, count)
+
+
+def recurrence_limit(resource, user) -> int:
+    """
+    Most occurrences one request may repeat to. Auto-approved bookings are
+    stored as a series and may run longer than ones that need owner review.
+    Partial ("book what fits") requests stay at MAX_RECURRENCE_OCCURRENCES.
+    """
+    if resource.access_type == "public" or resource.owner_id == getattr(user, "id", None):
+        return MAX_SERIES_OCCURRENCES
+    return MAX_RECURRENCE_OCCURRENCES
+
+
+def outside_opening_hours(start_time: datetime, end_time: datetime, opening_hours=OPENING_HOURS) -> bool:
+    """True when the window does not sit inside one day's bookable hours."""
+    day_start_hour, day_end_hour = opening_hours
+    midnight = datetime.combine(start_time.date(), time(0, 0))
+    return (
+        start_time < midnight + timedelta(hours=day_start_hour)
+        or end_time > midnight + timedelta(hours=day_end_hour)
+    )
+
+
+def opening_hours_message(opening_hours=OPENING_HOURS) -> str:
+    day_start_hour, day_end_hour = opening_hours
+    opens = time(day_start_hour, 0).strftime("%I:%M %p")
+    closes = time(day_end_hour % 24, 0).strftime("%I:%M %p")
+    return f"Outside bookable hours ({opens} to {closes})."
+
+
+def downtime_message(downtime) -> str:
+    return (
+        f"This resource is unavailable between "
+        f"{downtime.start_time.strftime('%b %d, %Y %I:%M %p')} and "
+        f"{downtime.end_time.strftime('%b %d, %Y %I:%M %p')} (reason: {downtime.reason or 'maintenance'})."
+    )
+
+
+def check_occurrences(
+    intervals: ResourceIntervals,
+    occurrences: Sequence[Tuple[datetime, datetime]],
+    *,
+    exclude_series_id: Optional[int] = None,
+    opening_hours: Optional[Tuple[int, int]] = None,
+) -> List[Optional[OccurrenceIssue]]:
+    """
+    Validate every occurrence against the interval index without writing.
+    Returns one entry per occurrence: None when it fits, otherwise the issue.
+    Occurrences that fit are counted against the ones after them. Pass
+    `opening_hours` as (start hour, end hour) to reject windows outside them.
+    """
+    results: List[Optional[OccurrenceIssue]] = []
+    accepted = []
+    for start_time, end_time in occurrences:
+        downtime = intervals.downtime_overlapping(start_time, end_time)
+        if opening_hours and outside_opening_hours(start_time, end_time, opening_hours):
+            results.append(OccurrenceIssue(
+                start_time, end_time, "out_of_hours", opening_hours_message(opening_hours)
+            ))
+        elif downtime:
+            results.append(OccurrenceIssue(start_time, end_time, "downtime", downtime_message(downtime)))
+        elif intervals.remaining(start_time, end_time, exclude_series_id=exclude_series_id) <= 0:
+            results.append(OccurrenceIssue(start_time, end_time, "full", BOOKING_CONFLICT_MESSAGE))
+        else:
+            results.append(None)
+            intervals.insert_booking(start_time, end_time)
+            accepted.append((start_time, end_time))
+    for start_time, end_time in accepted:
+        intervals.bookings.remove(BookingSpan(start_time, end_time, None))
+    return results
+
+
+def preflight_occurrences(
+    resource,
+    occurrences: Sequence[Tuple[datetime, datetime]],
+    *,
+    opening_hours: Optional[Tuple[int, int]] = OPENING_HOURS,
+) -> List[OccurrenceStatus]:
+    """
+    Status of every occurrence of a proposed booking, in start order, from
+    one interval load and one in-memory pass. Read-only and unlocked, so the
+    answer is advisory: create_bookings re-checks under the resource lock.
+    """
+    occurrences = sorted(occurrences)
+    if not occurrences:
+        return []
+    intervals = load_resource_intervals(resource, occurrences[0][0], max(end for _, end in occurrences))
+    checks = check_occurrences(intervals, occurrences, opening_hours=opening_hours)
+    return [
+        OccurrenceStatus(*issue) if issue else OccurrenceStatus(start_time, end_time, "ok", AVAILABLE_MESSAGE)
+        for (start_time, end_time), issue in zip(occurrences, checks)
+    ]
+
+
+def create_bookings(
+    resource,
+    user,
+    occurrences: Sequence[Tuple[datetime, datetime]],
+    *,
+    purpose: Optional[str] = None,
+    auto_approve: Optional[bool] = None,
+    approved_by: Optional[int] = None,
+    booked_by_admin: bool = False,
+    requester=None,
+    allow_partial: bool = False,
+    opening_hours: Optional[Tuple[int, int]] = None,
+    intervals: Optional[ResourceIntervals] = None,
+    lock: bool = True,
+) -> BookingResult:
+    """
+    Validate and insert a batch of occurrences for one user on one resource.
+
+    Takes the per-resource booking lock, loads one interval index for the
+    whole span, checks every occurrence in memory and inserts the bookings
+    with a single multi-row INSERT. Restricted bookings get their owner requests in
+    bulk. Unless `allow_partial` is set, nothing is written when any
+    occurrence is blocked; with it, the occurrences that fit are booked and
+    the rest are reported in `issues`. Pass `opening_hours` (e.g.
+    OPENING_HOURS) to also block occurrences outside them. The caller
+    commits.
+    """
+    if auto_approve is None:
+        auto_approve = resource.access_type == "public" or resource.owner_id == user.id
+    result = BookingResult(auto_approved=auto_approve)
+    occurrences = sorted(occurrences)
+    if not occurrences:
+        return result
+
+    if lock:
+        lock_resources([resource.id])
+    if intervals is None:
+        intervals = load_resource_intervals(resource, occurrences[0][0], max(end for _, end in occurrences))
+
+    checks = check_occurrences(intervals, occurrences, opening_hours=opening_hours)
+    result.issues = [issue for issue in checks if issue is not None]
+    if result.issues and not allow_partial:
+        return result
+
+    decided_at = datetime.now(timezone.utc) if auto_approve else None
+    rows = [
+        {
+            "resource_id": resource.id,
+            "user_id": user.id,
+            "start_time": start_time,
+            "end_time": end_time,
+            "purpose": purpose,
+            "status": "approved" if auto_approve else "pending",
+            "approved_by": (approved_by if approved_by is not None else user.id) if auto_approve else None,
+            "decision_at": decided_at,
+            "booked_by_admin": booked_by_admin,
+        }
+        for (start_time, end_time), issue in zip(occurrences, checks)
+        if issue is None
+    ]
+    if not rows:
+        return result
+
+    # One multi-row INSERT ... RETURNING. Rows that share a window are
+    # interchangeable, so the order RETURNING hands them back in is irrelevant.
+    result.bookings = sorted(
+        db.session.scalars(insert(Booking).returning(Booking), rows).all(),
+        key=lambda booking: (booking.start_time, booking.end_time),
+    )
+    for booking in result.bookings:
+        intervals.insert_booking(booking.start_time, booking.end_time, booking.id)
+    record_new_bookings(resource.id, [row["status"] for row in rows])
+
+    if not auto_approve:
+        result.owner_requests = create_owner_booking_requests(
+            resource, result.bookings, requester or user, purpose
+        )
+    return result
+
+
+def create_series(
+    resource,
+    user,
+    start_time: datetime,
+    end_time: datetime,
+    rule: str,
+    *,
+    purpose: Optional[str] = None,
+    approved_by: Optional[int] = None,
+    booked_by_admin: bool = False,
+    opening_hours: Optional[Tuple[int, int]] = None,
+) -> BookingResult:
+    """
+    Validate every occurrence of a recurring rule in one pass over the
+    resource's bookings, downtime and, when given, `opening_hours`, then
+    store it as a single BookingSeries row. Series are always approved, so callers use
+    them only when the booking would be auto-approved. The caller commits.
+    """
+    result = BookingResult(auto_approved=True)
+    if exceeds_series_limit(start_time, rule):
+        result.issues = [OccurrenceIssue(start_time, end_time, "limit", SERIES_LIMIT_MESSAGE)]
+        return result
+    last_end = last_occurrence_end(start_time, end_time, rule)
+
+    lock_resources([resource.id])
+    intervals = load_resource_intervals(resource, start_time, last_end)
+    result.issues = [
+        issue
+        for issue in check_occurrences(
+            intervals, expand(start_time, end_time, rule, start_time, last_end), opening_hours=opening_hours
+        )
+        if issue is not None
+    ]
+    if result.issues:
+        return result
+
+    result.series = BookingSeries(
+        resource_id=resource.id,
+        user_id=user.id,
+        start_time=start_time,
+        end_time=end_time,
+        rule=rule,
+        last_end_time=last_end,
+        purpose=purpose,
+        booked_by_admin=booked_by_admin,
+        status="approved",
+        approved_by=approved_by if approved_by is not None else user.id,
+        decision_at=datetime.now(timezone.utc),
+    )
+    db.session.add(result.series)
+    db.session.flush()
+    return result
+
+
+def reschedule_series_end(series: BookingSeries, until: datetime) -> BookingResult:
+    """
+    Shorten or extend a series so its last occurrence starts on or before
+    `until`. Extensions are capacity-checked against everything except the
+    series itself; one past MAX_SERIES_OCCURRENCES is rejected like a new
+    series that long, and the stored rule is left as it was. The caller
+    commits.
+    """
+    parsed = parse_rule(series.rule)
+    rule = build_rule(parsed.freq, interval=parsed.interval, until=until)
+    result = BookingResult(auto_approved=True)
+    if exceeds_series_limit(series.start_time, rule):
+        result.issues = [OccurrenceIssue(series.start_time, series.end_time, "limit", SERIES_LIMIT_MESSAGE)]
+        return result
+    last_end = last_occurrence_end(series.start_time, series.end_time, rule)
+
+    if last_end > series.last_end_time:
+        lock_resources([series.resource_id])
+        intervals = load_resource_intervals(series.resource, series.last_end_time, last_end)
+        added = expand(series.start_time, series.end_time, rule, series.last_end_time, last_end)
+        result.issues = [
+            issue
+            for issue in check_occurrences(intervals, added, exclude_series_id=series.id)
+            if issue is not None
+        ]
+        if result.issues:
+            return result
+
+    series.rule = rule
+    series.last_end_time = last_end
+    result.series = series
+    return result
+
+
+def cancel_series_from(series: BookingSeries, moment: datetime) -> Optional[Tuple[datetime, datetime]]:
+    """
+    Cancel the occurrences of a series that start at or after `moment` and
+    keep the earlier ones, which stay in history, calendar feeds and review
+    eligibility. A series with nothing before `moment` is cancelled outright;
+    otherwise its rule now ends at the last kept occurrence. Returns the
+    window whose capacity was freed, or None when nothing was left to
+    cancel. The caller commits.
+    """
+    kept = occurrences_between(series, series.start_time, moment)
+    if len(kept) >= occurrence_count(series.start_time, series.rule):
+        return None
+    freed = (max(moment, series.start_time), series.last_end_time)
+    if not kept:
+        series.status = "cancelled"
+        series.decision_at = datetime.now(timezone.utc)
+        return freed
+
+    parsed = parse_rule(series.rule)
+    series.rule = build_rule(parsed.freq, interval=parsed.interval, until=kept[-1][0])
+    series.last_end_time = kept[-1][1]
+    return freed
+
+
+def sync_booking_statuses() -> StatusSync:
+    """
+    Reconcile booking statuses with their resource's access type, for
+    resources whose access type changed after they were booked: pending
+    bookings on public resources are approved (on the owner's behalf when
+    nobody approved them), and approved bookings on restricted resources
+    that nobody approved go back to pending. Two set-based UPDATEs; the
+    caller commits.
+    """
+    approved = db.session.execute(
+        update(Booking)
+        .where(
+            Booking.resource_id == Resource.id,
+            Resource.access_type == "public",
+            Booking.status == "pending",
+        )
+        .values(
+            status="approved",
+            approved_by=func.coalesce(Booking.approved_by, Resource.owner_id),
+            decision_at=datetime.now(timezone.utc),
+        )
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    reverted = db.session.execute(
+        update(Booking)
+        .where(
+            Booking.resource_id == Resource.id,
+            Resource.access_type != "public",
+            Booking.status == "approved",
+            Booking.approved_by.is_(None),
+        )
+        .values(status="pending")
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    return StatusSync(approved, reverted)
@@ -0,0 +1,88 @@
+"""Per-resource serialization of booking capacity checks and inserts."""
+
+from __future__ import annotations
+
+import functools
+import logging
+import random
+import time
+from typing import Iterable
+
+from sqlalchemy import select, update
+from sqlalchemy.exc import OperationalError
+
+from src.models.models import db, Resource
+
+
+logger = logging.getLogger(__name__)
+
+LOCK_RETRY_ATTEMPTS = 6
+LOCK_RETRY_BASE_DELAY = 0.05  # seconds, doubled on every retry
+
+_CONFLICT_MARKERS = ("database is locked", "database table is locked", "busy", "deadlock", "could not serialize")
+
+
+def lock_resources(resource_ids: Iterable[int]) -> None:
+    """
+    Take the booking lock for every resource before checking capacity, so the
+    check and the insert that follows are atomic against other workers.
+
+    SQLite allows one writer at a time: a no-op UPDATE opens the write
+    transaction immediately (the same effect as BEGIN IMMEDIATE), and later
+    reads in the transaction see every committed booking. Other backends lock
+    the resource rows with SELECT ... FOR UPDATE, in id order to avoid
+    deadlocks, so bookings on different resources never wait on each other.
+    """
+    ids = sorted({resource_id for resource_id in resource_ids if resource_id is not None})
+    if not ids:
+        return
+
+    if db.session.get_bind().dialect.name == "sqlite":
+        db.session.execute(
+            update(Resource)
+            .where(Resource.id == ids[0])
+            # Setting updated_at to itself keeps the onupdate default from firing.
+            .values(waitlist_seq=Resource.waitlist_seq, updated_at=Resource.updated_at)
+            .execution_options(synchronize_session=False)
+        )
+    else:
+        db.session.execute(
+            select(Resource.id)
+            .where(Resource.id.in_(ids))
+            .order_by(Resource.id)
+            .with_for_update()
+        ).all()
+
+
+def is_lock_conflict(exc: BaseException) -> bool:
+    """True when the database refused a lock and the transaction can be retried."""
+    if not isinstance(exc, OperationalError):
+        return False
+    message = str(exc.orig or exc).lower()
+    return any(marker in message for marker in _CONFLICT_MARKERS)
+
+
+def retry_on_lock_conflict(func=None, *, attempts: int = LOCK_RETRY_ATTEMPTS, base_delay: float = LOCK_RETRY_BASE_DELAY):
+    """
+    Re-run a unit of work when it loses a lock race. The session is rolled
+    back before each retry and the wait grows exponentially with jitter.
+    Only wrap code that has not committed anything before the conflict.
+    """
+    def decorator(inner):
+        @functools.wraps(inner)
+        def wrapper(*args, **kwargs):
+            for attempt in range(attempts):
+                try:
+                    return inner(*args, **kwargs)
+                except OperationalError as exc:
+                    if not is_lock_conflict(exc) or attempt == attempts - 1:
+                        raise
+                    db.session.rollback()
+                    delay = base_delay * (2 ** attempt)
+                    logger.info("Booking lock busy, retrying %s in %.2fs", inner.__name__, delay)
+                    time.sleep(delay + random.uniform(0, delay))
+        return wrapper
+
+    if func is not None:
+        return decorator(func)
+    return decorator
@@ -1,5 +1,7 @@
 from datetime import datetime
 
+from src.services.availability_service import remaining_capacity
+
 
 MIN_HOURS = 1
 MAX_HOURS = 10
@@ -29,9 +31,19 @@ def validate_time_block(start_time: datetime, end_time: datetime) -> None:
         raise ValueError("Bookings must be between 1 and 10 hours long.")
 
 
-def ensure_capacity(resource, start_time: datetime, end_time: datetime, *, exclude_booking_id=None) -> None:
-    """Raise ValueError when no slots remain for the requested window."""
-    remaining = resource.get_available_slots(start_time, end_time, exclude_booking_id=exclude_booking_id)
+def ensure_capacity(resource, start_time: datetime, end_time: datetime, *, exclude_booking_id=None, intervals=None) -> None:
+    """
+    Raise ValueError when no slots remain for the requested window.
+    Pass a preloaded `intervals` index to check several windows without
+    going back to the database.
+    """
+    remaining = remaining_capacity(
+        resource,
+        start_time,
+        end_time,
+        exclude_booking_id=exclude_booking_id,
+        intervals=intervals,
+    )
     if remaining <= 0:
         raise ValueError(BOOKING_CONFLICT_MESSAGE)
 
@@ -1,57 +1,88 @@
+
 from flask import url_for
+from sqlalchemy import insert
 
 from src.models.models import db, BookingRequest, Message
 from src.services.notification_service import send_notification
+from src.services.owner_pending import bump_owner_versions
 
 
-def create_owner_booking_request(resource, booking, requester, purpose):
+def create_owner_booking_requests(resource, bookings, requester, purpose):
     """
-    Ensure resource owners receive an actionable booking request entry
-    whenever a restricted resource booking is pending their approval.
+    Bulk version of create_owner_booking_request: one lookup for existing
+    requests, one INSERT each for the new requests and their messages, and a
+    single owner notification for the whole batch. Returns the requests in booking order.
     """
-    if resource.access_type == "public" or not resource.owner or resource.owner_id == requester.id:
-        return None
-
-    existing = BookingRequest.query.filter_by(booking_id=booking.id).first()
-    if existing:
-        return existing
-
-    booking_request = BookingRequest(
-        resource_id=resource.id,
-        requester_id=requester.id,
-        booking_id=booking.id,
-        start_time=booking.start_time,
-        end_time=booking.end_time,
-        purpose=purpose,
-        status="pending",
-        kind="owner"
-    )
-    db.session.add(booking_request)
-    db.session.flush()
-
-    message = Message(
-        sender_id=requester.id,
-        receiver_id=resource.owner.id,
-        request_id=booking_request.id,
-        subject=f"Booking request for {resource.title}",
-        content=(
-            f"{requester.name} requested to use {resource.title} "
-            f"from {booking.start_time.strftime('%b %d, %Y %I:%M %p')} "
-            f"to {booking.end_time.strftime('%b %d, %Y %I:%M %p')}."
+    if not bookings or resource.access_type == "public" or not resource.owner or resource.owner_id == requester.id:
+        return []
+
+    existing = {
+        booking_request.booking_id: booking_request
+        for booking_request in BookingRequest.query.filter(
+            BookingRequest.booking_id.in_([booking.id for booking in bookings])
         )
+    }
+    missing = [booking for booking in bookings if booking.id not in existing]
+    if not missing:
+        return [existing[booking.id] for booking in bookings]
+
+    created = db.session.scalars(
+        insert(BookingRequest).returning(BookingRequest),
+        [
+            {
+                "resource_id": resource.id,
+                "requester_id": requester.id,
+                "booking_id": booking.id,
+                "start_time": booking.start_time,
+                "end_time": booking.end_time,
+                "purpose": purpose,
+                "status": "pending",
+                "status_rank": BookingRequest.STATUS_RANKS["pending"],  # a bulk INSERT skips the validator
+                "kind": "owner",
+            }
+            for booking in missing
+        ],
+    ).all()
+    existing.update({booking_request.booking_id: booking_request for booking_request in created})
+    bump_owner_versions(db.session, owner_ids=[resource.owner_id])  # the bulk INSERT skips the flush hooks
+
+    db.session.execute(
+        insert(Message),
+        [
+            {
+                "sender_id": requester.id,
+                "receiver_id": resource.owner.id,
+                "request_id": booking_request.id,
+                "subject": f"Booking request for {resource.title}",
+                "content": (
+                    f"{requester.name} requested to use {resource.title} "
+                    f"from {booking_request.start_time.strftime('%b %d, %Y %I:%M %p')} "
+                    f"to {booking_request.end_time.strftime('%b %d, %Y %I:%M %p')}."
+                ),
+            }
+            for booking_request in created
+        ],
     )
-    db.session.add(message)
 
+    if len(created) == 1:
+        summary = f"{requester.name} requested a booking for {resource.title}. "
+    else:
+        summary = f"{requester.name} requested {len(created)} bookings for {resource.title}. "
     send_notification(
         resource.owner,
         title=f"Action needed: {resource.title}",
-        message=(
-            f"{requester.name} requested a booking for {resource.title}. "
-            "Please review and approve or reject the request."
-        ),
+        message=summary + "Please review and approve or reject the request.",
         notification_type="owner_action_required",
         related_url=url_for("resource_bp.owner_requests")
     )
 
-    return booking_request
+    return [existing[booking.id] for booking in bookings]
+
 
+def create_owner_booking_request(resource, booking, requester, purpose):
+    """
+    Ensure resource owners receive an actionable booking request entry
+    whenever a restricted resource booking is pending their approval.
+    """
+    requests = create_owner_booking_requests(resource, [booking], requester, purpose)
+    return requests[0] if requests else None
@@ -0,0 +1,309 @@
+"""Admin dashboard figures, aggregated in SQL and cached with stale-while-revalidate."""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections import Counter, defaultdict
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from flask import current_app
+from sqlalchemy import and_, case, func, select
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.functions import FunctionElement
+from sqlalchemy.types import Float
+
+from src.data_access.routing import read_only
+from src.models.models import db, Booking, BookingSeries, Resource, User
+from src.services.availability_service import ACTIVE_BOOKING_STATUSES
+from src.services.series_service import occurrences_between
+
+
+logger = logging.getLogger(__name__)
+
+SLA_WINDOW = timedelta(hours=24)
+SUMMARY_WINDOW = timedelta(days=7)
+DEFAULT_CACHE_SECONDS = 30
+DEFAULT_STALE_SECONDS = 300
+
+_CACHE_KEY = "dashboard_cache"
+
+
+# --------------------------
+# SQL HELPERS
+# --------------------------
+class elapsed_seconds(FunctionElement):
+    """Seconds from one timestamp column to another, computed by the database."""
+
+    type = Float()
+    inherit_cache = True
+
+
+@compiles(elapsed_seconds)
+def _elapsed_seconds_sqlite(element, compiler, **kw):
+    start, end = list(element.clauses)
+    return f"((julianday({compiler.process(end, **kw)}) - julianday({compiler.process(start, **kw)})) * 86400.0)"
+
+
+@compiles(elapsed_seconds, "postgresql")
+def _elapsed_seconds_postgresql(element, compiler, **kw):
+    start, end = list(element.clauses)
+    return f"EXTRACT(EPOCH FROM ({compiler.process(end, **kw)} - {compiler.process(start, **kw)}))"
+
+
+def _non_negative(expression):
+    return case((expression > 0, expression), else_=0)
+
+
+def _usage(booking_counts, series_counts, limit=None):
+    """Merge (key, bookings) rows with (key, series occurrences) rows, largest first."""
+    totals = Counter(dict(booking_counts))
+    totals.update(dict(series_counts))
+    ranked = sorted(totals.items(), key=lambda item: (-item[1], str(item[0])))
+    return ranked[:limit] if limit else ranked
+
+
+# --------------------------
+# AGGREGATES
+# --------------------------
+def compute_dashboard_stats() -> dict:
+    """
+    Every figure on the admin dashboard. Totals, the SLA count and the
+    average response time come back in one statement; utilization is summed
+    per resource in SQL. Recurring series count once per occurrence: totals
+    and breakdowns use their stored occurrence counts, and the windowed
+    figures expand the series that touch the window. The payload holds plain
+    values only, so it can be cached and shared between requests.
+    """
+    now_utc = datetime.now(timezone.utc)
+    sla_threshold = now_utc - SLA_WINDOW
+    window_start = now_utc - SUMMARY_WINDOW
+    # Series occurrences are expanded in Python, against naive timestamps like the stored ones.
+    now_naive, window_start_naive = now_utc.replace(tzinfo=None), window_start.replace(tzinfo=None)
+    overdue = and_(Booking.status == "pending", Booking.created_at <= sla_threshold)
+    response_seconds = _non_negative(elapsed_seconds(Booking.created_at, Booking.decision_at))
+
+    totals = db.session.execute(select(
+        select(func.count(User.id)).scalar_subquery().label("users"),
+        select(func.count(Resource.id)).scalar_subquery().label("resources"),
+        select(func.count(Booking.id)).scalar_subquery().label("bookings"),
+        select(func.coalesce(func.sum(BookingSeries.occurrence_count), 0)).scalar_subquery().label("occurrences"),
+        select(func.count(Booking.id)).where(Booking.status == "pending").scalar_subquery().label("pending"),
+        select(func.count(Booking.id)).where(overdue).scalar_subquery().label("overdue"),
+        select(func.avg(response_seconds))
+        .where(Booking.decision_at.isnot(None), Booking.created_at.isnot(None))
+        .scalar_subquery()
+        .label("response_seconds"),
+    )).one()
+
+    overdue_bookings = [
+        {"id": row.id, "created_at": row.created_at, "resource_title": row.title, "user_name": row.name}
+        for row in db.session.execute(
+            select(Booking.id, Booking.created_at, Resource.title, User.name)
+            .join(Resource, Booking.resource_id == Resource.id)
+            .join(User, Booking.user_id == User.id)
+            .where(overdue)
+            .order_by(Booking.created_at.asc())
+            .limit(5)
+        )
+    ]
+
+    # Approved time per resource over the window: booking rows in SQL, series occurrences expanded.
+    booked = defaultdict(lambda: [0.0, 0])  # resource id -> [seconds, bookings]
+    for resource_id, seconds, count in db.session.execute(
+        select(
+            Booking.resource_id,
+            func.sum(_non_negative(elapsed_seconds(Booking.start_time, Booking.end_time))),
+            func.count(Booking.id),
+        )
+        .where(Booking.status == "approved", Booking.start_time >= window_start, Booking.start_time <= now_utc)
+        .group_by(Booking.resource_id)
+    ):
+        booked[resource_id] = [seconds or 0.0, count]
+    weekly_counts = Counter(dict(db.session.execute(
+        select(Resource.id, func.count(Booking.id))
+        .select_from(Booking)
+        .join(Resource, Booking.resource_id == Resource.id)
+        .where(Booking.start_time >= window_start, Booking.active_status_filter())
+        .group_by(Resource.id)
+    ).all()))
+    for series in BookingSeries.query.filter(
+        BookingSeries.status.in_(ACTIVE_BOOKING_STATUSES), BookingSeries.last_end_time > window_start_naive
+    ):
+        upcoming = [
+            (start, end)
+            for start, end in occurrences_between(series, window_start_naive, series.last_end_time)
+            if start >= window_start_naive
+        ]
+        weekly_counts[series.resource_id] += len(upcoming)
+        if series.status == "approved":
+            for start, end in upcoming:
+                if start <= now_naive:
+                    booked[series.resource_id][0] += (end - start).total_seconds()
+                    booked[series.resource_id][1] += 1
+
+    resources = {
+        resource.id: resource
+        for resource in db.session.execute(
+            select(Resource.id, Resource.title, Resource.location, Resource.capacity)
+            .where(Resource.id.in_(set(booked) | set(weekly_counts)))
+        )
+    }
+    window_seconds = SUMMARY_WINDOW.total_seconds()
+    utilization = []
+    for resource_id, (seconds, count) in booked.items():
+        resource = resources.get(resource_id)
+        if resource is None:
+            continue
+        seats = resource.capacity if resource.capacity and resource.capacity > 1 else 1
+        utilization.append({
+            "id": resource_id,
+            "title": resource.title,
+            "location": resource.location,
+            "hours": round(seconds / 3600, 2),
+            "count": count,
+            "utilization_pct": round(min(seconds / (seats * window_seconds) * 100, 100), 1),
+        })
+    # Ranked on the displayed (rounded, capped) percentage, then by resource id,
+    # so float noise in the summed durations cannot reorder equal rows.
+    utilization.sort(key=lambda row: (-row["utilization_pct"], row["id"]))
+    top_utilization = [
+        {key: value for key, value in row.items() if key != "id"} for row in utilization[:5]
+    ]
+
+    recent_bookings = [
+        {"resource_title": row.title, "user_name": row.name, "status": row.status}
+        for row in db.session.execute(
+            select(Resource.title, User.name, Booking.status)
+            .select_from(Booking)
+            .join(Resource, Booking.resource_id == Resource.id)
+            .join(User, Booking.user_id == User.id)
+            .order_by(Booking.created_at.desc())
+            .limit(5)
+        )
+    ]
+    recent_resources = [
+        row._asdict()
+        for row in db.session.execute(
+            select(Resource.title, Resource.category, Resource.access_type).order_by(Resource.created_at.desc()).limit(5)
+        )
+    ]
+    recent_users = [
+        row._asdict()
+        for row in db.session.execute(
+            select(User.name, User.email, User.role).order_by(User.created_at.desc()).limit(5)
+        )
+    ]
+
+    # Role, department and category analytics
+    def usage(key, join_to, limit=None):
+        booking_rows = db.session.execute(
+            select(key, func.count(Booking.id)).select_from(Booking).join(*join_to(Booking)).group_by(key)
+        ).all()
+        series_rows = db.session.execute(
+            select(key, func.sum(BookingSeries.occurrence_count))
+            .select_from(BookingSeries)
+            .join(*join_to(BookingSeries))
+            .group_by(key)
+        ).all()
+        return _usage(booking_rows, series_rows, limit)
+
+    role_usage = usage(User.role, lambda model: (User, model.user_id == User.id))
+    department_usage = usage(User.department, lambda model: (User, model.user_id == User.id), limit=6)
+    resource_type_usage = usage(Resource.category, lambda model: (Resource, model.resource_id == Resource.id), limit=6)
+
+    weekly_summary = [
+        {"title": resources[resource_id].title, "count": total}
+        for resource_id, total in sorted(weekly_counts.items(), key=lambda item: (-item[1], item[0]))[:5]
+        if resource_id in resources
+    ]
+
+    return {
+        "total_users": totals.users,
+        "total_resources": totals.resources,
+        "total_bookings": totals.bookings + totals.occurrences,
+        "pending_bookings": totals.pending,
+        "overdue_count": totals.overdue,
+        "overdue_bookings": overdue_bookings,
+        "avg_response_hours": (
+            round(totals.response_seconds / 3600, 2) if totals.response_seconds is not None else None
+        ),
+        "top_utilization": top_utilization,
+        "utilization_window_start": window_start,
+        "recent_bookings": recent_bookings,
+        "recent_resources": recent_resources,
+        "recent_users": recent_users,
+        "role_usage": role_usage,
+        "resource_type_usage": resource_type_usage,
+        "department_usage": department_usage,
+        "weekly_summary": weekly_summary,
+        "summary_window_start": window_start,
+        "computed_at": now_utc,
+    }
+
+
+# --------------------------
+# STALE-WHILE-REVALIDATE CACHE
+# --------------------------
+class DashboardCache:
+    """The last payload for one app, and whether a refresh is already running."""
+
+    def __init__(self):
+        self.payload: Optional[dict] = None
+        self.stored_at = 0.0
+        self.refresh_thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def age(self) -> float:
+        return time.monotonic() - self.stored_at
+
+    def store(self, payload: dict) -> None:
+        self.payload = payload
+        self.stored_at = time.monotonic()
+
+    def refresh_in_background(self, app) -> None:
+        with self._lock:
+            if self.refresh_thread is not None and self.refresh_thread.is_alive():
+                return
+            self.refresh_thread = threading.Thread(
+                target=self._refresh, args=(app,), name="dashboard-refresh", daemon=True
+            )
+            self.refresh_thread.start()
+
+    def _refresh(self, app) -> None:
+        with app.app_context(), read_only():
+            try:
+                self.store(compute_dashboard_stats())
+            except Exception:  # pragma: no cover - keep serving the stale payload
+                logger.exception("Dashboard refresh failed")
+            finally:
+                db.session.remove()
+
+
+def dashboard_stats() -> dict:
+    """
+    Dashboard payload for the current app. Fresh for DASHBOARD_CACHE_SECONDS;
+    for DASHBOARD_STALE_SECONDS after that the cached copy is still served
+    while one background thread recomputes it. Only a cold or long-expired
+    cache makes the request wait on the aggregates. DASHBOARD_CACHE_SECONDS=0
+    turns caching off.
+    """
+    app = current_app._get_current_object()
+    fresh_for = app.config.get("DASHBOARD_CACHE_SECONDS", DEFAULT_CACHE_SECONDS)
+    if fresh_for <= 0:
+        return compute_dashboard_stats()
+
+    cache = app.extensions.setdefault(_CACHE_KEY, DashboardCache())
+    if cache.payload is not None:
+        age = cache.age()
+        if age < fresh_for:
+            return cache.payload
+        if age < fresh_for + app.config.get("DASHBOARD_STALE_SECONDS", DEFAULT_STALE_SECONDS):
+            cache.refresh_in_background(app)
+            return cache.payload
+
+    payload = compute_dashboard_stats()
+    cache.store(payload)
+    return payload
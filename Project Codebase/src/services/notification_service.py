@@ -1,10 +1,18 @@
+from collections import Counter
 from datetime import datetime, timezone
 
-from typing import Optional
+from typing import Dict, Optional
 
+from sqlalchemy import event, func, inspect, select, update
+from sqlalchemy.orm import Session
+
+from src.data_access.change_tracking import changed, previous_value, track_previous_values
 from src.models.models import db, Notification, EmailLog, User
 
 
+_PENDING_KEY = "unread_notification_deltas"
+
+
 def send_notification(user: User, title: str, message: str, notification_type: str, related_url: Optional[str] = None):
     """Create an in-app notification and log a simulated email."""
     if user is None:
@@ -30,3 +38,72 @@ def send_notification(user: User, title: str, message: str, notification_type: s
 
     return notification
 
+
+
+# --------------------------
+# UNREAD COUNTER
+# --------------------------
+def _unread(is_read) -> bool:
+    # NULL was never shown as unread, so only an explicit False counts.
+    return is_read is False
+
+
+# Marking a committed notification read must still show it was unread before.
+track_previous_values(Notification.is_read, Notification.user_id)
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_unread_deltas(session, flush_context):
+    deltas: Counter = Counter()
+    for obj in session.new:
+        if isinstance(obj, Notification) and _unread(obj.is_read):
+            deltas[obj.user_id] += 1
+    for obj in session.deleted:
+        if isinstance(obj, Notification):
+            state = inspect(obj)
+            if _unread(previous_value(state, "is_read")):
+                deltas[previous_value(state, "user_id")] -= 1
+    for obj in session.dirty:
+        if not isinstance(obj, Notification):
+            continue
+        state = inspect(obj)
+        if not changed(state, "is_read", "user_id"):
+            continue
+        if _unread(previous_value(state, "is_read")):
+            deltas[previous_value(state, "user_id")] -= 1
+        if _unread(obj.is_read):
+            deltas[obj.user_id] += 1
+    deltas = {user_id: delta for user_id, delta in deltas.items() if user_id and delta}
+    if deltas:
+        session.info.setdefault(_PENDING_KEY, []).append(deltas)
+
+
+@event.listens_for(Session, "after_flush_postexec")
+def _apply_unread_deltas(session, flush_context):
+    for deltas in session.info.pop(_PENDING_KEY, []):
+        _apply_deltas(session, deltas)
+
+
+def _apply_deltas(session, deltas: Dict[int, int]) -> None:
+    """One UPDATE per user; loaded User rows have the counter expired so they re-read it."""
+    for user_id, delta in deltas.items():
+        session.execute(
+            update(User)
+            .where(User.id == user_id)
+            .values(unread_notification_count=User.unread_notification_count + delta)
+            .execution_options(synchronize_session=False)
+        )
+        user = session.identity_map.get(inspect(User).identity_key_from_primary_key((user_id,)))
+        if user is not None:
+            session.expire(user, ["unread_notification_count"])
+
+
+def rebuild_unread_counts() -> int:
+    """Recount every user's unread notifications with one UPDATE. The caller commits."""
+    unread = (
+        select(func.count(Notification.id))
+        .where(Notification.user_id == User.id, Notification.is_read == False)  # noqa: E712 (matches the unread index)
+        .scalar_subquery()
+    )
+    statement = update(User).values(unread_notification_count=unread).execution_options(synchronize_session=False)
+    return db.session.execute(statement).rowcount
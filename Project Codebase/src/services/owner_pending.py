@@ -0,0 +1,122 @@
+"""Navbar owner figures (pending owner requests, whether the user owns anything), cached per process."""
+
+from __future__ import annotations
+
+from typing import Dict, Iterable, Tuple
+
+from flask import current_app
+from sqlalchemy import event, func, inspect, select, update
+from sqlalchemy.orm import Session
+
+from src.data_access.change_tracking import changed, track_previous_values
+from src.models.models import db, BookingRequest, Resource, User
+
+
+_CACHE_KEY = "owner_pending_cache"
+_OWNS_CACHE_KEY = "owns_resources_cache"
+_PENDING_KEY = "owner_request_changes"
+
+
+def _cache() -> Dict[int, Tuple[int, int]]:
+    # owner id -> (owner_requests_version, pending count); one per app, so per database
+    return current_app.extensions.setdefault(_CACHE_KEY, {})
+
+
+def owner_pending_count(user: User) -> int:
+    """
+    Pending owner requests on `user`'s resources. The count is cached against
+    users.owner_requests_version, which every change to those requests bumps,
+    so a render costs no query until the version on the (already loaded)
+    user row moves on.
+    """
+    version = user.owner_requests_version
+    cached = _cache().get(user.id)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+    count = (
+        db.session.query(func.count(BookingRequest.id))
+        .join(Resource, BookingRequest.resource_id == Resource.id)
+        .filter(
+            Resource.owner_id == user.id,
+            BookingRequest.status == "pending",
+            BookingRequest.kind == "owner",
+        )
+        .scalar()
+    )
+    _cache()[user.id] = (version, count)
+    return count
+
+
+def owns_resources(user: User) -> bool:
+    """
+    Whether `user` owns any resource. Cached against owner_requests_version
+    like the pending count: creating, deleting or reassigning a resource
+    bumps its owners' versions.
+    """
+    version = user.owner_requests_version
+    cache = current_app.extensions.setdefault(_OWNS_CACHE_KEY, {})  # owner id -> (version, owns)
+    cached = cache.get(user.id)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+    owns = db.session.query(Resource.id).filter_by(owner_id=user.id).first() is not None
+    cache[user.id] = (version, owns)
+    return owns
+
+
+def bump_owner_versions(session, owner_ids: Iterable[int] = (), resource_ids: Iterable[int] = ()) -> None:
+    """
+    Invalidate cached counts for `owner_ids` and the owners of `resource_ids`,
+    inside the session's transaction. Only needed after writes that bypass
+    the flush hooks below, such as a bulk INSERT.
+    """
+    owner_ids = {owner_id for owner_id in owner_ids if owner_id}
+    resource_ids = {resource_id for resource_id in resource_ids if resource_id}
+    if not (owner_ids or resource_ids):
+        return
+    owners = User.id.in_(owner_ids)
+    if resource_ids:
+        owners = owners | User.id.in_(select(Resource.owner_id).where(Resource.id.in_(resource_ids)))
+    session.execute(
+        update(User)
+        .where(owners)
+        .values(owner_requests_version=User.owner_requests_version + 1)
+        .execution_options(synchronize_session=False)
+    )
+    for obj in list(session.identity_map.values()):
+        if isinstance(obj, User):
+            session.expire(obj, ["owner_requests_version"])
+
+
+# A moved or deleted request or resource must still invalidate the owner it came from.
+track_previous_values(BookingRequest.status, BookingRequest.kind, BookingRequest.resource_id, Resource.owner_id)
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_owner_request_changes(session, flush_context):
+    owner_ids, resource_ids = set(), set()
+    for obj in session.new:
+        if isinstance(obj, BookingRequest):
+            resource_ids.add(obj.resource_id)
+        elif isinstance(obj, Resource):
+            owner_ids.add(obj.owner_id)
+    for obj in session.deleted:
+        if isinstance(obj, BookingRequest):
+            resource_ids.add(obj.resource_id)
+        elif isinstance(obj, Resource):
+            owner_ids.add(obj.owner_id)
+    for obj in session.dirty:
+        state = inspect(obj)
+        if isinstance(obj, BookingRequest) and changed(state, "status", "kind", "resource_id"):
+            resource_ids.add(obj.resource_id)
+            resource_ids.update(state.attrs.resource_id.history.deleted)
+        elif isinstance(obj, Resource) and changed(state, "owner_id"):
+            owner_ids.add(obj.owner_id)
+            owner_ids.update(state.attrs.owner_id.history.deleted)
+    if owner_ids or resource_ids:
+        session.info.setdefault(_PENDING_KEY, []).append((owner_ids, resource_ids))
+
+
+@event.listens_for(Session, "after_flush_postexec")
+def _bump_changed_owners(session, flush_context):
+    for owner_ids, resource_ids in session.info.pop(_PENDING_KEY, []):
+        bump_owner_versions(session, owner_ids, resource_ids)
@@ -0,0 +1,268 @@
+"""Queue of waitlist promotion jobs raised by capacity-freeing events."""
+
+from __future__ import annotations
+
+import logging
+import threading
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional
+
+from flask import current_app
+from sqlalchemy import and_, event, or_, select, update
+from sqlalchemy.orm import Session
+
+from src.models.models import db, Resource, User, WaitlistPromotionJob
+from src.services.booking_locks import is_lock_conflict
+from src.services.waitlist_service import promote_waitlist
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 50
+# How often the worker looks for jobs enqueued by other processes.
+WORKER_POLL_SECONDS = 30
+# Window re-checked when a resource gains capacity without a specific slot.
+CAPACITY_CHANGE_HORIZON = timedelta(days=180)
+# A claimed job not finished within this long is assumed lost with its worker and reclaimed.
+CLAIM_LEASE = timedelta(minutes=10)
+# Jobs that hit a lock conflict wait this long before they can be claimed again.
+LOCK_CONFLICT_RETRY_DELAY = timedelta(seconds=30)
+
+_WAKE_FLAG = "promotion_jobs_enqueued"
+
+
+# --------------------------
+# ENQUEUE
+# --------------------------
+def enqueue_promotion(resource_id: int, start_time: datetime, end_time: datetime, reason: str, *, actor=None):
+    """
+    Record that capacity freed up on a resource. The job is written in the
+    caller's transaction, so it only exists once the event itself commits.
+    """
+    if not resource_id or not start_time or not end_time or start_time >= end_time:
+        return None
+    job = WaitlistPromotionJob(
+        resource_id=resource_id,
+        start_time=start_time,
+        end_time=end_time,
+        reason=reason,
+        actor_id=getattr(actor, "id", None),
+    )
+    db.session.add(job)
+    db.session.info[_WAKE_FLAG] = current_app._get_current_object()
+    return job
+
+
+def enqueue_capacity_change(resource_id: int, reason: str = "capacity_increased", *, actor=None):
+    """Queue a re-check of every upcoming waitlist entry for the resource."""
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    return enqueue_promotion(resource_id, now, now + CAPACITY_CHANGE_HORIZON, reason, actor=actor)
+
+
+@event.listens_for(Session, "after_commit")
+def _wake_after_commit(session):
+    app = session.info.pop(_WAKE_FLAG, None)
+    if app is not None and worker_enabled(app):
+        _worker_for(app).wake()
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_after_rollback(session):
+    session.info.pop(_WAKE_FLAG, None)
+
+
+# --------------------------
+# DRAIN
+# --------------------------
+def _utc_now() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def _claimable(now: datetime):
+    """Pending jobs past their retry delay, and processing jobs whose lease expired."""
+    job = WaitlistPromotionJob
+    return or_(
+        and_(job.status == "pending", or_(job.not_before.is_(None), job.not_before <= now)),
+        and_(job.status == "processing", or_(job.claimed_at.is_(None), job.claimed_at < now - CLAIM_LEASE)),
+    )
+
+
+def _claim_batch(batch_size: int) -> List[WaitlistPromotionJob]:
+    now = _utc_now()
+    claimable_ids = (
+        select(WaitlistPromotionJob.id)
+        .where(_claimable(now))
+        .order_by(WaitlistPromotionJob.id.asc())
+        .limit(batch_size)
+        .scalar_subquery()
+    )
+    # Re-checking the predicate in the UPDATE keeps two workers from claiming the same row.
+    claimed_ids = db.session.execute(
+        update(WaitlistPromotionJob)
+        .where(WaitlistPromotionJob.id.in_(claimable_ids), _claimable(now))
+        .values(status="processing", claimed_at=now, not_before=None)
+        .returning(WaitlistPromotionJob.id)
+        .execution_options(synchronize_session=False)
+    ).scalars().all()
+    db.session.commit()
+    if not claimed_ids:
+        return []
+    return (
+        WaitlistPromotionJob.query
+        .filter(WaitlistPromotionJob.id.in_(claimed_ids))
+        .order_by(WaitlistPromotionJob.id.asc())
+        .all()
+    )
+
+
+def _merge_windows(jobs: List[WaitlistPromotionJob]):
+    """Coalesce overlapping or touching job windows into as few as possible."""
+    windows = sorted((job.start_time, job.end_time) for job in jobs)
+    merged = [list(windows[0])]
+    for start_time, end_time in windows[1:]:
+        if start_time <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], end_time)
+        else:
+            merged.append([start_time, end_time])
+    return merged
+
+
+def drain_promotion_queue(batch_size: int = DEFAULT_BATCH_SIZE, *, max_batches: Optional[int] = None) -> int:
+    """
+    Process pending promotion jobs in batches and return how many waitlist
+    entries were converted into bookings. Jobs for the same resource are
+    merged so each resource runs one promotion pass per window. Jobs that
+    lose a lock race go back to pending with a retry delay, so a pass never
+    spins on a resource another writer is holding; the worker's next poll
+    picks them up.
+    """
+    promoted_total = 0
+    batches = 0
+    while max_batches is None or batches < max_batches:
+        jobs = _claim_batch(batch_size)
+        if not jobs:
+            break
+        batches += 1
+
+        by_resource: Dict[int, List[WaitlistPromotionJob]] = defaultdict(list)
+        for job in jobs:
+            by_resource[job.resource_id].append(job)
+        resources = {
+            resource.id: resource
+            for resource in Resource.query.filter(Resource.id.in_(list(by_resource))).all()
+        }
+
+        for resource_id, resource_jobs in by_resource.items():
+            resource = resources.get(resource_id)
+            actor_id = next((job.actor_id for job in resource_jobs if job.actor_id), None)
+            actor = db.session.get(User, actor_id) if actor_id else None
+            try:
+                if resource is not None:
+                    for start_time, end_time in _merge_windows(resource_jobs):
+                        promoted_total += len(promote_waitlist(resource, start_time, end_time, actor=actor))
+                status, error = "done", None
+            except Exception as exc:  # pragma: no cover - defensive, keeps the batch moving
+                db.session.rollback()
+                if is_lock_conflict(exc):
+                    # Another writer holds the resource; retry after a delay rather than at once.
+                    status, error = "pending", None
+                else:
+                    logger.exception("Waitlist promotion failed for resource %s", resource_id)
+                    status, error = "failed", str(exc)
+
+            db.session.execute(
+                update(WaitlistPromotionJob)
+                .where(WaitlistPromotionJob.id.in_([job.id for job in resource_jobs]))
+                .values(
+                    status=status,
+                    error=error,
+                    claimed_at=None,
+                    not_before=_utc_now() + LOCK_CONFLICT_RETRY_DELAY if status == "pending" else None,
+                    processed_at=None if status == "pending" else datetime.now(timezone.utc),
+                )
+                .execution_options(synchronize_session=False)
+            )
+            db.session.commit()
+    return promoted_total
+
+
+# --------------------------
+# IN-PROCESS WORKER
+# --------------------------
+class PromotionWorker:
+    """
+    Background thread that drains the queue whenever jobs are committed, and
+    every WORKER_POLL_SECONDS for jobs left by other processes, retry delays
+    and expired leases. Its first pass runs as soon as it starts.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self._wake = threading.Event()
+        self._wake.set()
+        self._stopped = False
+        self._thread = threading.Thread(target=self._run, name="waitlist-promotion", daemon=True)
+        self._thread.start()
+
+    def wake(self) -> None:
+        self._wake.set()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        self._stopped = True
+        self._wake.set()
+        self._thread.join(timeout)
+
+    def _run(self) -> None:
+        while True:
+            self._wake.wait(timeout=WORKER_POLL_SECONDS)
+            self._wake.clear()
+            # Notification links are built with url_for, which needs a request context.
+            with self.app.test_request_context():
+                try:
+                    drain_promotion_queue()
+                except Exception:  # pragma: no cover - keep the worker alive
+                    logger.exception("Waitlist promotion worker crashed while draining")
+                finally:
+                    db.session.remove()
+            if self._stopped:
+                return
+
+
+_workers: Dict[int, PromotionWorker] = {}
+_workers_lock = threading.Lock()
+
+
+def _worker_for(app) -> PromotionWorker:
+    with _workers_lock:
+        worker = _workers.get(id(app))
+        if worker is None:
+            worker = _workers[id(app)] = PromotionWorker(app)
+        return worker
+
+
+def worker_enabled(app) -> bool:
+    """
+    True in a process that serves the app (PROMOTION_WORKER_ENABLED, set by
+    the serving entry points) with WAITLIST_PROMOTION_WORKER="thread". CLI
+    commands and tests leave it off, so `flask migrate` never writes behind
+    the schema change and `flask drain-waitlist` has the queue to itself.
+    """
+    return bool(app.config.get("PROMOTION_WORKER_ENABLED")) and (
+        app.config.get("WAITLIST_PROMOTION_WORKER", "thread") == "thread"
+    )
+
+
+def start_promotion_worker(app) -> Optional[PromotionWorker]:
+    """App startup: run the polling worker when worker_enabled(app)."""
+    if not worker_enabled(app):
+        return None
+    return _worker_for(app)
+
+
+def stop_promotion_worker(app, timeout: Optional[float] = None) -> None:
+    """Stop the app's worker thread, if one is running, after one last pass."""
+    with _workers_lock:
+        worker = _workers.pop(id(app), None)
+    if worker is not None:
+        worker.stop(timeout)
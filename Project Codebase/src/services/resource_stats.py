@@ -0,0 +1,153 @@
+"""Denormalized rating and booking counters on resources; a series counts once per occurrence."""
+
+from __future__ import annotations
+
+from collections import Counter, defaultdict
+from typing import Dict, Iterable, Optional
+
+from sqlalchemy import event, func, inspect, select, update
+from sqlalchemy.orm import Session
+
+from src.data_access.change_tracking import changed, previous_value, track_previous_values
+from src.models.models import db, Booking, BookingSeries, Resource, Review
+from src.services.availability_service import ACTIVE_BOOKING_STATUSES
+from src.services.series_service import occurrence_count
+
+
+_PENDING_KEY = "resource_stat_deltas"
+
+
+def _booking_counts(status) -> Counter:
+    return Counter(active_booking_count=int(status in ACTIVE_BOOKING_STATUSES), total_booking_count=1)
+
+
+def _series_counts(status, start_time, rule) -> Counter:
+    occurrences = occurrence_count(start_time, rule)
+    return Counter(
+        active_booking_count=occurrences if status in ACTIVE_BOOKING_STATUSES else 0,
+        total_booking_count=occurrences,
+    )
+
+
+def _review_counts(rating) -> Counter:
+    return Counter(rating_sum=rating or 0, rating_count=1)
+
+
+# model -> (attributes the counts depend on, function of their values)
+_TRACKED = {
+    Booking: (("status",), _booking_counts),
+    BookingSeries: (("status", "start_time", "rule"), _series_counts),
+    Review: (("rating",), _review_counts),
+}
+
+
+def apply_deltas(session, deltas: Dict[int, Counter]) -> None:
+    """
+    Add counter deltas to resources with one UPDATE per resource, inside the
+    session's transaction. Loaded Resource rows have the counters expired so
+    they re-read the new values.
+    """
+    for resource_id, delta in deltas.items():
+        values = {
+            column: getattr(Resource, column) + amount
+            for column, amount in delta.items()
+            if amount
+        }
+        if not values:
+            continue
+        session.execute(
+            update(Resource)
+            .where(Resource.id == resource_id)
+            .values(updated_at=Resource.updated_at, **values)  # counters are not an edit
+            .execution_options(synchronize_session=False)
+        )
+        resource = session.identity_map.get(inspect(Resource).identity_key_from_primary_key((resource_id,)))
+        if resource is not None:
+            session.expire(resource, list(values))
+
+
+def record_new_bookings(resource_id: int, statuses: Iterable[str]) -> None:
+    """Count bookings written with a bulk INSERT, which bypasses the flush hooks."""
+    delta = Counter()
+    for status in statuses:
+        delta.update(_booking_counts(status))
+    apply_deltas(db.session, {resource_id: delta})
+
+
+for _model, (_attributes, _) in _TRACKED.items():
+    track_previous_values(*(getattr(_model, attribute) for attribute in ("resource_id",) + _attributes))
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_deltas(session, flush_context):
+    deltas: Dict[int, Counter] = defaultdict(Counter)
+    for obj in session.new:
+        tracked = _TRACKED.get(type(obj))
+        if tracked and obj.resource_id:
+            attributes, counts = tracked
+            deltas[obj.resource_id].update(counts(*(getattr(obj, attribute) for attribute in attributes)))
+    for obj in session.deleted:
+        tracked = _TRACKED.get(type(obj))
+        if tracked:
+            state = inspect(obj)
+            attributes, counts = tracked
+            resource_id = previous_value(state, "resource_id")
+            if resource_id:
+                deltas[resource_id].subtract(counts(*(previous_value(state, attribute) for attribute in attributes)))
+    for obj in session.dirty:
+        tracked = _TRACKED.get(type(obj))
+        if not tracked:
+            continue
+        attributes, counts = tracked
+        state = inspect(obj)
+        if not changed(state, "resource_id", *attributes):
+            continue
+        old_resource_id = previous_value(state, "resource_id")
+        if old_resource_id:
+            deltas[old_resource_id].subtract(counts(*(previous_value(state, attribute) for attribute in attributes)))
+        if obj.resource_id:
+            deltas[obj.resource_id].update(counts(*(getattr(obj, attribute) for attribute in attributes)))
+    if deltas:
+        session.info.setdefault(_PENDING_KEY, []).append(deltas)
+
+
+@event.listens_for(Session, "after_flush_postexec")
+def _apply_collected_deltas(session, flush_context):
+    # Applied after the flush has finalized object state, so expiring the
+    # counters on loaded resources sticks.
+    for deltas in session.info.pop(_PENDING_KEY, []):
+        apply_deltas(session, deltas)
+
+
+def rebuild_resource_stats(resource_ids: Optional[Iterable[int]] = None) -> int:
+    """
+    Recompute every counter from the reviews, bookings and booking_series
+    tables, repairing any drift: one set-based UPDATE, then the series'
+    occurrences (expanded from their rules) added per resource. Returns the
+    number of resources updated. The caller commits.
+    """
+    review_scope = Review.resource_id == Resource.id
+    booking_scope = Booking.resource_id == Resource.id
+    statement = update(Resource).values(
+        updated_at=Resource.updated_at,
+        rating_sum=func.coalesce(select(func.sum(Review.rating)).where(review_scope).scalar_subquery(), 0),
+        rating_count=select(func.count(Review.id)).where(review_scope).scalar_subquery(),
+        active_booking_count=(
+            select(func.count(Booking.id))
+            .where(booking_scope, Booking.active_status_filter())
+            .scalar_subquery()
+        ),
+        total_booking_count=select(func.count(Booking.id)).where(booking_scope).scalar_subquery(),
+    ).execution_options(synchronize_session=False)
+    series = select(BookingSeries.resource_id, BookingSeries.status, BookingSeries.start_time, BookingSeries.rule)
+    if resource_ids is not None:
+        resource_ids = list(resource_ids)
+        statement = statement.where(Resource.id.in_(resource_ids))
+        series = series.where(BookingSeries.resource_id.in_(resource_ids))
+    updated = db.session.execute(statement).rowcount
+
+    deltas: Dict[int, Counter] = defaultdict(Counter)
+    for resource_id, status, start_time, rule in db.session.execute(series):
+        deltas[resource_id].update(_series_counts(status, start_time, rule))
+    apply_deltas(db.session, deltas)
+    return updated
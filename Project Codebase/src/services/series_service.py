@@ -0,0 +1,174 @@
+"""Recurring booking series: RRULE-style rules expanded on demand."""
+
+from __future__ import annotations
+
+import math
+from collections import namedtuple
+from datetime import datetime, timedelta
+from typing import Iterable, List, Optional, Tuple
+
+from sqlalchemy import event
+
+from src.models.models import BookingSeries
+
+
+FREQUENCIES = {
+    "DAILY": timedelta(days=1),
+    "WEEKLY": timedelta(weeks=1),
+}
+RECURRENCE_FREQUENCIES = {"daily": "DAILY", "weekly": "WEEKLY"}
+MAX_SERIES_OCCURRENCES = 400
+SERIES_LIMIT_MESSAGE = (
+    f"Recurring bookings can repeat up to {MAX_SERIES_OCCURRENCES} times. Choose fewer repeats or an earlier end date."
+)
+
+Rule = namedtuple("Rule", "freq interval count until")
+
+
+def build_rule(
+    freq: str,
+    *,
+    interval: int = 1,
+    count: Optional[int] = None,
+    until: Optional[datetime] = None,
+    utc_suffix: bool = False,
+) -> str:
+    """Serialize a rule in iCalendar RRULE syntax (utc_suffix marks UNTIL as UTC for .ics feeds)."""
+    parts = [f"FREQ={freq.upper()}", f"INTERVAL={max(1, interval)}"]
+    if count:
+        parts.append(f"COUNT={count}")
+    if until:
+        parts.append(f"UNTIL={until.strftime('%Y%m%dT%H%M%S')}{'Z' if utc_suffix else ''}")
+    return ";".join(parts)
+
+
+def parse_rule(rule: str) -> Rule:
+    """Parse the subset of RRULE this app writes (FREQ, INTERVAL, COUNT, UNTIL)."""
+    fields = dict(part.split("=", 1) for part in rule.split(";") if "=" in part)
+    freq = fields.get("FREQ", "").upper()
+    if freq not in FREQUENCIES:
+        raise ValueError(f"Unsupported recurrence frequency: {freq or 'missing'}.")
+    until = fields.get("UNTIL")
+    return Rule(
+        freq=freq,
+        interval=max(1, int(fields.get("INTERVAL", 1))),
+        count=int(fields["COUNT"]) if "COUNT" in fields else None,
+        until=datetime.strptime(until.rstrip("Z"), "%Y%m%dT%H%M%S") if until else None,
+    )
+
+
+def _step(rule: Rule) -> timedelta:
+    return FREQUENCIES[rule.freq] * rule.interval
+
+
+def _last_index(start_time: datetime, rule: Rule) -> int:
+    """Index of the final occurrence (occurrence 0 is the series start)."""
+    limits = []
+    if rule.count:
+        limits.append(rule.count - 1)
+    if rule.until:
+        limits.append(max(0, (rule.until - start_time) // _step(rule)))
+    if not limits:
+        limits.append(MAX_SERIES_OCCURRENCES - 1)
+    return min(min(limits), MAX_SERIES_OCCURRENCES - 1)
+
+
+def exceeds_series_limit(start_time: datetime, rule: str) -> bool:
+    """True when the rule asks for more than MAX_SERIES_OCCURRENCES occurrences, which expansion would drop."""
+    parsed = parse_rule(rule)
+    if parsed.count and parsed.count > MAX_SERIES_OCCURRENCES:
+        return True
+    return bool(parsed.until) and (parsed.until - start_time) // _step(parsed) >= MAX_SERIES_OCCURRENCES
+
+
+def occurrence_count(start_time: datetime, rule: str) -> int:
+    return _last_index(start_time, parse_rule(rule)) + 1
+
+
+@event.listens_for(BookingSeries, "before_insert")
+@event.listens_for(BookingSeries, "before_update")
+def _store_occurrence_count(mapper, connection, series):
+    # Stored so SQL aggregates can count occurrences without expanding rules.
+    series.occurrence_count = occurrence_count(series.start_time, series.rule)
+
+
+def last_occurrence_end(start_time: datetime, end_time: datetime, rule: str) -> datetime:
+    parsed = parse_rule(rule)
+    return end_time + _step(parsed) * _last_index(start_time, parsed)
+
+
+def expand(start_time: datetime, end_time: datetime, rule: str, window_start: datetime, window_end: datetime) -> List[Tuple[datetime, datetime]]:
+    """
+    Occurrences of the rule that overlap [window_start, window_end). The first
+    and last indexes are computed arithmetically, so the cost depends on the
+    window, not on how long the series runs.
+    """
+    parsed = parse_rule(rule)
+    step = _step(parsed)
+    duration = end_time - start_time
+    first = max(0, math.floor((window_start - duration - start_time) / step) + 1)
+    last = min(_last_index(start_time, parsed), math.ceil((window_end - start_time) / step) - 1)
+    return [
+        (start_time + step * index, start_time + step * index + duration)
+        for index in range(first, last + 1)
+        if start_time + step * index < window_end and start_time + step * index + duration > window_start
+    ]
+
+
+def next_occurrence(series: BookingSeries, after: datetime) -> Optional[Tuple[datetime, datetime]]:
+    """First occurrence still running at or after `after`, found arithmetically."""
+    parsed = parse_rule(series.rule)
+    step = _step(parsed)
+    duration = series.end_time - series.start_time
+    index = max(0, math.floor((after - duration - series.start_time) / step) + 1)
+    if index > _last_index(series.start_time, parsed):
+        return None
+    start_time = series.start_time + step * index
+    return start_time, start_time + duration
+
+
+def ics_rule(series: BookingSeries) -> str:
+    parsed = parse_rule(series.rule)
+    return build_rule(parsed.freq, interval=parsed.interval, count=parsed.count, until=parsed.until, utc_suffix=True)
+
+
+def occurrences_between(series: BookingSeries, window_start: datetime, window_end: datetime) -> List[Tuple[datetime, datetime]]:
+    return expand(series.start_time, series.end_time, series.rule, window_start, window_end)
+
+
+def all_occurrences(series: BookingSeries) -> List[Tuple[datetime, datetime]]:
+    return expand(series.start_time, series.end_time, series.rule, series.start_time, series.last_end_time)
+
+
+def rule_for_recurrence(recurrence: str, count: int) -> Optional[str]:
+    """RRULE for the booking form's daily/weekly repeat, or None for one-off bookings."""
+    freq = RECURRENCE_FREQUENCIES.get(recurrence)
+    if not freq or (count or 1) <= 1:
+        return None
+    return build_rule(freq, count=count)
+
+
+def describe_rule(rule: str) -> str:
+    parsed = parse_rule(rule)
+    unit = "day" if parsed.freq == "DAILY" else "week"
+    every = f"Every {unit}" if parsed.interval == 1 else f"Every {parsed.interval} {unit}s"
+    if parsed.count:
+        return f"{every}, {parsed.count} times"
+    if parsed.until:
+        return f"{every} until {parsed.until.strftime('%b %d, %Y')}"
+    return every
+
+
+def active_series_overlapping(resource_ids: Iterable[int], window_start: datetime, window_end: datetime) -> List[BookingSeries]:
+    """Active series on the resources whose span touches the window (one query)."""
+    return (
+        BookingSeries.query
+        .filter(
+            BookingSeries.resource_id.in_(list(resource_ids)),
+            BookingSeries.status.in_(("pending", "approved")),
+            BookingSeries.start_time < window_end,
+            BookingSeries.last_end_time > window_start,
+        )
+        .all()
+    )
+
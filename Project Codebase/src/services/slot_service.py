@@ -1,9 +1,68 @@
 from __future__ import annotations
 
-from datetime import datetime, timedelta, time
-from typing import List, Dict, Any
+from datetime import date, datetime, timedelta, time
+from typing import List, Dict, Any, Sequence
 
-from src.models.models import Booking, DowntimeBlock, Resource
+import numpy as np
+
+from src.models.models import Resource
+from src.services.availability_service import load_intervals, load_resource_intervals
+
+
+HOURS_PER_DAY = 24
+HOUR_LABELS = tuple(time(hour, 0).strftime("%I:%M %p") for hour in range(HOURS_PER_DAY))
+AVAILABLE_HINT = "Available"
+FULL_HINT = "Fully booked — join waitlist"
+
+
+def _hour_offsets(origin: datetime, moments: Sequence[datetime]) -> np.ndarray:
+    """Fractional hours between `origin` and each moment."""
+    stamps = np.array(moments, dtype="datetime64[s]")
+    return (stamps - np.datetime64(origin, "s")) / np.timedelta64(1, "h")
+
+
+def _hour_ranges(origin: datetime, spans, total_hours: int):
+    """First and one-past-last hour bucket touched by each span, clipped to the grid."""
+    starts = np.floor(_hour_offsets(origin, [span.start_time for span in spans])).astype(np.int64)
+    ends = np.ceil(_hour_offsets(origin, [span.end_time for span in spans])).astype(np.int64)
+    return np.clip(starts, 0, total_hours), np.clip(ends, 0, total_hours)
+
+
+def _stacked_occupancy(origin: datetime, rows: Sequence[int], spans, row_count: int, total_hours: int) -> np.ndarray:
+    """
+    Spans overlapping each hour bucket for several rows at once, shaped
+    (row_count, total_hours). Built from a difference array over span
+    start/end indices and one prefix sum along each row.
+    """
+    deltas = np.zeros((row_count, total_hours + 1), dtype=np.int32)
+    if spans:
+        row_index = np.asarray(rows, dtype=np.int64)
+        starts, ends = _hour_ranges(origin, spans, total_hours)
+        np.add.at(deltas, (row_index, starts), 1)
+        np.add.at(deltas, (row_index, ends), -1)
+    return np.cumsum(deltas[:, :-1], axis=1)
+
+
+def booking_occupancy(origin: datetime, bookings, days: int) -> np.ndarray:
+    """Bookings overlapping each hour bucket, shaped (days, 24)."""
+    total_hours = days * HOURS_PER_DAY
+    occupancy = _stacked_occupancy(origin, [0] * len(bookings), bookings, 1, total_hours)
+    return occupancy.reshape(days, HOURS_PER_DAY)
+
+
+def downtime_mask(origin: datetime, downtimes, days: int) -> np.ndarray:
+    """
+    Index of the first downtime block covering each hour bucket (or -1),
+    shaped (days, 24).
+    """
+    total_hours = days * HOURS_PER_DAY
+    mask = np.full(total_hours, -1, dtype=np.int32)
+    if downtimes:
+        starts, ends = _hour_ranges(origin, downtimes, total_hours)
+        # Paint in reverse so earlier blocks win where blocks overlap.
+        for position in range(len(downtimes) - 1, -1, -1):
+            mask[starts[position]:ends[position]] = position
+    return mask.reshape(days, HOURS_PER_DAY)
 
 
 def build_slot_days(
@@ -24,72 +83,55 @@ def build_slot_days(
         view_start = start_time.replace(minute=0, second=0, microsecond=0)
 
     view_end = view_start + timedelta(days=days)
+    origin = datetime.combine(view_start.date(), time(0, 0))
+    # The last requested day can spill past midnight when the view starts mid-day.
+    grid_days = (view_end - origin).days + 1
 
-    bookings = (
-        Booking.query
-        .filter(
-            Booking.resource_id == resource.id,
-            Booking.start_time < view_end,
-            Booking.end_time > view_start,
-            Booking.status.in_(["pending", "approved"]),
-        )
-        .all()
-    )
-
-    downtimes = (
-        DowntimeBlock.query
-        .filter(
-            DowntimeBlock.resource_id == resource.id,
-            DowntimeBlock.start_time < view_end,
-            DowntimeBlock.end_time > view_start,
-        )
-        .all()
-    )
+    intervals = load_resource_intervals(resource, view_start, view_end)
+    occupancy = booking_occupancy(origin, intervals.bookings, grid_days).tolist()
+    blocked = downtime_mask(origin, intervals.downtimes, grid_days).tolist()
+
+    capacity = intervals.capacity
+    limited_hints = [f"{capacity - booked} of {capacity} spots left" for booked in range(capacity)]
 
     slot_days: List[Dict[str, Any]] = []
     for day_offset in range(days):
         current_date = (view_start + timedelta(days=day_offset)).date()
+        grid_row = (current_date - origin.date()).days
+        date_iso = current_date.isoformat()
+        next_date_iso = (current_date + timedelta(days=1)).isoformat()
+        day_occupancy = occupancy[grid_row]
+        day_downtime = blocked[grid_row]
         slots: List[Dict[str, Any]] = []
 
         for hour in range(start_hour, end_hour):
-            slot_start = datetime.combine(current_date, time(hour, 0))
-            slot_end = slot_start + timedelta(hours=1)
-
+            slot_end = datetime.combine(current_date, time(hour, 0)) + timedelta(hours=1)
             if slot_end < view_start:
                 continue
 
-            status = "available"
-            hint = "Available"
-            overlapping_bookings = []
-
-            # Downtime overrides every other state
-            for block in downtimes:
-                if block.start_time < slot_end and block.end_time > slot_start:
-                    status = "downtime"
-                    hint = block.reason or "Downtime"
-                    break
-
-            if status != "downtime":
-                for booking in bookings:
-                    if booking.start_time < slot_end and booking.end_time > slot_start:
-                        overlapping_bookings.append(booking)
-
-                booked_count = len(overlapping_bookings)
-                if booked_count >= resource.capacity:
-                    status = "full"
-                    hint = "Fully booked — join waitlist"
-                elif booked_count > 0:
-                    remaining = resource.capacity - booked_count
-                    status = "limited"
-                    hint = f"{remaining} of {resource.capacity} spots left"
-
+            downtime_position = day_downtime[hour]
+            booked_count = day_occupancy[hour]
+            if downtime_position >= 0:
+                status = "downtime"
+                hint = intervals.downtimes[downtime_position].reason or "Downtime"
+            elif booked_count >= capacity:
+                status = "full"
+                hint = FULL_HINT
+            elif booked_count > 0:
+                status = "limited"
+                hint = limited_hints[booked_count]
+            else:
+                status = "available"
+                hint = AVAILABLE_HINT
+
+            end_hour_of_day = (hour + 1) % HOURS_PER_DAY
             slots.append(
                 {
-                    "label": slot_start.strftime("%I:%M %p"),
+                    "label": HOUR_LABELS[hour],
                     "status": status,
                     "hint": hint,
-                    "start_iso": slot_start.strftime("%Y-%m-%dT%H:%M"),
-                    "end_iso": slot_end.strftime("%Y-%m-%dT%H:%M"),
+                    "start_iso": f"{date_iso}T{hour:02d}:00",
+                    "end_iso": f"{next_date_iso if end_hour_of_day == 0 else date_iso}T{end_hour_of_day:02d}:00",
                 }
             )
 
@@ -102,3 +144,54 @@ def build_slot_days(
 
     return slot_days
 
+
+def build_availability_matrix(
+    resources,
+    start_date: date,
+    *,
+    days: int = 1,
+    start_hour: int = 0,
+    end_hour: int = HOURS_PER_DAY,
+) -> Dict[str, Any]:
+    """
+    Remaining capacity for every resource in every hour of the range, as a
+    compact resources x hours matrix. All bookings and downtime come from one
+    query and the grid for every resource is filled in one vectorized pass.
+    """
+    resources = list(resources)
+    origin = datetime.combine(start_date, time(0, 0))
+    total_hours = days * HOURS_PER_DAY
+    index = load_intervals(resources, origin, origin + timedelta(days=days))
+
+    booking_rows, booking_spans, downtime_rows, downtime_spans = [], [], [], []
+    for row, resource in enumerate(resources):
+        intervals = index[resource.id]
+        booking_rows.extend([row] * len(intervals.bookings))
+        booking_spans.extend(intervals.bookings)
+        downtime_rows.extend([row] * len(intervals.downtimes))
+        downtime_spans.extend(intervals.downtimes)
+
+    row_count = len(resources)
+    occupancy = _stacked_occupancy(origin, booking_rows, booking_spans, row_count, total_hours)
+    blocked = _stacked_occupancy(origin, downtime_rows, downtime_spans, row_count, total_hours) > 0
+    capacity = np.array([index[resource.id].capacity for resource in resources], dtype=np.int32)
+
+    remaining = np.clip(capacity[:, None] - occupancy, 0, None)
+    remaining[blocked] = 0
+    remaining = remaining.reshape(row_count, days, HOURS_PER_DAY)[:, :, start_hour:end_hour]
+
+    hours = [
+        f"{(start_date + timedelta(days=day_offset)).isoformat()}T{hour:02d}:00"
+        for day_offset in range(days)
+        for hour in range(start_hour, end_hour)
+    ]
+    return {
+        "start_date": start_date.isoformat(),
+        "days": days,
+        "hours": hours,
+        "resources": [
+            {"id": resource.id, "title": resource.title, "capacity": index[resource.id].capacity}
+            for resource in resources
+        ],
+        "matrix": remaining.reshape(row_count, -1).tolist(),
+    }
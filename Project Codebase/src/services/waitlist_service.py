@@ -1,60 +1,122 @@
 from datetime import datetime, timezone
+from typing import List, Optional, Sequence, Tuple
 
 from flask import url_for
+from sqlalchemy import update
 
-from src.models.models import db, Booking, Waitlist
-from src.services.booking_rules import ensure_capacity
-from src.services.booking_service import create_owner_booking_request
+from src.models.models import db, Booking, Resource, Waitlist
+from src.data_access.waitlist_dal import list_user_entries_between, list_waiting_entries_overlapping
+from src.services.availability_service import load_resource_intervals
+from src.services.booking_locks import lock_resources
+from src.services.booking_engine import BookingResult, create_bookings
 from src.services.notification_service import send_notification
 
 
-def promote_waitlist_entry(resource, start_time, end_time, *, actor=None):
+def next_waitlist_position(resource_id: int) -> int:
     """
-    Automatically convert the next waitlist entry into a booking
-    whenever a slot becomes available.
+    Issue the next queue position for a resource. The increment happens in a
+    single UPDATE ... RETURNING, so concurrent joins never share a position.
     """
-    if not resource or not start_time or not end_time:
-        return None
+    return db.session.execute(
+        update(Resource)
+        .where(Resource.id == resource_id)
+        # Setting updated_at to itself keeps the onupdate default from firing.
+        .values(waitlist_seq=Resource.waitlist_seq + 1, updated_at=Resource.updated_at)
+        .returning(Resource.waitlist_seq)
+    ).scalar_one()
 
-    entry = (
-        Waitlist.query.filter(
-            Waitlist.resource_id == resource.id,
-            Waitlist.status == "waiting",
-            Waitlist.start_time == start_time,
-            Waitlist.end_time == end_time,
-        )
-        .order_by(
-            Waitlist.position.asc().nullslast(),
-            Waitlist.created_at.asc(),
-        )
-        .first()
-    )
 
-    if not entry:
-        return None
+def reserve_waitlist_positions(resource_id: int, count: int) -> range:
+    """Issue `count` consecutive queue positions with one UPDATE ... RETURNING."""
+    if count <= 0:
+        return range(0)
+    last = db.session.execute(
+        update(Resource)
+        .where(Resource.id == resource_id)
+        .values(waitlist_seq=Resource.waitlist_seq + count, updated_at=Resource.updated_at)
+        .returning(Resource.waitlist_seq)
+    ).scalar_one()
+    return range(last - count + 1, last + 1)
+
+
+def waitlist_windows(resource, user, windows: Sequence[Tuple[datetime, datetime]], *, purpose=None) -> List[Waitlist]:
+    """
+    Put a user on the waitlist for several windows at once. Windows the user
+    already waits for are left alone; earlier entries for the same window
+    are re-queued. Positions are reserved as one block. The caller commits.
+    """
+    windows = sorted(set(windows))
+    if not windows:
+        return []
+
+    existing = {
+        (entry.start_time, entry.end_time): entry
+        for entry in list_user_entries_between(resource.id, user.id, windows[0][0], windows[-1][0])
+    }
+    queued = [window for window in windows if getattr(existing.get(window), "status", None) != "waiting"]
+    positions = reserve_waitlist_positions(resource.id, len(queued))
+
+    entries = []
+    now = datetime.now(timezone.utc)
+    for (start_time, end_time), position in zip(queued, positions):
+        entry = existing.get((start_time, end_time))
+        if entry is None:
+            entry = Waitlist(
+                resource_id=resource.id,
+                user_id=user.id,
+                start_time=start_time,
+                end_time=end_time,
+                purpose=purpose or None,
+            )
+            db.session.add(entry)
+        entry.status = "waiting"
+        entry.position = position
+        entry.created_at = now
+        entries.append(entry)
+    return entries
+
+
+def book_available_and_waitlist(
+    resource,
+    user,
+    occurrences: Sequence[Tuple[datetime, datetime]],
+    *,
+    purpose=None,
+    **booking_options,
+) -> Tuple[BookingResult, List[Waitlist]]:
+    """
+    Book every occurrence that fits and waitlist the ones that are only
+    blocked by capacity. Downtime and out-of-hours occurrences are skipped
+    and stay in the result's issues. The caller commits.
+    """
+    result = create_bookings(
+        resource,
+        user,
+        occurrences,
+        purpose=purpose,
+        allow_partial=True,
+        **booking_options,
+    )
+    full = [(issue.start_time, issue.end_time) for issue in result.issues if issue.status == "full"]
+    return result, waitlist_windows(resource, user, full, purpose=purpose)
 
-    try:
-        ensure_capacity(resource, start_time, end_time)
-    except ValueError:
-        return None
 
+def _convert_entry(resource, entry, intervals, actor=None) -> Optional[Booking]:
     auto_approve = resource.access_type == "public" or resource.owner_id == entry.user_id
-    booking = Booking(
-        resource_id=resource.id,
-        user_id=entry.user_id,
-        start_time=start_time,
-        end_time=end_time,
+    result = create_bookings(
+        resource,
+        entry.user,
+        [(entry.start_time, entry.end_time)],
         purpose=entry.purpose or f"Auto-booked from waitlist for {resource.title}",
-        status="approved" if auto_approve else "pending",
-        approved_by=(actor.id if (auto_approve and actor) else (resource.owner_id if auto_approve else None)),
-        decision_at=datetime.now(timezone.utc) if auto_approve else None,
+        auto_approve=auto_approve,
+        approved_by=actor.id if actor else resource.owner_id,
         booked_by_admin=True,
+        intervals=intervals,
+        lock=False,
     )
-    db.session.add(booking)
-    db.session.flush()
-
-    if not auto_approve:
-        create_owner_booking_request(resource, booking, entry.user, entry.purpose)
+    if not result.ok:
+        return None
+    booking = result.bookings[0]
 
     entry.status = "converted"
     entry.notified = True
@@ -63,13 +125,54 @@ def promote_waitlist_entry(resource, start_time, end_time, *, actor=None):
         entry.user,
         title=f"Spot secured for {resource.title}",
         message=(
-            f"A slot opened on {start_time.strftime('%b %d, %Y %I:%M %p')} - {end_time.strftime('%I:%M %p')} "
+            f"A slot opened on {entry.start_time.strftime('%b %d, %Y %I:%M %p')} - {entry.end_time.strftime('%I:%M %p')} "
             f"and we booked it for you automatically."
             + ( " The owner will review it shortly." if not auto_approve else "")
         ),
         notification_type="waitlist_promoted",
         related_url=url_for("booking.dashboard"),
     )
-
     return booking
 
+
+def promote_waitlist(resource, start_time, end_time, *, actor=None) -> List[Booking]:
+    """
+    Convert every waiting entry whose window now fits into a booking, in queue
+    order, after capacity frees up inside [start_time, end_time). Entries only
+    need to overlap the freed window, so a cancelled 3-hour booking can satisfy
+    a 1-hour request inside it. One query loads the candidates and one builds
+    the interval index; each promotion is written back into that index so
+    later entries see the capacity it used.
+    """
+    if not resource or not start_time or not end_time:
+        return []
+
+    lock_resources([resource.id])
+    entries = [
+        entry for entry in list_waiting_entries_overlapping(resource.id, start_time, end_time)
+        if entry.start_time and entry.end_time
+    ]
+    if not entries:
+        return []
+
+    intervals = load_resource_intervals(
+        resource,
+        min(entry.start_time for entry in entries),
+        max(entry.end_time for entry in entries),
+    )
+
+    promoted = []
+    for entry in entries:
+        booking = _convert_entry(resource, entry, intervals, actor)
+        if booking:
+            promoted.append(booking)
+    return promoted
+
+
+def promote_waitlist_entry(resource, start_time, end_time, *, actor=None):
+    """
+    Automatically convert waitlist entries into bookings whenever a slot
+    becomes available. Returns the first promoted booking, if any.
+    """
+    promoted = promote_waitlist(resource, start_time, end_time, actor=actor)
+    return promoted[0] if promoted else None
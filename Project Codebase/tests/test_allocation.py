@@ -0,0 +1,175 @@
+from datetime import datetime
+
+from src.models.models import db, User, Resource, Booking, BookingRequest
+from src.services.allocation_service import plan_allocations, plan_signature, commit_allocation_plan
+
+
+def _setup():
+    admin = User(name="Admin", email="admin@iu.edu", role="admin")
+    admin.set_password("password123")
+    student = User(name="Student", email="student@iu.edu", role="student")
+    student.set_password("password123")
+    db.session.add_all([admin, student])
+    db.session.commit()
+
+    rooms = []
+    for title in ("Room A", "Room B"):
+        room = Resource(
+            title=title,
+            category="Study Room",
+            capacity=1,
+            access_type="public",
+            owner_id=admin.id,
+            status=Resource.STATUS_PUBLISHED,
+        )
+        db.session.add(room)
+        rooms.append(room)
+    db.session.commit()
+    return admin, student, rooms
+
+
+def _room(admin, title, **fields):
+    room = Resource(title=title, category="Study Room", capacity=1, access_type="public", owner_id=admin.id,
+                    status=fields.pop("status", Resource.STATUS_PUBLISHED), **fields)
+    db.session.add(room)
+    db.session.commit()
+    return room
+
+
+def _book(resource, user, start_hour, end_hour):
+    db.session.add(Booking(
+        resource_id=resource.id,
+        user_id=user.id,
+        start_time=datetime(2030, 3, 4, start_hour),
+        end_time=datetime(2030, 3, 4, end_hour),
+        status="approved",
+    ))
+    db.session.commit()
+
+
+def _request(resource, requester, start_hour, end_hour):
+    booking_request = BookingRequest(
+        resource_id=resource.id,
+        requester_id=requester.id,
+        start_time=datetime(2030, 3, 4, start_hour),
+        end_time=datetime(2030, 3, 4, end_hour),
+        kind="allocator",
+    )
+    db.session.add(booking_request)
+    db.session.commit()
+    return booking_request
+
+
+def test_plan_uses_equivalent_resource_when_requested_one_is_full(app):
+    with app.app_context():
+        admin, student, (room_a, room_b) = _setup()
+        db.session.add(Booking(
+            resource_id=room_a.id,
+            user_id=student.id,
+            start_time=datetime(2030, 3, 4, 9),
+            end_time=datetime(2030, 3, 4, 12),
+            status="approved",
+        ))
+        db.session.commit()
+        first = _request(room_a, student, 10, 11)
+        second = _request(room_a, student, 10, 12)
+        third = _request(room_a, student, 12, 13)
+
+        plan = plan_allocations(datetime(2030, 3, 4), datetime(2030, 3, 5))
+        placed = {assignment.request.id: assignment.resource.id for assignment in plan.assignments}
+
+        assert placed[first.id] == room_b.id
+        assert placed[third.id] == room_a.id
+        assert [req.id for req in plan.unassigned] == [second.id]
+
+
+def test_commit_allocation_plan_creates_bookings(app):
+    with app.test_request_context():
+        admin, student, (room_a, room_b) = _setup()
+        booking_request = _request(room_a, student, 14, 15)
+
+        plan = plan_allocations(datetime(2030, 3, 4), datetime(2030, 3, 5))
+        created = commit_allocation_plan(plan, admin)
+        db.session.commit()
+
+        assert len(created) == 1
+        assert created[0].status == "approved"
+        assert db.session.get(BookingRequest, booking_request.id).status == "approved"
+        assert db.session.get(BookingRequest, booking_request.id).booking_id == created[0].id
+
+
+def test_commit_rechecks_seats_taken_since_the_plan(app):
+    with app.test_request_context():
+        admin, student, (room_a, room_b) = _setup()
+        first = _request(room_a, student, 14, 15)
+        second = _request(room_b, student, 9, 10)
+        plan = plan_allocations(datetime(2030, 3, 4), datetime(2030, 3, 5))
+        _book(room_a, admin, 14, 16)  # someone takes the seat after the admin reviewed the plan
+
+        created = commit_allocation_plan(plan, admin)
+        db.session.commit()
+
+        assert [booking.resource_id for booking in created] == [room_b.id]
+        assert [assignment.request.id for assignment in plan.assignments] == [second.id]
+        assert [req.id for req in plan.unassigned] == [first.id]
+        assert db.session.get(BookingRequest, first.id).status == "pending"
+        assert Booking.query.filter_by(resource_id=room_a.id).count() == 1
+
+
+def test_unpublished_requested_resource_is_not_assigned(app):
+    with app.app_context():
+        admin, student, (room_a, room_b) = _setup()
+        room_a.status = Resource.STATUS_ARCHIVED
+        db.session.commit()
+        booking_request = _request(room_a, student, 10, 11)
+
+        plan = plan_allocations(datetime(2030, 3, 4), datetime(2030, 3, 5))
+
+        assert [(a.request.id, a.resource.id) for a in plan.assignments] == [(booking_request.id, room_b.id)]
+
+
+def test_planner_is_best_effort_and_can_miss_the_maximum(app):
+    with app.app_context():
+        admin, student, (room_a, room_b) = _setup()
+        room_c = _room(admin, "Room C")
+        _book(room_b, student, 10, 11)
+        _book(room_c, student, 9, 10)
+        early = _request(room_a, student, 9, 10)
+        late = _request(room_a, student, 10, 11)
+        long = _request(room_a, student, 9, 12)
+
+        plan = plan_allocations(datetime(2030, 3, 4), datetime(2030, 3, 5))
+
+        # Both short requests land on Room A first; freeing it for the long one
+        # would mean moving two placements at once, which the planner does not try.
+        assert {a.request.id: a.resource.id for a in plan.assignments} == {early.id: room_a.id, late.id: room_a.id}
+        assert [req.id for req in plan.unassigned] == [long.id]
+
+        # All three fit: early on Room B, late on Room C, long on Room A.
+        _book(room_b, student, 9, 10)
+        _book(room_c, student, 10, 11)
+        db.session.delete(early)
+        db.session.delete(late)
+        db.session.commit()
+        plan = plan_allocations(datetime(2030, 3, 4), datetime(2030, 3, 5))
+        assert [(a.request.id, a.resource.id) for a in plan.assignments] == [(long.id, room_a.id)]
+
+
+def test_commit_requires_the_reviewed_plan(app, client):
+    with app.app_context():
+        admin, student, (room_a, room_b) = _setup()
+        first = _request(room_a, student, 14, 15)
+        reviewed = plan_signature(plan_allocations(datetime(2030, 3, 4), datetime(2030, 3, 5)))
+        second = _request(room_a, student, 16, 17)  # arrives after the admin looked
+        first_id, second_id = first.id, second.id
+
+    client.post("/auth/login", data={"email": "admin@iu.edu", "password": "password123"})
+    form = {"start_date": "2030-03-04", "days": 1, "plan": reviewed}
+    client.post("/admin/requests/allocate", data=form)
+    with app.app_context():
+        assert {db.session.get(BookingRequest, request_id).status for request_id in (first_id, second_id)} == {"pending"}
+        form["plan"] = plan_signature(plan_allocations(datetime(2030, 3, 4), datetime(2030, 3, 5)))
+
+    client.post("/admin/requests/allocate", data=form)
+    with app.app_context():
+        assert {db.session.get(BookingRequest, request_id).status for request_id in (first_id, second_id)} == {"approved"}
@@ -0,0 +1,144 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from src.models.models import db, User, Resource, Booking, DowntimeBlock
+from src.services.availability_service import (
+    load_resource_intervals,
+    batch_remaining_capacity,
+    find_available_windows,
+)
+from src.services.booking_rules import ensure_capacity
+
+
+def _resource(capacity: int = 2):
+    owner = User(name="Owner", email="owner@faculty.iu.edu", role="staff")
+    owner.set_password("password123")
+    db.session.add(owner)
+    db.session.commit()
+
+    resource = Resource(
+        title="Group Room",
+        category="Study Room",
+        capacity=capacity,
+        access_type="public",
+        owner_id=owner.id,
+        status=Resource.STATUS_PUBLISHED,
+    )
+    db.session.add(resource)
+    db.session.commit()
+    return owner, resource
+
+
+def _book(resource, user, start_hour: int, end_hour: int, status: str = "approved"):
+    booking = Booking(
+        resource_id=resource.id,
+        user_id=user.id,
+        start_time=datetime(2030, 3, 4, start_hour),
+        end_time=datetime(2030, 3, 4, end_hour),
+        status=status,
+    )
+    db.session.add(booking)
+    db.session.commit()
+    return booking
+
+
+def test_staggered_bookings_count_once(app):
+    with app.app_context():
+        owner, resource = _resource(capacity=2)
+        _book(resource, owner, 9, 10)
+        _book(resource, owner, 10, 11)
+
+        window = (datetime(2030, 3, 4, 9), datetime(2030, 3, 4, 11))
+        assert resource.get_available_slots(*window) == 1
+        ensure_capacity(resource, *window)  # should not raise
+
+
+def test_overlapping_bookings_fill_capacity(app):
+    with app.app_context():
+        owner, resource = _resource(capacity=2)
+        first = _book(resource, owner, 9, 11)
+        _book(resource, owner, 10, 12)
+        _book(resource, owner, 8, 12, status="cancelled")
+
+        window = (datetime(2030, 3, 4, 10), datetime(2030, 3, 4, 11))
+        assert resource.get_available_slots(*window) == 0
+        with pytest.raises(ValueError):
+            ensure_capacity(resource, *window)
+        assert resource.get_available_slots(*window, exclude_booking_id=first.id) == 1
+
+
+def test_downtime_blocks_window(app):
+    with app.app_context():
+        owner, resource = _resource(capacity=3)
+        db.session.add(DowntimeBlock(
+            resource_id=resource.id,
+            created_by=owner.id,
+            start_time=datetime(2030, 3, 4, 13),
+            end_time=datetime(2030, 3, 4, 15),
+            reason="HVAC repair",
+        ))
+        db.session.commit()
+
+        intervals = load_resource_intervals(resource, datetime(2030, 3, 4, 8), datetime(2030, 3, 4, 20))
+        downtime = intervals.downtime_overlapping(datetime(2030, 3, 4, 14), datetime(2030, 3, 4, 16))
+        assert downtime.reason == "HVAC repair"
+        assert intervals.remaining(datetime(2030, 3, 4, 14), datetime(2030, 3, 4, 16)) == 0
+        assert intervals.remaining(datetime(2030, 3, 4, 15), datetime(2030, 3, 4, 16)) == 3
+
+
+def test_batch_remaining_capacity_accepts_ids(app):
+    with app.app_context():
+        owner, resource = _resource(capacity=2)
+        other = Resource(title="Lab", capacity=1, owner_id=owner.id, status=Resource.STATUS_PUBLISHED)
+        db.session.add(other)
+        db.session.commit()
+        _book(resource, owner, 9, 11)
+        _book(other, owner, 9, 10)
+
+        window = (datetime(2030, 3, 4, 9), datetime(2030, 3, 4, 10))
+        remaining = batch_remaining_capacity([resource.id, other.id], *window)
+        assert remaining == {resource.id: 1, other.id: 0}
+
+
+def test_batch_remaining_capacity_defaults_to_the_current_utc_instant(app, client):
+    with app.app_context():
+        owner, resource = _resource(capacity=2)
+        admin = User(name="Admin", email="admin@iu.edu", role="admin")
+        admin.set_password("password123")
+        db.session.add(admin)
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        # One booking covers this instant; the other starts later within the hour.
+        db.session.add_all([
+            Booking(resource_id=resource.id, user_id=owner.id, status="approved",
+                    start_time=now - timedelta(minutes=20), end_time=now + timedelta(minutes=20)),
+            Booking(resource_id=resource.id, user_id=owner.id, status="approved",
+                    start_time=now + timedelta(minutes=5), end_time=now + timedelta(minutes=10)),
+        ])
+        db.session.commit()
+        resource_id = resource.id
+
+        assert batch_remaining_capacity([resource]) == {resource_id: 1}
+
+    client.post("/auth/login", data={"email": "admin@iu.edu", "password": "password123"})
+    response = client.get("/admin/book-for-user")
+    assert response.status_code == 200
+    assert b'data-available="1"' in response.data
+
+
+def test_find_available_windows_skips_full_and_downtime(app):
+    with app.app_context():
+        owner, resource = _resource(capacity=1)
+        _book(resource, owner, 9, 11)
+        db.session.add(DowntimeBlock(
+            resource_id=resource.id,
+            created_by=owner.id,
+            start_time=datetime(2030, 3, 4, 12),
+            end_time=datetime(2030, 3, 4, 13),
+        ))
+        db.session.commit()
+
+        windows = find_available_windows(2, datetime(2030, 3, 4, 8, 30), limit=2)
+        assert [(w.start_time.hour, w.end_time.hour) for w in windows] == [(13, 15), (7, 9)]
+        assert windows[1].start_time.day == 5
+        assert all(w.resource.id == resource.id and w.remaining == 1 for w in windows)
@@ -0,0 +1,246 @@
+from datetime import datetime
+
+import pytest
+
+from src.models.models import db, User, Resource, Booking, BookingRequest, DowntimeBlock, Notification, Waitlist
+from src.services.booking_engine import (
+    MAX_RECURRENCE_OCCURRENCES,
+    OPENING_HOURS,
+    create_bookings,
+    create_series,
+    expand_recurrence,
+    partial_occurrences,
+    preflight_occurrences,
+    sync_booking_statuses,
+)
+from src.services.series_service import build_rule
+from src.services.waitlist_service import book_available_and_waitlist, promote_waitlist
+
+
+def _setup(access_type="public", capacity=1):
+    owner = User(name="Owner", email="owner@faculty.iu.edu", role="staff")
+    owner.set_password("password123")
+    student = User(name="Student", email="student@iu.edu", role="student")
+    student.set_password("password123")
+    db.session.add_all([owner, student])
+    db.session.commit()
+
+    resource = Resource(
+        title="Lab",
+        capacity=capacity,
+        access_type=access_type,
+        owner_id=owner.id,
+        status=Resource.STATUS_PUBLISHED,
+    )
+    db.session.add(resource)
+    db.session.commit()
+    return owner, student, resource
+
+
+def test_long_recurrence_uses_fixed_number_of_queries(app, count_statements):
+    with app.test_request_context():
+        owner, student, resource = _setup()
+        occurrences = expand_recurrence(datetime(2030, 3, 4, 9), datetime(2030, 3, 4, 10), "weekly", 30)
+        db.session.refresh(resource)
+        db.session.refresh(student)
+        with count_statements() as statements:
+            result = create_bookings(resource, student, occurrences, purpose="Lab block")
+        db.session.commit()
+
+        assert result.ok and len(result.bookings) == 30
+        assert len(statements) <= 5  # lock, interval index, series, bulk insert, counters
+        assert Booking.query.filter_by(resource_id=resource.id).count() == 30
+
+
+def test_blocked_occurrence_writes_nothing_unless_partial(app):
+    with app.test_request_context():
+        owner, student, resource = _setup()
+        db.session.add(Booking(
+            resource_id=resource.id,
+            user_id=owner.id,
+            start_time=datetime(2030, 3, 5, 9),
+            end_time=datetime(2030, 3, 5, 10),
+            status="approved",
+        ))
+        db.session.commit()
+        occurrences = expand_recurrence(datetime(2030, 3, 4, 9), datetime(2030, 3, 4, 10), "daily", 3)
+
+        result = create_bookings(resource, student, occurrences)
+        assert not result.bookings
+        assert [(issue.start_time.day, issue.status) for issue in result.issues] == [(5, "full")]
+
+        partial = create_bookings(resource, student, occurrences, allow_partial=True)
+        assert [booking.start_time.day for booking in partial.bookings] == [4, 6]
+
+
+def test_restricted_batch_creates_owner_requests_in_bulk(app):
+    with app.test_request_context():
+        owner, student, resource = _setup(access_type="restricted")
+        occurrences = expand_recurrence(datetime(2030, 3, 4, 9), datetime(2030, 3, 4, 10), "daily", 4)
+
+        result = create_bookings(resource, student, occurrences, purpose="Research")
+        db.session.commit()
+
+        assert not result.auto_approved
+        assert {booking.status for booking in result.bookings} == {"pending"}
+        assert BookingRequest.query.filter_by(kind="owner").count() == 4
+        assert Notification.query.filter_by(user_id=owner.id).count() == 1
+
+
+def _blocked_week(owner, resource):
+    """Mar 5 is full, Mar 6 has downtime; Mar 7 starts too early in the day."""
+    db.session.add_all([
+        Booking(
+            resource_id=resource.id,
+            user_id=owner.id,
+            start_time=datetime(2030, 3, 5, 9),
+            end_time=datetime(2030, 3, 5, 10),
+            status="approved",
+        ),
+        DowntimeBlock(
+            resource_id=resource.id,
+            created_by=owner.id,
+            start_time=datetime(2030, 3, 6, 8),
+            end_time=datetime(2030, 3, 6, 12),
+        ),
+    ])
+    db.session.commit()
+    return expand_recurrence(datetime(2030, 3, 4, 9), datetime(2030, 3, 4, 10), "daily", 3) + [
+        (datetime(2030, 3, 7, 6), datetime(2030, 3, 7, 8)),
+    ]
+
+
+def test_preflight_reports_status_per_occurrence(app):
+    with app.test_request_context():
+        owner, student, resource = _setup()
+        occurrences = _blocked_week(owner, resource)
+
+        statuses = preflight_occurrences(resource, occurrences)
+        assert [status.status for status in statuses] == ["ok", "full", "downtime", "out_of_hours"]
+        assert not db.session.new
+
+        client = app.test_client()
+        client.post("/auth/login", data={"email": "student@iu.edu", "password": "password123"})
+        response = client.get(
+            f"/resources/{resource.id}/preflight",
+            query_string={
+                "start_time": "2030-03-04T09:00",
+                "end_time": "2030-03-04T10:00",
+                "recurrence": "daily",
+                "recurrence_count": 3,
+            },
+        )
+        payload = response.get_json()
+        assert payload["success"]
+        assert payload["counts"] == {"ok": 1, "full": 1, "downtime": 1, "out_of_hours": 0}
+
+
+def test_partial_booking_waitlists_full_occurrences(app):
+    with app.test_request_context():
+        owner, student, resource = _setup()
+        occurrences = _blocked_week(owner, resource)
+
+        result, waitlisted = book_available_and_waitlist(
+            resource, student, occurrences, purpose="Lab block", opening_hours=OPENING_HOURS
+        )
+        db.session.commit()
+
+        assert [(b.start_time.day, b.status) for b in result.bookings] == [(4, "approved")]
+        assert sorted(issue.status for issue in result.issues) == ["downtime", "full", "out_of_hours"]
+        assert [(entry.start_time.day, entry.position) for entry in waitlisted] == [(5, 1)]
+        assert Waitlist.query.filter_by(user_id=student.id, status="waiting").count() == 1
+
+        # Re-running does not queue the same window twice.
+        _, again = book_available_and_waitlist(resource, student, occurrences[1:2])
+        assert again == []
+
+
+def test_self_service_paths_apply_the_preflight_opening_hours(app):
+    with app.test_request_context():
+        owner, student, resource = _setup()
+        early = [(datetime(2030, 3, 7, 6), datetime(2030, 3, 7, 8))]
+
+        assert [status.status for status in preflight_occurrences(resource, early)] == ["out_of_hours"]
+        rows = create_bookings(resource, student, early, opening_hours=OPENING_HOURS)
+        series = create_series(resource, owner, *early[0], build_rule("WEEKLY", count=3), opening_hours=OPENING_HOURS)
+
+        assert not rows.bookings and [issue.status for issue in rows.issues] == ["out_of_hours"]
+        assert series.series is None and {issue.status for issue in series.issues} == {"out_of_hours"}
+
+
+def test_engine_does_not_limit_admin_bookings_or_waitlist_promotions_to_opening_hours(app):
+    with app.test_request_context():
+        owner, student, resource = _setup()
+        early = (datetime(2030, 3, 7, 6), datetime(2030, 3, 7, 8))
+        blocker = create_bookings(resource, owner, [early], booked_by_admin=True).bookings[0]
+        db.session.add(Waitlist(
+            resource_id=resource.id, user_id=student.id, start_time=early[0], end_time=early[1],
+            position=1, status="waiting",
+        ))
+        db.session.commit()
+
+        blocker.status = "cancelled"
+        db.session.commit()
+        promoted = promote_waitlist(resource, *early)
+        db.session.commit()
+
+        assert [(booking.user_id, booking.start_time) for booking in promoted] == [(student.id, early[0])]
+
+
+def test_partial_requests_stay_within_the_row_cap():
+    start, end = datetime(2030, 3, 4, 9), datetime(2030, 3, 4, 10)
+
+    assert len(partial_occurrences(start, end, "weekly", MAX_RECURRENCE_OCCURRENCES)) == MAX_RECURRENCE_OCCURRENCES
+    with pytest.raises(ValueError):
+        partial_occurrences(start, end, "daily", MAX_RECURRENCE_OCCURRENCES + 1)
+
+
+def test_sync_booking_statuses_follows_access_type(app):
+    with app.app_context():
+        owner, student, resource = _setup(access_type="restricted")
+        restricted = Resource(title="Studio", capacity=1, access_type="restricted", owner_id=owner.id)
+        db.session.add(restricted)
+        db.session.flush()
+        slot = {"start_time": datetime(2030, 3, 4, 9), "end_time": datetime(2030, 3, 4, 10)}
+        db.session.add_all([
+            Booking(resource_id=resource.id, user_id=student.id, status="pending", **slot),
+            Booking(resource_id=resource.id, user_id=student.id, status="cancelled", **slot),
+            Booking(resource_id=restricted.id, user_id=student.id, status="approved", **slot),
+            Booking(resource_id=restricted.id, user_id=student.id, status="approved", approved_by=owner.id, **slot),
+        ])
+        resource.access_type = "public"
+        db.session.commit()
+
+        assert sync_booking_statuses() == (1, 1)
+        db.session.commit()
+        db.session.expire_all()
+        statuses = [(booking.status, booking.approved_by) for booking in Booking.query.order_by(Booking.id)]
+        assert statuses == [
+            ("approved", owner.id),
+            ("cancelled", None),
+            ("pending", None),
+            ("approved", owner.id),
+        ]
+        assert sync_booking_statuses() == (0, 0)
+
+
+def test_sync_booking_statuses_leaves_closed_bookings_on_public_resources(app):
+    with app.app_context():
+        owner, student, resource = _setup(access_type="public")
+        decided = datetime(2030, 3, 1, 12)
+        slot = {"start_time": datetime(2030, 3, 4, 9), "end_time": datetime(2030, 3, 4, 10)}
+        db.session.add_all([
+            Booking(resource_id=resource.id, user_id=student.id, status=status, decision_at=decided, **slot)
+            for status in ("cancelled", "rejected", "completed")
+        ])
+        db.session.commit()
+
+        assert sync_booking_statuses() == (0, 0)
+        db.session.commit()
+        db.session.expire_all()
+        rows = [(booking.status, booking.approved_by, booking.decision_at) for booking in Booking.query.order_by(Booking.id)]
+        assert rows == [
+            ("cancelled", None, decided),
+            ("rejected", None, decided),
+            ("completed", None, decided),
+        ]
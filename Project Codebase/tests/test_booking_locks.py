@@ -0,0 +1,108 @@
+import threading
+from datetime import datetime
+
+from src.models.models import db, User, Resource, Booking
+from src.services.booking_engine import create_bookings
+from src.services.booking_locks import retry_on_lock_conflict
+
+WRITERS = 12
+CAPACITY = 3
+WINDOW = (datetime(2030, 3, 4, 9), datetime(2030, 3, 4, 11))
+
+
+def _setup(students=0):
+    owner = User(name="Owner", email="owner@faculty.iu.edu", role="staff")
+    owner.set_password("password123")
+    db.session.add(owner)
+    for index in range(students):
+        student = User(name=f"Student {index}", email=f"student{index}@iu.edu", role="student")
+        student.set_password("password123")
+        db.session.add(student)
+    db.session.commit()
+
+    resources = []
+    for title in ("Room A", "Room B"):
+        resource = Resource(
+            title=title,
+            capacity=CAPACITY,
+            access_type="public",
+            owner_id=owner.id,
+            status=Resource.STATUS_PUBLISHED,
+        )
+        db.session.add(resource)
+        resources.append(resource)
+    db.session.commit()
+    return owner.id, [resource.id for resource in resources]
+
+
+def _run_concurrently(target):
+    """Start WRITERS threads on `target(index)` at the same moment; return what they raised."""
+    barrier = threading.Barrier(WRITERS)
+    errors = []
+
+    def run(index):
+        try:
+            target(index, barrier)
+        except Exception as exc:  # surfaced through the assertion below
+            errors.append(exc)
+
+    threads = [threading.Thread(target=run, args=(index,)) for index in range(WRITERS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return errors
+
+
+def _active_bookings(resource_id):
+    return Booking.query.filter(Booking.resource_id == resource_id, Booking.active_status_filter()).count()
+
+
+@retry_on_lock_conflict(attempts=20, base_delay=0.01)
+def _book(resource_id, user_id):
+    resource = db.session.get(Resource, resource_id)
+    result = create_bookings(resource, db.session.get(User, user_id), [WINDOW])
+    if not result.ok:
+        db.session.rollback()
+        return False
+    db.session.commit()
+    return True
+
+
+def test_concurrent_writers_never_overbook(app):
+    with app.app_context():
+        user_id, resource_ids = _setup()
+    outcomes = []
+
+    def writer(index, barrier):
+        resource_id = resource_ids[index % len(resource_ids)]
+        with app.app_context():
+            try:
+                barrier.wait()
+                outcomes.append((resource_id, _book(resource_id, user_id)))
+            finally:
+                db.session.remove()
+
+    assert _run_concurrently(writer) == []
+    with app.app_context():
+        for resource_id in resource_ids:
+            accepted = sum(1 for rid, ok in outcomes if rid == resource_id and ok)
+            assert _active_bookings(resource_id) == accepted == CAPACITY
+
+
+def test_concurrent_booking_requests_never_overbook(app):
+    with app.app_context():
+        _, resource_ids = _setup(students=WRITERS)
+    form = {"start_time": WINDOW[0].strftime("%Y-%m-%dT%H:%M"), "end_time": WINDOW[1].strftime("%Y-%m-%dT%H:%M")}
+
+    def student(index, barrier):
+        client = app.test_client()
+        client.post("/auth/login", data={"email": f"student{index}@iu.edu", "password": "password123"})
+        barrier.wait()
+        response = client.post(f"/resources/{resource_ids[index % len(resource_ids)]}/book", data=form)
+        assert response.status_code == 302
+
+    assert _run_concurrently(student) == []
+    with app.app_context():
+        for resource_id in resource_ids:
+            assert _active_bookings(resource_id) == CAPACITY
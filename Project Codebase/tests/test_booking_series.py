@@ -0,0 +1,180 @@
+from datetime import datetime, timedelta, timezone
+
+from src.models.models import db, User, Resource, Booking, DowntimeBlock
+from src.services.booking_engine import cancel_series_from, create_series, reschedule_series_end
+from src.services.dashboard_service import compute_dashboard_stats
+from src.services.resource_stats import rebuild_resource_stats
+from src.data_access.bookings_dal import has_completed_booking
+from src.services.series_service import (
+    MAX_SERIES_OCCURRENCES,
+    SERIES_LIMIT_MESSAGE,
+    build_rule,
+    describe_rule,
+    expand,
+    next_occurrence,
+    parse_rule,
+)
+from src.services.availability_service import load_resource_intervals
+
+
+def _setup(capacity=1):
+    owner = User(name="Owner", email="owner@faculty.iu.edu", role="staff")
+    owner.set_password("password123")
+    db.session.add(owner)
+    db.session.commit()
+
+    resource = Resource(
+        title="Studio",
+        capacity=capacity,
+        access_type="public",
+        owner_id=owner.id,
+        status=Resource.STATUS_PUBLISHED,
+    )
+    db.session.add(resource)
+    db.session.commit()
+    return owner, resource
+
+
+def test_expand_only_returns_occurrences_in_window():
+    rule = build_rule("WEEKLY", count=100)
+    start, end = datetime(2030, 1, 7, 9), datetime(2030, 1, 7, 10)
+
+    window = expand(start, end, rule, datetime(2030, 3, 1), datetime(2030, 3, 31))
+    assert [occ_start.day for occ_start, _ in window] == [4, 11, 18, 25]
+    assert expand(start, end, rule, datetime(2031, 12, 1), datetime(2031, 12, 31)) == [(datetime(2031, 12, 1, 9), datetime(2031, 12, 1, 10))]
+    assert parse_rule(build_rule("DAILY", interval=2, until=datetime(2030, 2, 1, 9))).interval == 2
+
+
+def test_series_counts_against_capacity_without_rows(app):
+    with app.app_context():
+        owner, resource = _setup(capacity=1)
+        result = create_series(
+            resource, owner, datetime(2030, 1, 7, 9), datetime(2030, 1, 7, 10), build_rule("WEEKLY", count=120)
+        )
+        db.session.commit()
+
+        assert result.ok and result.occurrence_total == 120
+        assert Booking.query.count() == 0
+        intervals = load_resource_intervals(resource, datetime(2031, 6, 1), datetime(2031, 6, 30))
+        assert intervals.remaining(datetime(2031, 6, 2, 9), datetime(2031, 6, 2, 10)) == 0
+        assert intervals.remaining(datetime(2031, 6, 3, 9), datetime(2031, 6, 3, 10)) == 1
+        assert next_occurrence(result.series, datetime(2030, 1, 8)) == (datetime(2030, 1, 14, 9), datetime(2030, 1, 14, 10))
+
+
+def test_series_rejected_when_any_occurrence_hits_downtime_and_extension_checked(app):
+    with app.app_context():
+        owner, resource = _setup(capacity=1)
+        db.session.add(DowntimeBlock(
+            resource_id=resource.id,
+            created_by=owner.id,
+            start_time=datetime(2030, 2, 4, 8),
+            end_time=datetime(2030, 2, 4, 12),
+        ))
+        db.session.commit()
+
+        blocked = create_series(resource, owner, datetime(2030, 1, 7, 9), datetime(2030, 1, 7, 10), build_rule("WEEKLY", count=8))
+        assert blocked.series is None
+        assert [issue.status for issue in blocked.issues] == ["downtime"]
+
+        result = create_series(resource, owner, datetime(2030, 1, 7, 9), datetime(2030, 1, 7, 10), build_rule("WEEKLY", count=3))
+        db.session.commit()
+        extended = reschedule_series_end(result.series, datetime(2030, 2, 11, 9))
+        assert extended.first_issue.start_time == datetime(2030, 2, 4, 9)
+
+        shortened = reschedule_series_end(result.series, datetime(2030, 1, 14, 9))
+        assert shortened.ok and result.series.last_end_time == datetime(2030, 1, 14, 10)
+
+
+def test_cancel_keeps_occurrences_that_already_started(app):
+    with app.app_context():
+        owner, resource = _setup(capacity=1)
+        series = create_series(
+            resource, owner, datetime(2030, 1, 7, 9), datetime(2030, 1, 7, 10), build_rule("WEEKLY", count=6)
+        ).series
+        db.session.commit()
+
+        freed = cancel_series_from(series, datetime(2030, 1, 21, 9, 30))
+        db.session.commit()
+
+        # Jan 7, 14 and the one in progress on Jan 21 stay; Jan 28 onwards is freed.
+        assert freed == (datetime(2030, 1, 21, 9, 30), datetime(2030, 2, 11, 10))
+        assert series.status == "approved" and series.occurrence_count == 3
+        assert series.last_end_time == datetime(2030, 1, 21, 10)
+        assert (resource.active_booking_count, resource.total_booking_count) == (3, 3)
+        assert cancel_series_from(series, datetime(2030, 2, 1)) is None
+
+        upcoming = create_series(
+            resource, owner, datetime(2030, 3, 4, 9), datetime(2030, 3, 4, 10), build_rule("DAILY", count=4)
+        ).series
+        db.session.commit()
+        assert resource.active_booking_count == 7
+        cancel_series_from(upcoming, datetime(2030, 3, 1))
+        db.session.commit()
+        assert upcoming.status == "cancelled"
+        assert (resource.active_booking_count, resource.total_booking_count) == (3, 7)
+
+        resource.active_booking_count = resource.total_booking_count = 0
+        db.session.commit()
+        rebuild_resource_stats()
+        db.session.commit()
+        db.session.refresh(resource)
+        assert (resource.active_booking_count, resource.total_booking_count) == (3, 7)
+
+
+def test_dashboard_counts_series_occurrences(app):
+    with app.app_context():
+        owner, resource = _setup(capacity=1)
+        today = datetime.now(timezone.utc).replace(tzinfo=None).replace(hour=9, minute=0, second=0, microsecond=0)
+        db.session.add(Booking(
+            resource_id=resource.id, user_id=owner.id, status="approved",
+            start_time=today.replace(year=today.year + 1), end_time=today.replace(year=today.year + 1, hour=10),
+        ))
+        create_series(resource, owner, today - timedelta(days=6), today - timedelta(days=6) + timedelta(hours=2),
+                      build_rule("DAILY", count=4))
+        db.session.commit()
+
+        stats = compute_dashboard_stats()
+
+        assert stats["total_bookings"] == 5
+        assert dict(stats["role_usage"]) == {"staff": 5}
+        # Four 2-hour occurrences, all within the last week.
+        assert [(row["title"], row["hours"], row["count"]) for row in stats["top_utilization"]] == [("Studio", 8.0, 4)]
+        assert stats["weekly_summary"] == [{"title": "Studio", "count": 5}]
+
+
+def test_series_longer_than_the_cap_is_rejected_not_truncated(app):
+    with app.app_context():
+        owner, resource = _setup()
+        start, end = datetime(2030, 1, 7, 9), datetime(2030, 1, 7, 10)
+
+        too_long = create_series(resource, owner, start, end, build_rule("DAILY", count=MAX_SERIES_OCCURRENCES + 1))
+        assert too_long.series is None and [issue.message for issue in too_long.issues] == [SERIES_LIMIT_MESSAGE]
+
+        series = create_series(resource, owner, start, end, build_rule("DAILY", count=10)).series
+        db.session.commit()
+        rule, last_end = series.rule, series.last_end_time
+        # Occurrence 400 starts on start + 399 days; one day later is one too many.
+        result = reschedule_series_end(series, start + timedelta(days=MAX_SERIES_OCCURRENCES))
+        assert [issue.message for issue in result.issues] == [SERIES_LIMIT_MESSAGE]
+        assert (series.rule, series.last_end_time) == (rule, last_end)
+
+        result = reschedule_series_end(series, start + timedelta(days=MAX_SERIES_OCCURRENCES - 1))
+        db.session.commit()
+        assert result.issues == [] and series.occurrence_count == MAX_SERIES_OCCURRENCES
+        assert describe_rule(series.rule).endswith(f"until {series.last_end_time.strftime('%b %d, %Y')}")
+
+
+def test_series_counts_as_completed_once_an_occurrence_has_ended(app):
+    with app.app_context():
+        owner, resource = _setup()
+        now = datetime.now(timezone.utc).replace(tzinfo=None, microsecond=0)
+        # Started a minute ago and runs for another hour: no occurrence has ended yet.
+        series = create_series(resource, owner, now - timedelta(minutes=1), now + timedelta(hours=1),
+                               build_rule("DAILY", count=3)).series
+        db.session.commit()
+        assert not has_completed_booking(resource.id, owner.id)
+
+        series.start_time -= timedelta(days=1)
+        series.end_time -= timedelta(days=1)
+        db.session.commit()
+        assert has_completed_booking(resource.id, owner.id)
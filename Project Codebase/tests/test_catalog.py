@@ -0,0 +1,61 @@
+from datetime import datetime
+
+from src.models.models import db, User, Resource, Booking, Review
+
+
+def _student():
+    student = User(name="Student", email="student@iu.edu", role="student")
+    student.set_password("password123")
+    db.session.add(student)
+    db.session.commit()
+    return student
+
+
+def _add_resources(owner, count, start=0):
+    for offset in range(start, start + count):
+        resource = Resource(
+            title=f"Room {offset}",
+            description="Quiet room with a whiteboard.",
+            category="Study Room",
+            capacity=2,
+            owner_id=owner.id,
+            status=Resource.STATUS_PUBLISHED,
+        )
+        db.session.add(resource)
+        db.session.flush()
+        db.session.add_all([
+            Booking(
+                resource_id=resource.id,
+                user_id=owner.id,
+                start_time=datetime(2030, 3, 4, 9),
+                end_time=datetime(2030, 3, 4, 10),
+                status="approved",
+            ),
+            Review(resource_id=resource.id, reviewer_id=owner.id, rating=1 + offset % 5, comment=f"Review {offset}"),
+        ])
+    db.session.commit()
+
+
+def _catalog_statements(count_statements, client, sort):
+    client.get(f"/resources/?sort={sort}")  # warm the navbar's cached owner pending count
+    with count_statements() as statements:
+        response = client.get(f"/resources/?sort={sort}")
+    assert response.status_code == 200
+    return response, len(statements)
+
+
+def test_catalog_query_count_does_not_grow_with_resources(app, client, count_statements):
+    with app.app_context():
+        owner_id = _student().id
+        _add_resources(db.session.get(User, owner_id), 2)
+    client.post("/auth/login", data={"email": "student@iu.edu", "password": "password123"})
+
+    for sort in ("recent", "most_booked", "top_rated"):
+        _, small = _catalog_statements(count_statements, client, sort)
+        with app.app_context():
+            _add_resources(db.session.get(User, owner_id), 6, start=10 * len(sort))
+        response, large = _catalog_statements(count_statements, client, sort)
+        assert large == small, sort
+
+    page = response.get_data(as_text=True)
+    assert page.index("Room 94") < page.index("Room 91")  # top_rated: 5 stars before 2
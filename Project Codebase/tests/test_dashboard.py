@@ -0,0 +1,103 @@
+from datetime import datetime, timedelta, timezone
+
+from src.models.models import db, User, Resource, Booking
+from src.services.dashboard_service import compute_dashboard_stats, dashboard_stats
+
+
+def _setup():
+    admin = User(name="Admin", email="admin@iu.edu", role="admin", department="IT")
+    admin.set_password("password123")
+    student = User(name="Student", email="student@iu.edu", role="student", department="Biology")
+    student.set_password("password123")
+    db.session.add_all([admin, student])
+    db.session.commit()
+    lab = Resource(title="Lab", location="Hall 1", category="Lab", capacity=2, owner_id=admin.id,
+                   status=Resource.STATUS_PUBLISHED)
+    studio = Resource(title="Studio", location="Hall 2", category="Studio", capacity=1, owner_id=admin.id,
+                      status=Resource.STATUS_PUBLISHED)
+    db.session.add_all([lab, studio])
+    db.session.commit()
+    return student, lab, studio
+
+
+def _booking(resource, user, start, hours, status, **fields):
+    booking = Booking(
+        resource_id=resource.id,
+        user_id=user.id,
+        start_time=start,
+        end_time=start + timedelta(hours=hours),
+        status=status,
+        **fields,
+    )
+    db.session.add(booking)
+    return booking
+
+
+def test_aggregates_are_computed_in_sql(app):
+    with app.app_context():
+        student, lab, studio = _setup()
+        now = datetime.now(timezone.utc).replace(tzinfo=None, microsecond=0)
+        yesterday = now - timedelta(days=1)
+        _booking(lab, student, yesterday, 6, "approved",
+                 created_at=now - timedelta(days=2), decision_at=now - timedelta(days=2) + timedelta(hours=1))
+        _booking(lab, student, yesterday + timedelta(hours=8), 2, "approved",
+                 created_at=now - timedelta(days=2), decision_at=now - timedelta(days=2) + timedelta(hours=3))
+        _booking(studio, student, yesterday, 5, "approved")
+        _booking(studio, student, now + timedelta(days=3), 1, "pending", created_at=now - timedelta(hours=30))
+        _booking(lab, student, now + timedelta(days=3), 1, "pending", created_at=now - timedelta(hours=2))
+        db.session.commit()
+
+        stats = compute_dashboard_stats()
+
+    assert (stats["total_users"], stats["total_resources"], stats["total_bookings"]) == (2, 2, 5)
+    assert (stats["pending_bookings"], stats["overdue_count"]) == (2, 1)
+    assert [row["resource_title"] for row in stats["overdue_bookings"]] == ["Studio"]
+    assert stats["avg_response_hours"] == 2.0
+    # Studio: 5 booked hours on 1 seat beats Lab: 8 hours over 2 seats (4 per seat).
+    assert [(row["title"], row["hours"], row["count"]) for row in stats["top_utilization"]] == [
+        ("Studio", 5.0, 1),
+        ("Lab", 8.0, 2),
+    ]
+    assert [row["utilization_pct"] for row in stats["top_utilization"]] == [
+        round(5 / 168 * 100, 1),
+        round(8 / (2 * 168) * 100, 1),
+    ]
+    assert dict(stats["role_usage"]) == {"student": 5}
+
+
+def test_equal_utilization_ranks_by_resource(app):
+    with app.app_context():
+        student, lab, studio = _setup()
+        start = datetime.now(timezone.utc).replace(tzinfo=None, microsecond=0) - timedelta(days=1)
+        # 4 hours per seat on both: the tie falls back to the older resource, every time.
+        _booking(studio, student, start, 4, "approved")
+        _booking(lab, student, start, 8, "approved")
+        db.session.commit()
+
+        for _ in range(5):
+            ranked = compute_dashboard_stats()["top_utilization"]
+            assert [row["title"] for row in ranked] == ["Lab", "Studio"]
+            assert ranked[0]["utilization_pct"] == ranked[1]["utilization_pct"]
+
+
+def test_stale_payload_is_served_while_it_refreshes(app):
+    app.config.update(DASHBOARD_CACHE_SECONDS=30, DASHBOARD_STALE_SECONDS=300)
+    with app.app_context():
+        student, lab, _ = _setup()
+        first = dashboard_stats()
+        assert dashboard_stats() is first
+
+        _booking(lab, student, datetime(2030, 3, 4, 9), 1, "approved")
+        db.session.commit()
+        assert dashboard_stats()["total_bookings"] == 0  # still fresh
+
+        cache = app.extensions["dashboard_cache"]
+        cache.stored_at -= 31
+        assert dashboard_stats() is first  # stale, served immediately
+        cache.refresh_thread.join(timeout=10)
+        assert dashboard_stats()["total_bookings"] == 1
+
+        _booking(lab, student, datetime(2030, 3, 5, 9), 1, "approved")
+        db.session.commit()
+        cache.stored_at -= 1000  # past the stale window: recomputed inline
+        assert dashboard_stats()["total_bookings"] == 2
@@ -0,0 +1,43 @@
+from sqlalchemy import create_engine, text
+
+from src.data_access.engine import (
+    DEFAULT_SQLITE_PRAGMAS,
+    database_uri_from_env,
+    engine_options,
+    install_sqlite_pragmas,
+)
+
+
+def test_tuned_pragmas_apply_to_every_connection(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'tuned.db'}", **engine_options(f"sqlite:///{tmp_path / 'tuned.db'}"))
+    install_sqlite_pragmas(engine, DEFAULT_SQLITE_PRAGMAS)
+    try:
+        for _ in range(2):
+            with engine.connect() as connection:
+                assert connection.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+                assert connection.execute(text("PRAGMA synchronous")).scalar() == 1  # NORMAL
+                assert connection.execute(text("PRAGMA busy_timeout")).scalar() == 5000
+                assert connection.execute(text("PRAGMA temp_store")).scalar() == 2  # MEMORY
+        assert engine.pool.size() == 5
+    finally:
+        engine.dispose()
+
+
+def test_pool_options_skip_in_memory_sqlite():
+    assert engine_options("sqlite://") == {}
+    assert engine_options("sqlite:///:memory:") == {}
+    assert engine_options("sqlite:///instance/app.db", {"pool_size": 2}) == {"pool_size": 2}
+
+
+def test_database_url_selects_the_backend(monkeypatch):
+    monkeypatch.delenv("DATABASE_URL", raising=False)
+    assert database_uri_from_env("sqlite:///instance/app.db") == "sqlite:///instance/app.db"
+    monkeypatch.setenv("DATABASE_URL", "postgres://hub:secret@db:5432/hoosierhub")
+    assert database_uri_from_env("sqlite:///instance/app.db") == "postgresql://hub:secret@db:5432/hoosierhub"
+
+
+def test_postgres_pool_pings_and_pins_utc():
+    options = engine_options("postgresql://hub@db/hoosierhub", {"pool_size": 10, "max_overflow": 0})
+    assert options["pool_size"] == 10 and options["max_overflow"] == 0
+    assert options["pool_pre_ping"] is True
+    assert options["connect_args"] == {"options": "-c timezone=utc"}
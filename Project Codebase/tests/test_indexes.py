@@ -0,0 +1,74 @@
+import os
+from datetime import datetime
+
+import pytest
+
+from src.data_access import waitlist_dal
+from src.models.models import db, User, Resource, Booking
+from src.services.availability_service import load_resource_intervals
+from src.services.notification_service import send_notification
+
+
+# The plans are read with SQLite's EXPLAIN QUERY PLAN.
+pytestmark = pytest.mark.skipif(
+    not os.getenv("TEST_DATABASE_URL", "sqlite:").startswith("sqlite:"),
+    reason="query plan checks are SQLite-specific",
+)
+
+
+def _plans(count_statements, call, table):
+    """EXPLAIN QUERY PLAN for every statement `call` runs against `table`."""
+    with count_statements() as statements:
+        call()
+    plans = []
+    with db.engine.connect() as connection:
+        for statement in statements:
+            if f"FROM {table}" in statement.sql:
+                rows = connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement.sql}", statement.parameters).fetchall()
+                plans.append(" / ".join(row[-1] for row in rows))
+    assert plans, f"no statement read {table}"
+    return plans
+
+
+def _setup():
+    owner = User(name="Owner", email="owner@faculty.iu.edu", role="admin")
+    owner.set_password("password123")
+    db.session.add(owner)
+    db.session.commit()
+    resource = Resource(title="Lab", capacity=2, owner_id=owner.id, status=Resource.STATUS_PUBLISHED)
+    db.session.add(resource)
+    db.session.commit()
+    return owner, resource
+
+
+def test_hot_path_queries_use_their_indexes(app, client, count_statements):
+    window = (datetime(2030, 3, 4, 9), datetime(2030, 3, 4, 17))
+    with app.test_request_context():
+        owner, resource = _setup()
+
+        plans = _plans(count_statements, lambda: load_resource_intervals(resource, *window), "bookings")
+        assert "ix_bookings_resource_status_window" in plans[0]
+        assert "ix_downtime_blocks_resource_window" in plans[0]
+
+        plans = _plans(count_statements, lambda: waitlist_dal.list_waiting_entries_overlapping(resource.id, *window), "waitlist")
+        assert "ix_waitlist_resource_status_start" in plans[0]
+
+        send_notification(owner, "Booking request", "A new request is waiting.", "booking_request")
+        db.session.commit()
+
+    client.post("/auth/login", data={"email": "owner@faculty.iu.edu", "password": "password123"})
+    with app.app_context():
+        plans = _plans(count_statements, lambda: client.get("/admin/"), "notifications")
+        assert "ix_notifications_user_unread" in plans[0]
+        plans = _plans(count_statements, lambda: client.get("/admin/"), "bookings JOIN resources")
+        assert any("ix_bookings_active_start" in plan for plan in plans)
+
+        # The request inbox sorts on the stored status rank, so the index also supplies the order.
+        plans = _plans(count_statements, lambda: client.get("/admin/requests"), "booking_requests")
+        assert "ix_booking_requests_listing" in plans[0] and "TEMP B-TREE" not in plans[0]
+
+
+def test_partial_index_predicate_matches_the_model():
+    index = next(index for index in Booking.__table__.indexes if index.name == "ix_bookings_active_start")
+    statuses = ", ".join(f"'{status}'" for status in Booking.ACTIVE_STATUSES)
+    assert str(index.dialect_options["sqlite"]["where"]) == f"status IN ({statuses})"
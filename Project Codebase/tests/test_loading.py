@@ -0,0 +1,75 @@
+from datetime import datetime
+
+from src.models.models import db, User, Resource, Booking, BookingRequest, Message
+
+
+def _user(name, email, role):
+    user = User(name=name, email=email, role=role)
+    user.set_password("password123")
+    db.session.add(user)
+    db.session.commit()
+    return user
+
+
+def _add_activity(owner, count, start=0):
+    for offset in range(start, start + count):
+        requester = _user(f"Student {offset}", f"student{offset}@iu.edu", "student")
+        resource = Resource(title=f"Room {offset}", capacity=2, owner_id=owner.id, status=Resource.STATUS_PUBLISHED)
+        db.session.add(resource)
+        db.session.flush()
+        booking = Booking(
+            resource_id=resource.id,
+            user_id=requester.id,
+            start_time=datetime(2030, 3, 4, 9),
+            end_time=datetime(2030, 3, 4, 10),
+            status="pending",
+        )
+        db.session.add(booking)
+        db.session.flush()
+        request = BookingRequest(
+            resource_id=resource.id,
+            requester_id=requester.id,
+            booking_id=booking.id,
+            start_time=booking.start_time,
+            end_time=booking.end_time,
+            kind="owner",
+        )
+        db.session.add(request)
+        db.session.flush()
+        db.session.add(Message(sender_id=requester.id, receiver_id=owner.id, request_id=request.id, content="Hi"))
+    db.session.commit()
+
+
+def _statement_count(count_statements, client, path):
+    client.get(path)  # warm the navbar's cached owner pending count
+    with count_statements() as statements:
+        response = client.get(path)
+    assert response.status_code == 200, path
+    return len(statements)
+
+
+def test_list_pages_load_rows_in_constant_queries(app, client, count_statements):
+    with app.app_context():
+        owner_id = _user("Owner", "owner@faculty.iu.edu", "staff").id
+        _user("Admin", "admin@iu.edu", "admin")
+        _add_activity(db.session.get(User, owner_id), 2)
+
+    pages = {
+        "owner@faculty.iu.edu": ["/resources/owner/requests", "/resources/mine/bookings", "/bookings/"],
+        "admin@iu.edu": ["/admin/bookings", "/admin/", "/admin/resources/1/schedule"],
+    }
+    small = {}
+    for email, paths in pages.items():
+        client.post("/auth/login", data={"email": email, "password": "password123"})
+        for path in paths:
+            small[path] = _statement_count(count_statements, client, path)
+        client.get("/auth/logout")
+
+    with app.app_context():
+        _add_activity(db.session.get(User, owner_id), 6, start=10)
+
+    for email, paths in pages.items():
+        client.post("/auth/login", data={"email": email, "password": "password123"})
+        for path in paths:
+            assert _statement_count(count_statements, client, path) == small[path], path
+        client.get("/auth/logout")
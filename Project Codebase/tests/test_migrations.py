@@ -0,0 +1,115 @@
+import threading
+from datetime import datetime
+
+from sqlalchemy import func, inspect, select, text
+
+from src.migrations import current_version, head_version, migrate, migrate_if_needed
+from src.models.models import db, Booking, BookingSeries, Resource, SchemaVersion, SitePage, User
+
+
+def test_migrations_run_once_then_startup_reads_one_version(app, count_statements):
+    with app.app_context():
+        assert current_version() == 0
+        applied = migrate()
+        assert [migration.version for migration in applied] == list(range(1, head_version() + 1))
+        assert current_version() == head_version()
+        assert {page.slug for page in SitePage.query.all()} == {"about", "contact"}
+
+        with count_statements() as statements:
+            assert migrate_if_needed() == []
+        assert len(statements) == 1
+
+
+def test_pre_versioning_database_is_brought_up_to_date(app):
+    with app.app_context():
+        # A database from before these columns and indexes existed, with no schema_version table.
+        db.session.execute(text("DROP TABLE schema_version"))
+        db.session.execute(text("DROP INDEX ix_notifications_user_unread"))
+        db.session.execute(text("ALTER TABLE waitlist DROP COLUMN purpose"))
+        db.session.commit()
+
+        migrate(target=2)
+        assert current_version() == 2
+        inspector = inspect(db.engine)
+        assert "purpose" in {column["name"] for column in inspector.get_columns("waitlist")}
+        assert "ix_notifications_user_unread" not in {index["name"] for index in inspector.get_indexes("notifications")}
+
+        migrate()
+        assert current_version() == head_version()
+        indexes = {index["name"] for index in inspect(db.engine).get_indexes("notifications")}
+        assert "ix_notifications_user_unread" in indexes
+
+
+def test_series_occurrences_are_counted_from_their_stored_rules(app):
+    with app.app_context():
+        migrate(target=8)
+        owner = User(name="Owner", email="owner@faculty.iu.edu", role="staff")
+        owner.set_password("password123")
+        db.session.add(owner)
+        db.session.commit()
+        resource = Resource(title="Room", capacity=2, owner_id=owner.id, status=Resource.STATUS_PUBLISHED)
+        db.session.add(resource)
+        db.session.commit()
+        start = datetime(2030, 3, 4, 9)
+        db.session.add_all([
+            Booking(resource_id=resource.id, user_id=owner.id, status="approved",
+                    start_time=start, end_time=datetime(2030, 3, 4, 10)),
+            BookingSeries(resource_id=resource.id, user_id=owner.id, status="approved", rule="FREQ=WEEKLY;INTERVAL=1;COUNT=5",
+                          start_time=start, end_time=datetime(2030, 3, 4, 10), last_end_time=datetime(2030, 4, 1, 10)),
+            BookingSeries(resource_id=resource.id, user_id=owner.id, status="cancelled",
+                          rule="FREQ=DAILY;INTERVAL=2;UNTIL=20300310T090000",
+                          start_time=start, end_time=datetime(2030, 3, 4, 10), last_end_time=datetime(2030, 3, 10, 10)),
+        ])
+        db.session.commit()
+        # Rows as a version-8 database holds them: no stored counts, series not in the counters.
+        db.session.execute(text("UPDATE booking_series SET occurrence_count = 0"))
+        db.session.execute(text("UPDATE resources SET active_booking_count = 1, total_booking_count = 1"))
+        db.session.commit()
+
+        migrate()
+        counts = db.session.execute(text("SELECT occurrence_count FROM booking_series ORDER BY id")).scalars().all()
+        assert counts == [5, 4]
+        assert db.session.execute(
+            text("SELECT active_booking_count, total_booking_count FROM resources")
+        ).one() == (6, 10)
+
+
+def test_null_listing_sort_keys_are_backfilled(app):
+    with app.app_context():
+        migrate(target=9)
+        # An older email_logs table, from before sent_at was NOT NULL.
+        db.session.execute(text("DROP TABLE email_logs"))
+        db.session.execute(text(
+            "CREATE TABLE email_logs (id INTEGER PRIMARY KEY, recipient_email VARCHAR(255) NOT NULL, "
+            "subject VARCHAR(200) NOT NULL, body TEXT NOT NULL, sent_at TIMESTAMP)"
+        ))
+        db.session.execute(text("INSERT INTO email_logs (recipient_email, subject, body) VALUES ('a@iu.edu', 'Hi', 'Hello')"))
+        db.session.commit()
+
+        migrate()
+        assert db.session.execute(text("SELECT COUNT(*) FROM email_logs WHERE sent_at IS NULL")).scalar() == 0
+
+
+def test_concurrent_runners_apply_each_migration_once(app):
+    results, errors = [], []
+
+    def run():
+        with app.app_context():
+            try:
+                results.append([migration.version for migration in migrate()])
+            except Exception as exc:  # pragma: no cover - reported by the assert below
+                errors.append(exc)
+            finally:
+                db.session.remove()
+
+    runners = [threading.Thread(target=run) for _ in range(3)]
+    for runner in runners:
+        runner.start()
+    for runner in runners:
+        runner.join(timeout=30)
+
+    assert errors == []
+    assert sorted(sum(results, [])) == list(range(1, head_version() + 1))
+    with app.app_context():
+        versions = db.session.execute(select(SchemaVersion.version, func.count()).group_by(SchemaVersion.version)).all()
+        assert all(count == 1 for _, count in versions) and len(versions) == head_version()
@@ -0,0 +1,65 @@
+from src.models.models import db, User, Notification
+from src.services.notification_service import rebuild_unread_counts, send_notification
+
+
+def _admin():
+    admin = User(name="Admin", email="admin@iu.edu", role="admin")
+    admin.set_password("password123")
+    db.session.add(admin)
+    db.session.commit()
+    return admin
+
+
+def _unread(user):
+    db.session.refresh(user)
+    return user.unread_notification_count
+
+
+def test_unread_counter_follows_notifications(app):
+    with app.app_context():
+        admin = _admin()
+        first = send_notification(admin, "One", "First", "test")
+        second = send_notification(admin, "Two", "Second", "test")
+        db.session.commit()
+        assert _unread(admin) == 2
+        assert [note.title for note in admin.latest_unread_notifications(1)] == ["Two"]
+
+        first.is_read = True
+        db.session.commit()
+        assert _unread(admin) == 1
+
+        db.session.delete(db.session.get(Notification, second.id))
+        db.session.delete(db.session.get(Notification, first.id))
+        db.session.commit()
+        assert _unread(admin) == 0
+        assert admin.latest_unread_notifications() == []
+
+        send_notification(admin, "Three", "Third", "test")
+        db.session.commit()
+        db.session.execute(User.__table__.update().values(unread_notification_count=7))
+        db.session.commit()
+        assert rebuild_unread_counts() == 1
+        db.session.commit()
+        assert _unread(admin) == 1
+
+
+def test_navbar_reads_notifications_only_when_there_are_unread(app, client, count_statements):
+    with app.app_context():
+        admin_id = _admin().id
+    client.post("/auth/login", data={"email": "admin@iu.edu", "password": "password123"})
+
+    def notification_queries():
+        with count_statements() as statements:
+            page = client.get("/admin/").get_data(as_text=True)
+        return page, [statement.sql for statement in statements if "FROM notifications" in statement.sql]
+
+    page, queries = notification_queries()
+    assert queries == []
+    assert "No new notifications" in page
+
+    with app.app_context():
+        send_notification(db.session.get(User, admin_id), "Booking request", "A new request is waiting.", "test")
+        db.session.commit()
+    page, queries = notification_queries()
+    assert len(queries) == 1 and "LIMIT" in queries[0]
+    assert "A new request is waiting." in page
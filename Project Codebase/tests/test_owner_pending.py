@@ -0,0 +1,118 @@
+import sys
+from datetime import datetime
+
+from src.models.models import db, User, Resource, Booking, BookingRequest
+from src.services.booking_service import create_owner_booking_requests
+from src.services.owner_pending import owner_pending_count, owns_resources
+
+
+def _user(name, email, role):
+    user = User(name=name, email=email, role=role)
+    user.set_password("password123")
+    db.session.add(user)
+    db.session.commit()
+    return user
+
+
+def _request_bookings(resource, requester, count):
+    bookings = [
+        Booking(
+            resource_id=resource.id,
+            user_id=requester.id,
+            start_time=datetime(2030, 3, 4 + day, 9),
+            end_time=datetime(2030, 3, 4 + day, 10),
+            status="pending",
+        )
+        for day in range(count)
+    ]
+    db.session.add_all(bookings)
+    db.session.flush()
+    requests = create_owner_booking_requests(resource, bookings, requester, "Study group")
+    db.session.commit()
+    return requests
+
+
+def _counted(count_statements, owner):
+    owner.owner_requests_version  # the navbar already has the user row loaded
+    with count_statements() as statements:
+        count = owner_pending_count(owner)
+    return count, len(statements)
+
+
+def test_pending_count_is_cached_until_owner_requests_change(app, count_statements):
+    with app.test_request_context():
+        owner = _user("Owner", "owner@faculty.iu.edu", "staff")
+        requester = _user("Student", "student@iu.edu", "student")
+        other = _user("Other", "other@faculty.iu.edu", "staff")
+        resource = Resource(
+            title="Lab", capacity=2, owner_id=owner.id, access_type="restricted", status=Resource.STATUS_PUBLISHED
+        )
+        db.session.add(resource)
+        db.session.commit()
+
+        assert _counted(count_statements, owner)[0] == 0
+        assert _counted(count_statements, other) == (0, 1)
+        assert _counted(count_statements, other) == (0, 0)  # owns nothing: cached after the first count
+
+        first, second = _request_bookings(resource, requester, 2)
+        assert _counted(count_statements, owner)[0] == 2
+        assert _counted(count_statements, owner) == (2, 0)
+
+        first.mark("denied", "Room closed")
+        db.session.commit()
+        assert _counted(count_statements, owner)[0] == 1
+
+        db.session.delete(db.session.get(BookingRequest, second.id))
+        db.session.commit()
+        assert _counted(count_statements, owner)[0] == 0
+
+        _request_bookings(resource, requester, 1)
+        resource.owner_id = other.id
+        db.session.commit()
+        assert _counted(count_statements, owner)[0] == 0
+        assert _counted(count_statements, other)[0] == 1
+
+
+def test_owns_resources_is_cached_until_ownership_changes(app, count_statements):
+    with app.test_request_context():
+        student = _user("Student", "student@iu.edu", "student")
+        other = _user("Other", "other@iu.edu", "student")
+
+        def owns(user):
+            user.owner_requests_version
+            with count_statements() as statements:
+                answer = owns_resources(user)
+            return answer, len(statements)
+
+        assert owns(student) == (False, 1)
+        assert owns(student) == (False, 0)
+
+        resource = Resource(title="Bike", capacity=1, owner_id=student.id, status=Resource.STATUS_PUBLISHED)
+        db.session.add(resource)
+        db.session.commit()
+        assert owns(student)[0] is True
+        assert owns(student) == (True, 0)
+
+        resource.owner_id = other.id
+        db.session.commit()
+        assert owns(student)[0] is False
+        assert owns(other)[0] is True
+
+        db.session.delete(resource)
+        db.session.commit()
+        assert owns(other)[0] is False
+
+
+def test_navbar_asks_about_ownership_for_students_only(app, client, monkeypatch):
+    asked = []
+    monkeypatch.setattr(sys.modules["app"], "owns_resources", lambda user: asked.append(user.role) or False)
+    with app.app_context():
+        _user("Staff", "staff@faculty.iu.edu", "staff")
+        _user("Student", "student@iu.edu", "student")
+
+    for email in ("staff@faculty.iu.edu", "student@iu.edu"):
+        client.post("/auth/login", data={"email": email, "password": "password123"})
+        client.get("/resources/")
+        client.get("/auth/logout")
+
+    assert set(asked) == {"student"}
@@ -0,0 +1,115 @@
+from datetime import datetime, timedelta
+
+from src.models.models import db, User, Resource, Booking, BookingRequest
+
+
+def _login_admin(client):
+    admin = User(name="Admin", email="admin@iu.edu", role="admin")
+    admin.set_password("password123")
+    db.session.add(admin)
+    db.session.commit()
+    client.post("/auth/login", data={"email": "admin@iu.edu", "password": "password123"})
+    return admin
+
+
+def _walk(client, url, key):
+    """Follow next links to the end, then prev links back to the start."""
+    pages = []
+    while url:
+        body = client.get(url).get_json()
+        assert body["success"]
+        pages.append([row["id"] for row in body[key]])
+        url = body["next_url"]
+    backwards = []
+    url = body["prev_url"]
+    while url:
+        body = client.get(url).get_json()
+        backwards.insert(0, [row["id"] for row in body[key]])
+        url = body["prev_url"]
+    assert backwards == pages[:-1]
+    return pages
+
+
+def test_bookings_page_by_cursor_in_start_time_order(app, client):
+    with app.test_request_context():
+        admin = _login_admin(client)
+        resource = Resource(title="Lab", capacity=20, owner_id=admin.id, status=Resource.STATUS_PUBLISHED)
+        db.session.add(resource)
+        db.session.flush()
+        start = datetime(2030, 3, 4, 9)
+        # Pairs share a start time, so the id tie-breaker decides their order.
+        db.session.add_all([
+            Booking(
+                resource_id=resource.id,
+                user_id=admin.id,
+                start_time=start + timedelta(hours=offset // 2),
+                end_time=start + timedelta(hours=offset // 2 + 1),
+                status="approved",
+            )
+            for offset in range(7)
+        ])
+        db.session.commit()
+        expected = [
+            booking.id
+            for booking in Booking.query.order_by(Booking.start_time.desc(), Booking.id.desc())
+        ]
+
+    pages = _walk(client, "/admin/bookings?format=json&per_page=3", "bookings")
+    assert [len(page) for page in pages] == [3, 3, 1]
+    assert sum(pages, []) == expected
+
+
+def test_request_listing_pages_across_status_groups(app, client):
+    with app.test_request_context():
+        admin = _login_admin(client)
+        resource = Resource(title="Lab", capacity=2, owner_id=admin.id, status=Resource.STATUS_PUBLISHED)
+        db.session.add(resource)
+        db.session.flush()
+        for offset, status in enumerate(["denied", "pending", "approved", "pending", "closed", "denied"]):
+            db.session.add(BookingRequest(
+                resource_id=resource.id,
+                requester_id=admin.id,
+                start_time=datetime(2030, 3, 4, 9),
+                end_time=datetime(2030, 3, 4, 10),
+                status=status,
+                created_at=datetime(2030, 1, 1) + timedelta(days=offset),
+            ))
+        db.session.commit()
+
+    pages = _walk(client, "/admin/requests?format=json&per_page=4", "requests")
+    body = client.get("/admin/requests?format=json").get_json()
+    statuses = [row["status"] for row in body["requests"]]
+    assert statuses == ["pending", "pending", "approved", "denied", "denied", "closed"]
+    assert [len(page) for page in pages] == [4, 2]
+    assert sum(pages, []) == [row["id"] for row in body["requests"]]
+
+    html = client.get("/admin/requests?per_page=4").get_data(as_text=True)
+    assert "after=" in html
+    assert client.get("/admin/requests?format=json&after=not-a-cursor").status_code == 400
+
+
+def test_request_status_rank_follows_status(app):
+    with app.app_context():
+        owner = User(name="Owner", email="owner@iu.edu", role="admin")
+        owner.set_password("password123")
+        db.session.add(owner)
+        db.session.flush()
+        resource = Resource(title="Lab", capacity=2, owner_id=owner.id, status=Resource.STATUS_PUBLISHED)
+        db.session.add(resource)
+        db.session.flush()
+        booking_request = BookingRequest(
+            resource_id=resource.id,
+            requester_id=owner.id,
+            start_time=datetime(2030, 3, 4, 9),
+            end_time=datetime(2030, 3, 4, 10),
+        )
+        db.session.add(booking_request)
+        db.session.commit()
+        assert booking_request.status_rank == 3
+
+        booking_request.mark("denied")
+        db.session.commit()
+        assert booking_request.status_rank == 1
+        booking_request.status = "closed"
+        db.session.commit()
+        assert booking_request.status_rank == 0
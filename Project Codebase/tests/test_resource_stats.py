@@ -0,0 +1,72 @@
+from datetime import datetime
+
+from src.models.models import db, User, Resource, Booking, Review
+from src.services.booking_engine import create_bookings, expand_recurrence
+from src.services.resource_stats import rebuild_resource_stats
+
+
+def _setup():
+    owner = User(name="Owner", email="owner@faculty.iu.edu", role="staff")
+    owner.set_password("password123")
+    db.session.add(owner)
+    db.session.commit()
+    resource = Resource(title="Lab", capacity=2, owner_id=owner.id, status=Resource.STATUS_PUBLISHED)
+    db.session.add(resource)
+    db.session.commit()
+    return owner, resource
+
+
+def _counters(resource):
+    db.session.refresh(resource)
+    return (resource.rating_sum, resource.rating_count, resource.active_booking_count, resource.total_booking_count)
+
+
+def test_counters_follow_reviews_and_booking_status(app):
+    with app.test_request_context():
+        owner, resource = _setup()
+        first = Review(resource_id=resource.id, reviewer_id=owner.id, rating=5)
+        db.session.add_all([first, Review(resource_id=resource.id, reviewer_id=owner.id, rating=2)])
+        db.session.commit()
+        assert _counters(resource) == (7, 2, 0, 0)
+        assert resource.average_rating() == 3.5
+
+        result = create_bookings(
+            resource,
+            owner,
+            expand_recurrence(datetime(2030, 3, 4, 9), datetime(2030, 3, 4, 10), "daily", 3),
+        )
+        db.session.commit()
+        assert _counters(resource) == (7, 2, 3, 3)
+
+        result.bookings[0].status = "cancelled"
+        db.session.delete(first)
+        db.session.commit()
+        assert _counters(resource) == (2, 1, 2, 3)
+
+        db.session.delete(db.session.get(Booking, result.bookings[1].id))
+        db.session.commit()
+        assert _counters(resource) == (2, 1, 1, 2)
+
+
+def test_rebuild_repairs_drift(app):
+    with app.app_context():
+        owner, resource = _setup()
+        db.session.add(Review(resource_id=resource.id, reviewer_id=owner.id, rating=4))
+        db.session.add(Booking(
+            resource_id=resource.id,
+            user_id=owner.id,
+            start_time=datetime(2030, 3, 4, 9),
+            end_time=datetime(2030, 3, 4, 10),
+            status="rejected",
+        ))
+        db.session.commit()
+        db.session.execute(
+            Resource.__table__.update().values(rating_sum=0, rating_count=9, active_booking_count=3)
+        )
+        db.session.commit()
+        updated_at = resource.updated_at
+
+        assert rebuild_resource_stats() == 1
+        db.session.commit()
+        assert _counters(resource) == (4, 1, 0, 1)
+        assert resource.updated_at == updated_at
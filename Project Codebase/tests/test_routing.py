@@ -0,0 +1,51 @@
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+from src.data_access.routing import read_engine
+from src.models.models import db, User, Resource
+
+
+def test_get_requests_read_through_the_read_engine(app, client, count_statements):
+    with app.app_context():
+        owner = User(name="Owner", email="owner@faculty.iu.edu", role="staff")
+        owner.set_password("password123")
+        db.session.add(owner)
+        db.session.commit()
+        db.session.add(Resource(
+            title="Lab", description="Wet lab", capacity=2, owner_id=owner.id, status=Resource.STATUS_PUBLISHED
+        ))
+        db.session.commit()
+        primary, reader = db.engine, read_engine()
+    assert reader is not None and reader is not primary
+
+    with count_statements() as statements:
+        response = client.get("/resources/preview")
+    assert response.status_code == 200
+    assert b"Lab" in response.data
+    assert statements and all(statement.engine is reader for statement in statements)
+
+
+def test_read_connections_refuse_writes(app):
+    with app.app_context():
+        with read_engine().connect() as connection:
+            with pytest.raises(OperationalError, match="readonly"):
+                connection.execute(text("DELETE FROM users"))
+
+
+def test_writes_pin_the_transaction_to_the_primary(app):
+    with app.test_request_context("/resources/preview"):
+        app.preprocess_request()  # marks the GET as read-only
+        reader = read_engine()
+        assert db.session.get_bind(clause=Resource.__table__.select()) is reader
+
+        user = User(name="Student", email="student@iu.edu", role="student")
+        user.set_password("password123")
+        db.session.add(user)
+        db.session.flush()
+        # The uncommitted row is only visible on the primary connection.
+        assert User.query.filter_by(email="student@iu.edu").one() is user
+
+        db.session.commit()
+        assert db.session.get_bind(clause=Resource.__table__.select()) is reader
+        assert db.session.get_bind(clause=Resource.__table__.select().with_for_update()) is db.engine
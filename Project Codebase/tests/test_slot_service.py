@@ -0,0 +1,80 @@
+from datetime import date, datetime
+
+from src.models.models import db, User, Resource, Booking, DowntimeBlock
+from src.services.slot_service import build_slot_days, build_availability_matrix
+
+
+def test_build_slot_days_marks_capacity_and_downtime(app):
+    with app.app_context():
+        owner = User(name="Owner", email="owner@faculty.iu.edu", role="staff")
+        owner.set_password("password123")
+        db.session.add(owner)
+        db.session.commit()
+
+        resource = Resource(title="Media Lab", capacity=2, owner_id=owner.id, status=Resource.STATUS_PUBLISHED)
+        db.session.add(resource)
+        db.session.commit()
+
+        for start, end in ((9, 11), (10, 12)):
+            db.session.add(Booking(
+                resource_id=resource.id,
+                user_id=owner.id,
+                start_time=datetime(2030, 5, 6, start),
+                end_time=datetime(2030, 5, 6, end),
+                status="approved",
+            ))
+        db.session.add(DowntimeBlock(
+            resource_id=resource.id,
+            created_by=owner.id,
+            start_time=datetime(2030, 5, 7, 8),
+            end_time=datetime(2030, 5, 7, 10),
+            reason="Projector swap",
+        ))
+        db.session.commit()
+
+        slot_days = build_slot_days(resource, days=2, start_time=datetime(2030, 5, 6, 7))
+        assert [day["date_label"] for day in slot_days] == ["Monday, May 06", "Tuesday, May 07"]
+
+        first_day = {slot["start_iso"]: slot for slot in slot_days[0]["slots"]}
+        assert first_day["2030-05-06T08:00"]["status"] == "available"
+        assert first_day["2030-05-06T09:00"]["hint"] == "1 of 2 spots left"
+        assert first_day["2030-05-06T10:00"]["status"] == "full"
+        assert first_day["2030-05-06T21:00"]["end_iso"] == "2030-05-06T22:00"
+
+        second_day = {slot["start_iso"]: slot for slot in slot_days[1]["slots"]}
+        assert second_day["2030-05-07T09:00"]["status"] == "downtime"
+        assert second_day["2030-05-07T09:00"]["hint"] == "Projector swap"
+        assert second_day["2030-05-07T10:00"]["status"] == "available"
+
+
+def test_availability_matrix_covers_every_resource(app):
+    with app.app_context():
+        owner = User(name="Owner", email="matrix@faculty.iu.edu", role="staff")
+        owner.set_password("password123")
+        db.session.add(owner)
+        db.session.commit()
+
+        room = Resource(title="Room", capacity=2, owner_id=owner.id, status=Resource.STATUS_PUBLISHED)
+        cart = Resource(title="Laptop Cart", capacity=1, owner_id=owner.id, status=Resource.STATUS_PUBLISHED)
+        db.session.add_all([room, cart])
+        db.session.commit()
+
+        db.session.add(Booking(
+            resource_id=room.id,
+            user_id=owner.id,
+            start_time=datetime(2030, 5, 6, 9),
+            end_time=datetime(2030, 5, 6, 11),
+            status="pending",
+        ))
+        db.session.add(DowntimeBlock(
+            resource_id=cart.id,
+            created_by=owner.id,
+            start_time=datetime(2030, 5, 6, 10),
+            end_time=datetime(2030, 5, 6, 11),
+        ))
+        db.session.commit()
+
+        matrix = build_availability_matrix([room, cart], date(2030, 5, 6), start_hour=8, end_hour=12)
+        assert matrix["hours"] == [f"2030-05-06T{hour:02d}:00" for hour in range(8, 12)]
+        assert [row["id"] for row in matrix["resources"]] == [room.id, cart.id]
+        assert matrix["matrix"] == [[2, 1, 1, 2], [1, 1, 0, 1]]
@@ -0,0 +1,206 @@
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy.exc import OperationalError
+
+from src.models.models import db, User, Resource, Booking, Waitlist, WaitlistPromotionJob
+from src.services import promotion_queue
+from src.services.promotion_queue import (
+    CLAIM_LEASE,
+    drain_promotion_queue,
+    enqueue_promotion,
+    start_promotion_worker,
+    stop_promotion_worker,
+)
+from src.services.waitlist_service import next_waitlist_position, promote_waitlist
+
+
+def _setup(capacity: int = 1):
+    owner = User(name="Owner", email="owner@faculty.iu.edu", role="staff")
+    owner.set_password("password123")
+    db.session.add(owner)
+    db.session.commit()
+
+    resource = Resource(
+        title="Group Room",
+        category="Study Room",
+        capacity=capacity,
+        access_type="public",
+        owner_id=owner.id,
+        status=Resource.STATUS_PUBLISHED,
+    )
+    db.session.add(resource)
+    db.session.commit()
+    return owner, resource
+
+
+def _wait(resource, user, start_hour, end_hour):
+    entry = Waitlist(
+        resource_id=resource.id,
+        user_id=user.id,
+        start_time=datetime(2030, 3, 4, start_hour),
+        end_time=datetime(2030, 3, 4, end_hour),
+        position=next_waitlist_position(resource.id),
+        status="waiting",
+    )
+    db.session.add(entry)
+    db.session.commit()
+    return entry
+
+
+def test_positions_come_from_resource_sequence(app):
+    with app.app_context():
+        owner, resource = _setup()
+        first = _wait(resource, owner, 9, 10)
+        second = _wait(resource, owner, 10, 11)
+        db.session.delete(first)
+        db.session.commit()
+        edited_at = resource.updated_at
+        third = _wait(resource, owner, 11, 12)
+
+        assert (second.position, third.position) == (2, 3)
+        db.session.refresh(resource)
+        assert resource.updated_at == edited_at  # issuing a position is not an edit
+
+
+def test_freed_window_promotes_every_entry_that_fits(app):
+    with app.test_request_context():
+        owner, resource = _setup(capacity=1)
+        booking = Booking(
+            resource_id=resource.id,
+            user_id=owner.id,
+            start_time=datetime(2030, 3, 4, 9),
+            end_time=datetime(2030, 3, 4, 12),
+            status="approved",
+        )
+        db.session.add(booking)
+        db.session.commit()
+
+        early = _wait(resource, owner, 9, 10)
+        clash = _wait(resource, owner, 9, 11)
+        late = _wait(resource, owner, 11, 12)
+        outside = _wait(resource, owner, 11, 14)
+        db.session.add(Booking(
+            resource_id=resource.id,
+            user_id=owner.id,
+            start_time=datetime(2030, 3, 4, 12),
+            end_time=datetime(2030, 3, 4, 14),
+            status="approved",
+        ))
+        booking.status = "cancelled"
+        db.session.flush()
+
+        promoted = promote_waitlist(resource, booking.start_time, booking.end_time)
+        db.session.commit()
+
+        assert [(b.start_time.hour, b.end_time.hour) for b in promoted] == [(9, 10), (11, 12)]
+        assert early.status == "converted" and late.status == "converted"
+        assert clash.status == "waiting" and outside.status == "waiting"
+
+
+def test_cancellation_enqueues_job_and_worker_promotes(app):
+    with app.test_request_context():
+        owner, resource = _setup(capacity=1)
+        booking = Booking(
+            resource_id=resource.id,
+            user_id=owner.id,
+            start_time=datetime(2030, 3, 4, 9),
+            end_time=datetime(2030, 3, 4, 11),
+            status="approved",
+        )
+        db.session.add(booking)
+        db.session.commit()
+        entry = _wait(resource, owner, 10, 11)
+
+        booking.status = "cancelled"
+        enqueue_promotion(resource.id, booking.start_time, booking.end_time, "cancelled")
+        enqueue_promotion(resource.id, booking.start_time, booking.end_time, "cancelled")
+        db.session.commit()
+
+        assert drain_promotion_queue() == 1
+        assert db.session.get(Waitlist, entry.id).status == "converted"
+        assert {job.status for job in WaitlistPromotionJob.query.all()} == {"done"}
+
+
+def test_expired_claim_is_reclaimed(app):
+    with app.test_request_context():
+        owner, resource = _setup(capacity=1)
+        entry = _wait(resource, owner, 10, 11)
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        # One claim from a worker that died mid-batch, one still within its lease.
+        lost = enqueue_promotion(resource.id, datetime(2030, 3, 4, 10), datetime(2030, 3, 4, 11), "cancelled")
+        lost.status, lost.claimed_at = "processing", now - CLAIM_LEASE - timedelta(minutes=1)
+        held = enqueue_promotion(resource.id, datetime(2030, 3, 4, 12), datetime(2030, 3, 4, 13), "cancelled")
+        held.status, held.claimed_at = "processing", now
+        db.session.commit()
+
+        assert drain_promotion_queue() == 1
+        assert db.session.get(Waitlist, entry.id).status == "converted"
+        assert (db.session.get(WaitlistPromotionJob, lost.id).status,
+                db.session.get(WaitlistPromotionJob, held.id).status) == ("done", "processing")
+
+
+def test_lock_conflict_requeues_with_a_delay(app, monkeypatch):
+    attempts = []
+
+    def locked(*args, **kwargs):
+        attempts.append(args)
+        raise OperationalError("UPDATE resources", {}, Exception("database is locked"))
+
+    monkeypatch.setattr(promotion_queue, "promote_waitlist", locked)
+    with app.test_request_context():
+        owner, resource = _setup(capacity=1)
+        job = enqueue_promotion(resource.id, datetime(2030, 3, 4, 9), datetime(2030, 3, 4, 10), "cancelled")
+        db.session.commit()
+
+        assert drain_promotion_queue() == 0
+        assert drain_promotion_queue() == 0  # still inside its retry delay
+        assert len(attempts) == 1
+        job = db.session.get(WaitlistPromotionJob, job.id)
+        assert job.status == "pending" and job.not_before > datetime.now(timezone.utc).replace(tzinfo=None)
+
+        job.not_before = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(seconds=1)
+        db.session.commit()
+        assert drain_promotion_queue() == 0
+        assert len(attempts) == 2
+
+
+def test_worker_started_with_the_app_drains_leftover_jobs(app):
+    with app.test_request_context():
+        owner, resource = _setup(capacity=1)
+        entry_id = _wait(resource, owner, 10, 11).id
+        # Left behind by a process that went away: nothing here enqueues, so only polling finds it.
+        db.session.add(WaitlistPromotionJob(
+            resource_id=resource.id,
+            start_time=datetime(2030, 3, 4, 10),
+            end_time=datetime(2030, 3, 4, 11),
+            reason="cancelled",
+        ))
+        db.session.commit()
+        db.session.remove()
+
+    assert start_promotion_worker(app) is None  # the test app runs with the worker off
+    app.config["WAITLIST_PROMOTION_WORKER"] = "thread"
+    assert start_promotion_worker(app) is None  # and, like a CLI process, does not serve requests
+    app.config["PROMOTION_WORKER_ENABLED"] = True
+    start_promotion_worker(app)
+    stop_promotion_worker(app, timeout=10)
+
+    with app.app_context():
+        assert db.session.get(Waitlist, entry_id).status == "converted"
+
+
+def test_cli_commands_run_without_the_worker(app):
+    # The default mode, in a process that does not serve requests (what `flask drain-waitlist` builds).
+    app.config["WAITLIST_PROMOTION_WORKER"] = "thread"
+    with app.test_request_context():
+        owner, resource = _setup(capacity=1)
+        _wait(resource, owner, 10, 11)
+        enqueue_promotion(resource.id, datetime(2030, 3, 4, 10), datetime(2030, 3, 4, 11), "cancelled")
+        db.session.commit()
+
+    result = app.test_cli_runner().invoke(args=["drain-waitlist"])
+
+    assert result.exit_code == 0
+    assert id(app) not in promotion_queue._workers  # nothing raced the command for the job
+    with app.app_context():
+        assert WaitlistPromotionJob.query.filter_by(status="done").count() == 1
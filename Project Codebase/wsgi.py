@@ -0,0 +1,7 @@
+"""WSGI entry point for serving the app, e.g. `gunicorn wsgi:app`."""
+
+from app import create_app
+
+
+# A serving process runs the waitlist promotion worker; CLI commands built from app.py do not.
+app = create_app({"PROMOTION_WORKER_ENABLED": True})